@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+مجموعة قياسات أداء قابلة للتكرار على ملف PDF اصطناعي يشبه المصحف
+
+    python benchmark.py --pages 604 --output benchmark.json
+
+تُولَّد الصفحات بنص عربي بخط نسخ وإطار ورقم صفحة، فلا حاجة إلى ملف المصحف،
+وتعمل القياسات دون شاشة (QT_QPA_PLATFORM=offscreen) في مجلد منزل مؤقت حتى
+لا تتأثر بالتخزين الدائم للمستخدم. النتائج بصيغة JSON للمقارنة بين الإصدارات
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# رسائل PyMuPDF تذهب إلى stderr حتى تبقى النتائج على stdout بصيغة JSON صالحة
+os.environ.setdefault("PYMUPDF_MESSAGE", "fd:2")
+
+from config import APP_VERSION
+
+# عدد الصفحات المختلفة فعلياً، وبقية الصفحات نسخ منها برقم مختلف
+TEMPLATE_PAGES = 24
+BENCH_SCALES = (1.0, 2.0, 2.8284, 4.0)
+BENCH_VARIANTS = ("dark", "sepia", "night", "duotone:#f5ecd7:#2b2118")
+
+# كلمات متكررة في المصحف لتوليد نص واقعي
+_WORDS = (
+    "الله الرحمن الرحيم الحمد رب العالمين مالك يوم الدين إياك نعبد نستعين اهدنا الصراط "
+    "المستقيم الذين أنعمت عليهم غير المغضوب ولا الضالين ذلك الكتاب لا ريب فيه هدى للمتقين "
+    "يؤمنون بالغيب ويقيمون الصلاة ومما رزقناهم ينفقون والذين بما أنزل إليك وما من قبلك "
+    "وبالآخرة هم يوقنون أولئك على من ربهم المفلحون إن كفروا سواء أأنذرتهم أم لم تنذرهم"
+).split()
+
+# سكربت يُشغل في عملية مستقلة لقياس زمن ظهور أول صفحة
+_COLD_START_SCRIPT = r"""
+import time
+started = time.perf_counter()
+import json, os, sys
+sys.path.insert(0, sys.argv[2])
+import main
+main.get_resource_path = lambda rel, pdf=sys.argv[1]: pdf if rel.endswith(".pdf") else rel
+imported = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+window = main.MushafViewer()
+window.show()
+deadline = time.perf_counter() + 30
+while window.first_paint_ms is None and time.perf_counter() < deadline:
+    app.processEvents()
+    time.sleep(0.001)
+result = {"import_ms": (imported - started) * 1000, "first_paint_ms": window.first_paint_ms}
+window.close()
+print(json.dumps(result))
+"""
+
+
+def make_synthetic_pdf(path, pages: int = 604, seed: int = 0) -> Path:
+    """
+    توليد ملف PDF بصفحات تشبه صفحات المصحف
+
+    Args:
+        path: مسار الملف
+        pages: عدد الصفحات
+        seed: بذرة التوليد العشوائي (نفس البذرة تعطي نفس الملف)
+
+    Returns:
+        مسار الملف
+    """
+    import fitz  # PyMuPDF
+
+    rng = random.Random(seed)
+    templates = fitz.open()
+    for _ in range(min(TEMPLATE_PAGES, pages)):
+        page = templates.new_page(width=420, height=595)
+        page.draw_rect(fitz.Rect(18, 18, 402, 577), color=(0.15, 0.45, 0.3), width=3)
+        page.draw_rect(fitz.Rect(24, 24, 396, 571), color=(0.15, 0.45, 0.3), width=0.8)
+        lines = [" ".join(rng.choice(_WORDS) for _ in range(rng.randint(7, 9))) for _ in range(15)]
+        html = "".join(f"<p>{line}</p>" for line in lines)
+        page.insert_htmlbox(fitz.Rect(36, 40, 384, 550), html,
+                            css="* {font-size: 15px; text-align: justify; direction: rtl;}")
+
+    document = fitz.open()
+    for page_idx in range(pages):
+        template = page_idx % len(templates)
+        document.insert_pdf(templates, from_page=template, to_page=template)
+        document[page_idx].insert_text((200, 568), str(page_idx + 1), fontsize=10)
+    path = Path(path)
+    document.save(str(path), garbage=1, deflate=True)
+    document.close()
+    templates.close()
+    return path
+
+
+def _timings(func: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    ملخص أزمنة بالمللي ثانية
+
+    Args:
+        samples: الأزمنة
+
+    Returns:
+        الوسيط والمتوسط والمئين 95 والأدنى
+    """
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "median_ms": round(statistics.median(ordered), 4),
+        "mean_ms": round(statistics.fmean(ordered), 4),
+        "p95_ms": round(p95, 4),
+        "min_ms": round(ordered[0], 4),
+        "samples": len(ordered),
+    }
+
+
+def bench_render(pdf_path: str, sample_pages: List[int]) -> dict:
+    """زمن رسم صفحة كاملة بعدة معاملات"""
+    from renderer import open_document, render_raster
+
+    document = open_document(pdf_path)
+    # إحماء: تحميل الخطوط وتحليل الصفحات أول مرة لا يُحسب ضمن زمن الرسم
+    for page_idx in sample_pages:
+        render_raster(document, page_idx, 0.25)
+    results = {}
+    for scale in BENCH_SCALES:
+        samples = [_timings(lambda p=p: render_raster(document, p, scale), 1)[0] for p in sample_pages]
+        results[f"{scale:g}"] = summarize(samples)
+    document.close()
+    return results
+
+
+def bench_recolor(pdf_path: str, repeat: int) -> dict:
+    """تكلفة تحويل صفحة بمعامل 2 إلى أنماط الألوان"""
+    from recolor import recolor
+    from renderer import open_document, render_raster
+
+    document = open_document(pdf_path)
+    raster = render_raster(document, 0, 2.0)
+    document.close()
+    results = {}
+    for variant in BENCH_VARIANTS:
+        recolor(raster, variant)
+        results[variant.split(":")[0]] = summarize(_timings(lambda: recolor(raster, variant), repeat))
+    return results
+
+
+def bench_caches(pdf_path: str, cache_dir: Path, repeat: int) -> dict:
+    """زمن الإصابة في ذاكرة الصفحات والتخزين الدائم"""
+    from disk_cache import DiskCache
+    from page_cache import PageCache
+    from raster import decode_raster, encode_raster
+    from renderer import open_document, render_raster
+
+    document = open_document(pdf_path)
+    raster = render_raster(document, 0, 2.0)
+    document.close()
+
+    memory = PageCache(1 << 30)
+    key = (0, 2.0, "light")
+    memory.put(key, raster, len(raster.samples))
+    iterations = 10000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        memory.get(key)
+    memory_hit_us = (time.perf_counter() - start) / iterations * 1e6
+
+    disk = DiskCache(cache_dir, 1 << 30)
+    encoded = encode_raster(raster)
+    return {
+        "memory_hit_us": round(memory_hit_us, 3),
+        "encode": summarize(_timings(lambda: encode_raster(raster), repeat)),
+        "disk_put": summarize(_timings(lambda: disk.put("bench/p0000.qr", encoded), repeat)),
+        "disk_hit": summarize(_timings(lambda: decode_raster(disk.get("bench/p0000.qr")), repeat)),
+        "entry_bytes": len(encoded),
+        "raw_bytes": len(raster.samples),
+    }
+
+
+def bench_search(pdf_path: str, page_count: int, workers: Optional[int], repeat: int) -> dict:
+    """زمن بناء فهرس البحث (تسلسلياً وعلى التوازي) وزمن الاستعلامات"""
+    from index_builder import build_index_parallel, default_workers
+    from renderer import open_document
+    from search_index import build_index
+    from utils import pdf_fingerprint
+
+    document = open_document(pdf_path)
+    start = time.perf_counter()
+    serial = build_index(document, "bench")
+    serial_ms = (time.perf_counter() - start) * 1000
+    document.close()
+
+    workers = workers or default_workers()
+    start = time.perf_counter()
+    build_index_parallel(pdf_path, pdf_fingerprint(pdf_path), page_count, workers=workers)
+    parallel_ms = (time.perf_counter() - start) * 1000
+
+    # استعلامات من مفردات الفهرس نفسه: كلمات شائعة وبادئة وعبارة من كلمتين
+    vocabulary = sorted(serial.postings, key=lambda token: -len(serial.postings[token]))
+    common = vocabulary[0]
+    rare = vocabulary[-1]
+    page, position = serial.postings[common][0]
+    following = next(token for token, hits in serial.postings.items()
+                     if (page, position + 1) in hits)
+    queries = {
+        "common_word": common,
+        "rare_word": rare,
+        "prefix": common[:2],
+        "phrase": f"{common} {following}",
+    }
+    query_results = {}
+    for label, query in queries.items():
+        hits = len(serial.search(query))
+        query_results[label] = {**summarize(_timings(lambda: serial.search(query), repeat)),
+                                "hits": hits}
+    return {
+        "build_serial_ms": round(serial_ms, 1),
+        "build_parallel_ms": round(parallel_ms, 1),
+        "workers": workers,
+        "tokens": len(serial.postings),
+        "queries": query_results,
+    }
+
+
+def bench_cold_start(pdf_path: str, home: Path) -> dict:
+    """زمن ظهور أول صفحة في عملية جديدة دون تخزين دائم ثم معه"""
+    env = dict(os.environ, HOME=str(home), QT_QPA_PLATFORM="offscreen")
+    source_dir = str(Path(__file__).resolve().parent)
+    results = {}
+    for label in ("cold", "warm"):
+        output = subprocess.run(
+            [sys.executable, "-c", _COLD_START_SCRIPT, pdf_path, source_dir],
+            env=env, capture_output=True, text=True, timeout=120,
+        )
+        lines = [line for line in output.stdout.splitlines() if line.startswith("{")]
+        if output.returncode != 0 or not lines:
+            results[label] = {"error": output.stderr.strip().splitlines()[-1:] or "no output"}
+            continue
+        data = json.loads(lines[-1])
+        results[label] = {key: round(value, 1) if value is not None else None
+                          for key, value in data.items()}
+    return results
+
+
+def peak_rss_mib() -> dict:
+    """أقصى استهلاك للذاكرة للعملية الحالية وللعمليات الفرعية"""
+    # ru_maxrss بالكيلوبايت على لينكس وبالبايت على macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+    return {"self": round(own / 2**20, 1), "children": round(children / 2**20, 1)}
+
+
+def run_benchmarks(pages: int = 604, repeat: int = 20, workers: Optional[int] = None,
+                   pdf_path: Optional[str] = None, cold_start: bool = True,
+                   log=print) -> dict:
+    """
+    تشغيل كل القياسات
+
+    Args:
+        pages: عدد صفحات الملف الاصطناعي
+        repeat: عدد التكرارات لكل قياس
+        workers: عدد عمليات بناء فهرس البحث
+        pdf_path: ملف PDF بديل عن الملف الاصطناعي
+        cold_start: قياس زمن ظهور أول صفحة في عملية جديدة
+        log: دالة طباعة التقدم
+
+    Returns:
+        النتائج
+    """
+    with tempfile.TemporaryDirectory(prefix="quran-bench-") as tmp:
+        tmp = Path(tmp)
+        # منزل مؤقت حتى لا تُستخدم ذاكرة المستخدم أو إعداداته
+        home = tmp / "home"
+        home.mkdir()
+        previous_home = os.environ.get("HOME")
+        os.environ["HOME"] = str(home)
+        try:
+            return _run(tmp, pages, repeat, workers, pdf_path, cold_start, log)
+        finally:
+            if previous_home is None:
+                os.environ.pop("HOME", None)
+            else:
+                os.environ["HOME"] = previous_home
+
+
+def _run(tmp: Path, pages: int, repeat: int, workers: Optional[int],
+         pdf_path: Optional[str], cold_start: bool, log) -> dict:
+    started = time.perf_counter()
+    if pdf_path is None:
+        log(f"📄 توليد ملف اصطناعي من {pages} صفحة...")
+        pdf_path = str(make_synthetic_pdf(tmp / "synthetic.pdf", pages))
+    from renderer import open_document
+    document = open_document(pdf_path)
+    page_count = len(document)
+    document.close()
+    generate_ms = (time.perf_counter() - started) * 1000
+    sample_pages = list(range(0, page_count, max(1, page_count // repeat)))[:repeat]
+
+    results = {
+        "app_version": APP_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pages": page_count,
+        "setup_ms": round(generate_ms, 1),
+    }
+    log("🖼️  زمن الرسم...")
+    results["render"] = bench_render(pdf_path, sample_pages)
+    log("🎨 تحويل الألوان...")
+    results["recolor"] = bench_recolor(pdf_path, repeat)
+    log("💾 التخزين المؤقت...")
+    results["cache"] = bench_caches(pdf_path, tmp / "cache", repeat)
+    log("🔍 فهرس البحث...")
+    results["search"] = bench_search(pdf_path, page_count, workers, repeat)
+    if cold_start:
+        log("🚀 بدء التشغيل...")
+        results["startup"] = bench_cold_start(pdf_path, tmp / "startup-home")
+    results["peak_rss_mib"] = peak_rss_mib()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="قياس أداء Quran Unix")
+    parser.add_argument("--pages", type=int, default=604, help="عدد صفحات الملف الاصطناعي")
+    parser.add_argument("--repeat", type=int, default=20, help="عدد التكرارات لكل قياس")
+    parser.add_argument("--workers", type=int, default=None, help="عدد عمليات بناء الفهرس")
+    parser.add_argument("--pdf", default=None, help="استخدام ملف PDF حقيقي بدلاً من الاصطناعي")
+    parser.add_argument("--no-startup", action="store_true", help="تخطي قياس بدء التشغيل")
+    parser.add_argument("--output", "-o", default=None, help="حفظ النتائج في ملف JSON")
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+    results = run_benchmarks(args.pages, args.repeat, args.workers, args.pdf,
+                             not args.no_startup, log)
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        log(f"✅ تم حفظ النتائج في {args.output}")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,8 @@ APP_AUTHOR = "Quran Unix Team"
 
 # ملف PDF الافتراضي
 DEFAULT_PDF_FILE = "MushafMadinaHafsGreen1441HQ.pdf"
+# حزمة الصفحات المرسومة مسبقاً (اختيارية، تُبنى بـ make pack)
+PAGE_PACK_FILE = "pages.qpack"
 
 # الإعدادات الافتراضية
 DEFAULT_SETTINGS = {
@@ -19,8 +21,73 @@ DEFAULT_SETTINGS = {
     "zoom": 1.0,
     "window_width": 1200,
     "window_height": 800,
+    # نمط ألوان صفحات المصحف: auto (حسب الوضع الليلي)، light، dark، sepia، night، theme
+    "page_color": "auto",
+    # فهارس الصفحات المحفوظة كإشارات مرجعية
+    "bookmarks": [],
+    # عرض صفحتين متقابلتين من اليمين إلى اليسار
+    "spread_mode": False,
+    # تمرير متصل لكل الصفحات بدلاً من صفحة واحدة
+    "continuous_mode": False,
+    # الطبعة المعروضة، والطبعات الإضافية: [{"id", "title", "pdf", "page_offset"}]
+    "edition": "",
+    "editions": [],
+    # وضع العرض التلقائي لشاشات المساجد، والمدة بين الصفحات بالثواني (0 = بجهاز التحكم فقط)
+    "kiosk_mode": False,
+    "kiosk_interval": 60,
 }
 
+# مدة تجميع تغييرات الإعدادات قبل حفظها (بالثواني)
+SETTINGS_SAVE_DELAY = 1.0
+
+# إعدادات الرسم
+# معامل الرسم الأساسي للصفحة (يعادل تكبير 100% في العارض)
+RENDER_SCALE = 2.0
+# حدود معامل رسم الصفحة كاملة عند إعادة الرسم حسب مستوى التكبير
+# (فوق الحد الأعلى تُرسم الأجزاء الظاهرة فقط على شكل بلاطات)
+MIN_RENDER_SCALE = 0.5
+MAX_RENDER_SCALE = 4.0
+# أعلى معامل رسم للبلاطات عند التكبير العميق
+MAX_TILE_SCALE = 22.63
+# طول ضلع البلاطة بالبكسل، وعدد البلاطات الإضافية حول المنطقة الظاهرة
+TILE_SIZE = 512
+TILE_MARGIN = 1
+# مدة انتظار توقف التكبير قبل إعادة الرسم بدقة مطابقة (بالمللي ثانية)
+ZOOM_SETTLE_MS = 200
+# مدة انتظار توقف التنقل السريع قبل الجلب المسبق وحفظ الإعدادات (بالمللي ثانية)
+NAV_SETTLE_MS = 150
+# عدد الصفحات المجاورة التي تُرسم مسبقاً في كل اتجاه
+PREFETCH_PAGES = 2
+# التمرير المتصل: المسافة بين الصفحات (بإحداثيات المشهد)، وعدد الصفحات المرسومة
+# خارج المنطقة الظاهرة من كل جهة
+CONTINUOUS_GAP = 16
+CONTINUOUS_MARGIN_PAGES = 1
+# عدد عمال الرسم في الخلفية (لكل منهم نسخة مستقلة من ملف الـ PDF)
+RENDER_WORKERS = 2
+# الحد الأقصى لذاكرة الصفحات المرسومة (بالبايت)
+PAGE_CACHE_BYTES = 256 * 1024 * 1024
+# الحد الأقصى للتخزين الدائم للصفحات على القرص (بالبايت)
+DISK_CACHE_BYTES = 512 * 1024 * 1024
+
+# خادم صور الصفحات لشاشات العرض: العنوان والمنفذ الافتراضيان، وعدد عمليات الرسم
+# المتزامنة، والحد الأقصى لذاكرة الصور المرمزة (بالبايت)، ومهلة الاتصال الخامل (بالثواني)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8604
+SERVER_MAX_RENDERS = 2
+SERVER_CACHE_BYTES = 128 * 1024 * 1024
+SERVER_IDLE_TIMEOUT = 30
+
+# عدد الشرائح المرسومة مسبقاً في وضع العرض التلقائي
+KIOSK_PRELOAD = 3
+
+# عرض الصور المصغرة للصفحات بالبكسل، والحد الأقصى لذاكرة صورها المعروضة (بالبايت)
+THUMB_WIDTH = 96
+THUMB_CACHE_BYTES = 24 * 1024 * 1024
+
+# مراقبة توقف الواجهة: الفترة بين نبضات حلقة الأحداث، والتأخر الذي يُعتبر تعليقاً (بالمللي ثانية)
+HEARTBEAT_MS = 100
+STALL_THRESHOLD_MS = 250
+
 # ألوان الوضع النهاري - تحسين الألوان لتكون أكثر حداثة
 LIGHT_THEME = {
     "sidebar_bg": "#f8f9fa",
@@ -38,6 +105,8 @@ LIGHT_THEME = {
     "nav_btn_hover": "#1c7ed6",
     "status_bg": "#f8f9fa",
     "status_color": "#495057",
+    "page_paper": "#fbf8ef",
+    "page_ink": "#1b1b1b",
 }
 
 # ألوان الوضع الليلي - تحسين الألوان لتكون مريحة للعين
@@ -57,6 +126,18 @@ DARK_THEME = {
     "nav_btn_hover": "#1864ab",
     "status_bg": "#1a1b1e",
     "status_color": "#a6a7ab",
+    "page_paper": "#1a1b1e",
+    "page_ink": "#d5d6d9",
+}
+
+# أنماط ألوان صفحات المصحف المتاحة في الواجهة
+PAGE_COLOR_MODES = {
+    "auto": "تلقائي",
+    "light": "الألوان الأصلية",
+    "dark": "معكوس",
+    "sepia": "بني دافئ",
+    "night": "ضوء أزرق منخفض",
+    "theme": "ألوان السمة",
 }
 
 # اختصارات لوحة المفاتيح
@@ -67,7 +148,13 @@ KEYBOARD_SHORTCUTS = {
     "zoom_out": "Ctrl+-",
     "zoom_reset": "Ctrl+0",
     "search": "Ctrl+F",
+    "bookmark": "Ctrl+D",
+    "print": "Ctrl+P",
+    "thumbnails": "Ctrl+T",
+    "spread": "Ctrl+2",
+    "continuous": "Ctrl+3",
     "fullscreen": "F11",
+    "kiosk": "F5",
 }
 
 # قائمة السور المستخرجة من الـ PDF
@@ -189,3 +276,62 @@ SURAHS = [
     (115, 'اصطلاحات الضبط', 613),
     (116, 'علامات الوقف', 630),
 ]
+
+# أسماء السور بالحروف اللاتينية (للبحث بالإنجليزية)
+SURAH_NAMES_LATIN = [
+    "Al-Fatihah", "Al-Baqarah", "Ali 'Imran", "An-Nisa", "Al-Ma'idah", "Al-An'am", "Al-A'raf",
+    "Al-Anfal", "At-Tawbah", "Yunus", "Hud", "Yusuf", "Ar-Ra'd", "Ibrahim", "Al-Hijr",
+    "An-Nahl", "Al-Isra", "Al-Kahf", "Maryam", "Taha", "Al-Anbya", "Al-Hajj", "Al-Mu'minun",
+    "An-Nur", "Al-Furqan", "Ash-Shu'ara", "An-Naml", "Al-Qasas", "Al-Ankabut", "Ar-Rum",
+    "Luqman", "As-Sajdah", "Al-Ahzab", "Saba", "Fatir", "Ya-Sin", "As-Saffat", "Sad",
+    "Az-Zumar", "Ghafir", "Fussilat", "Ash-Shuraa", "Az-Zukhruf", "Ad-Dukhan", "Al-Jathiyah",
+    "Al-Ahqaf", "Muhammad", "Al-Fath", "Al-Hujurat", "Qaf", "Adh-Dhariyat", "At-Tur", "An-Najm",
+    "Al-Qamar", "Ar-Rahman", "Al-Waqi'ah", "Al-Hadid", "Al-Mujadila", "Al-Hashr",
+    "Al-Mumtahanah", "As-Saf", "Al-Jumu'ah", "Al-Munafiqun", "At-Taghabun", "At-Talaq",
+    "At-Tahrim", "Al-Mulk", "Al-Qalam", "Al-Haqqah", "Al-Ma'arij", "Nuh", "Al-Jinn",
+    "Al-Muzzammil", "Al-Muddaththir", "Al-Qiyamah", "Al-Insan", "Al-Mursalat", "An-Naba",
+    "An-Nazi'at", "Abasa", "At-Takwir", "Al-Infitar", "Al-Mutaffifin", "Al-Inshiqaq",
+    "Al-Buruj", "At-Tariq", "Al-A'la", "Al-Ghashiyah", "Al-Fajr", "Al-Balad", "Ash-Shams",
+    "Al-Layl", "Ad-Duhaa", "Ash-Sharh", "At-Tin", "Al-Alaq", "Al-Qadr", "Al-Bayyinah",
+    "Az-Zalzalah", "Al-Adiyat", "Al-Qari'ah", "At-Takathur", "Al-Asr", "Al-Humazah", "Al-Fil",
+    "Quraysh", "Al-Ma'un", "Al-Kawthar", "Al-Kafirun", "An-Nasr", "Al-Masad", "Al-Ikhlas",
+    "Al-Falaq", "An-Nas",
+]
+
+# الفرق بين رقم صفحة ملف الـ PDF ورقم الصفحة في المصحف المطبوع
+# (الفاتحة في الصفحة 1 من المصحف والصفحة 4 من الملف)
+MUSHAF_PAGE_OFFSET = 3
+
+# طبعات المصحف المتاحة (الأولى هي الافتراضية)، ويمكن إضافة غيرها في إعداد
+# "editions" بنفس المفاتيح مع surah_pages و hizb_pages إن اختلف ترقيمها
+EDITIONS = [
+    {"id": "madinah-hafs-1441", "title": "مصحف المدينة - حفص", "pdf": DEFAULT_PDF_FILE,
+     "page_offset": MUSHAF_PAGE_OFFSET},
+]
+
+# عدد آيات كل سورة
+SURAH_VERSES = [
+    7, 286, 200, 176, 120, 165, 206, 75, 129, 109, 123, 111, 43, 52, 99, 128, 111, 110, 98, 135,
+    112, 78, 118, 64, 77, 227, 93, 88, 69, 60, 34, 30, 73, 54, 45, 83, 182, 88, 75, 85,
+    54, 53, 89, 59, 37, 35, 38, 29, 18, 45, 60, 49, 62, 55, 78, 96, 29, 22, 24, 13,
+    14, 11, 11, 18, 12, 12, 30, 52, 52, 44, 28, 28, 20, 56, 40, 31, 50, 40, 46, 42,
+    29, 19, 36, 25, 22, 17, 19, 26, 30, 20, 15, 21, 11, 8, 8, 19, 5, 8, 8, 11,
+    11, 8, 3, 9, 5, 4, 7, 3, 6, 3, 5, 4, 5, 6,
+]
+
+# بدايات الأحزاب الستين: (السورة، الآية، صفحة المصحف)
+# كل حزب فردي هو بداية جزء
+HIZB_STARTS = [
+    (1, 1, 1), (2, 75, 11), (2, 142, 22), (2, 203, 32), (2, 253, 42),
+    (3, 15, 51), (3, 93, 62), (3, 171, 72), (4, 24, 82), (4, 88, 92),
+    (4, 148, 102), (5, 27, 111), (5, 82, 121), (6, 36, 132), (6, 111, 142),
+    (7, 1, 151), (7, 88, 162), (7, 171, 173), (8, 41, 182), (9, 34, 192),
+    (9, 93, 201), (10, 26, 212), (11, 6, 222), (11, 84, 231), (12, 53, 242),
+    (13, 19, 252), (15, 1, 262), (16, 51, 272), (17, 1, 282), (17, 99, 292),
+    (18, 75, 302), (20, 1, 312), (21, 1, 322), (22, 1, 332), (23, 1, 342),
+    (24, 21, 352), (25, 21, 362), (26, 111, 371), (27, 56, 382), (28, 51, 392),
+    (29, 46, 402), (31, 22, 413), (33, 31, 422), (34, 24, 431), (36, 28, 442),
+    (37, 145, 451), (39, 32, 462), (40, 41, 472), (41, 47, 482), (43, 24, 491),
+    (46, 1, 502), (48, 18, 513), (51, 31, 522), (55, 1, 531), (58, 1, 542),
+    (62, 1, 553), (67, 1, 562), (72, 1, 572), (78, 1, 582), (87, 1, 591),
+]
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+تخزين مؤقت دائم للصفحات المرسومة على القرص مع حد أقصى للحجم
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from utils import atomic_write
+
+
+def page_entry_name(fingerprint: str, page_idx: int, scale: float) -> str:
+    """
+    اسم ملف الصفحة المرسومة في التخزين الدائم
+
+    Args:
+        fingerprint: بصمة ملف الـ PDF
+        page_idx: فهرس الصفحة
+        scale: معامل الرسم
+
+    Returns:
+        المسار النسبي داخل مجلد التخزين
+    """
+    return f"{fingerprint}/p{page_idx:04d}-s{scale:g}.qr"
+
+
+class DiskCache:
+    """
+    مخزن ملفات بسيط بحد أقصى من البايتات
+
+    يُحدَّث وقت تعديل الملف عند كل قراءة، ويُحذف الأقدم استخداماً
+    عند تجاوز الحد الأقصى
+    """
+
+    # عند التقليم يُخفض الحجم إلى هذه النسبة لتجنب التقليم عند كل كتابة
+    TRIM_RATIO = 0.9
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def path_for(self, name: str) -> Path:
+        """مسار الملف المقابل لاسم المفتاح"""
+        return self.root / name
+
+    def get(self, name: str) -> Optional[bytes]:
+        """
+        قراءة عنصر من القرص
+
+        Args:
+            name: اسم المفتاح (مسار نسبي)
+
+        Returns:
+            البيانات أو None إذا لم توجد
+        """
+        path = self.path_for(name)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, name: str, data: bytes):
+        """
+        كتابة عنصر بشكل ذري (ملف مؤقت ثم إعادة تسمية)
+
+        Args:
+            name: اسم المفتاح (مسار نسبي)
+            data: البيانات
+        """
+        if len(data) > self.max_bytes:
+            return
+        path = self.path_for(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            old_size = path.stat().st_size
+        except OSError:
+            old_size = 0
+        with self._lock:
+            # الحجم الكلي يُحسب قبل الكتابة حتى لا يُحسب الملف الجديد مرتين
+            self._scan_total()
+        try:
+            # بيانات قابلة لإعادة الإنشاء فلا حاجة للمزامنة مع القرص
+            atomic_write(path, data, sync=False)
+        except OSError:
+            return
+
+        with self._lock:
+            total = self._scan_total() + len(data) - old_size
+            self._total_bytes = total
+            if total > self.max_bytes:
+                self._trim()
+
+    def total_bytes(self) -> int:
+        """الحجم الكلي للملفات المخزنة"""
+        with self._lock:
+            return self._scan_total()
+
+    def _scan_total(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, _, size in self._files())
+        return self._total_bytes
+
+    def _files(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_mtime_ns, stat.st_size
+
+    def _trim(self):
+        target = int(self.max_bytes * self.TRIM_RATIO)
+        files = sorted(self._files(), key=lambda item: item[1])
+        total = sum(size for _, _, size in files)
+        for path, _, size in files:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+        self._total_bytes = total
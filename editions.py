@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+سجل المصاحف: عدة طبعات مفتوحة معاً، لكل منها جداول صفحاتها، وتتقاسم ذاكرة
+صفحات واحدة بميزانية مشتركة
+
+الانتقال بين الطبعات يتم بالسورة والآية لأن أرقام الصفحات تختلف بينها
+"""
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from config import DEFAULT_PDF_FILE, EDITIONS, HIZB_STARTS, MUSHAF_PAGE_OFFSET, SURAHS
+from page_cache import CacheNamespace, PageCache
+from page_meta import PageMetadata
+
+
+class EditionSpec(NamedTuple):
+    """وصف طبعة من المصحف"""
+    edition_id: str
+    title: str
+    pdf_file: str
+    # عدد صفحات الملف قبل الصفحة الأولى من المصحف
+    page_offset: int = MUSHAF_PAGE_OFFSET
+    # صفحة المصحف لبداية كل سورة وكل حزب (None = نفس ترقيم مصحف المدينة)
+    surah_pages: Optional[Sequence[int]] = None
+    hizb_pages: Optional[Sequence[int]] = None
+
+
+def parse_editions(entries: Iterable[dict]) -> List[EditionSpec]:
+    """
+    قراءة أوصاف الطبعات من الإعدادات (الأوصاف الناقصة أو غير الصالحة تُتجاهل)
+
+    Args:
+        entries: قواميس بالمفاتيح id و title و pdf و page_offset و surah_pages و hizb_pages
+
+    Returns:
+        قائمة الطبعات
+    """
+    specs = []
+    for entry in entries:
+        try:
+            surah_pages = entry.get("surah_pages")
+            hizb_pages = entry.get("hizb_pages")
+            if surah_pages is not None and len(surah_pages) != len(SURAHS):
+                continue
+            if hizb_pages is not None and len(hizb_pages) != len(HIZB_STARTS):
+                continue
+            specs.append(EditionSpec(
+                str(entry["id"]), str(entry.get("title") or entry["id"]), str(entry["pdf"]),
+                int(entry.get("page_offset", MUSHAF_PAGE_OFFSET)),
+                tuple(int(page) for page in surah_pages) if surah_pages else None,
+                tuple(int(page) for page in hizb_pages) if hizb_pages else None,
+            ))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            continue
+    return specs
+
+
+def edition_metadata(spec: EditionSpec, page_count: Optional[int] = None) -> PageMetadata:
+    """
+    جداول صفحات طبعة
+
+    Args:
+        spec: وصف الطبعة
+        page_count: عدد صفحات ملفها
+
+    Returns:
+        بيانات الصفحات بفهارس ملف هذه الطبعة
+    """
+    # صفحات SURAHS بترقيم ملف مصحف المدينة
+    surah_pages = spec.surah_pages or [page - MUSHAF_PAGE_OFFSET for _, _, page in SURAHS]
+    surahs = [(num, name, mushaf_page + spec.page_offset)
+              for (num, name, _), mushaf_page in zip(SURAHS, surah_pages)]
+    hizb_starts = HIZB_STARTS
+    if spec.hizb_pages:
+        hizb_starts = [(surah, ayah, page) for (surah, ayah, _), page in zip(HIZB_STARTS, spec.hizb_pages)]
+    return PageMetadata(page_count, surahs, spec.page_offset, hizb_starts)
+
+
+class Edition:
+    """
+    طبعة مفتوحة: المستند وجداول صفحاته وجزؤه من الذاكرة المشتركة
+
+    الواجهة تضيف إليها عمال الرسم وفهرس البحث الخاصين بها، فتبقى جاهزة
+    عند الرجوع إليها
+    """
+
+    def __init__(self, spec: EditionSpec, pdf_path: str, page_cache: CacheNamespace):
+        self.spec = spec
+        self.pdf_path = pdf_path
+        self.page_cache = page_cache
+        self.document = None
+        self.meta = edition_metadata(spec)
+        self.page_pack = None
+        self.render_pool = None
+        self.index_loader = None
+        self.search_index = None
+
+    @property
+    def edition_id(self) -> str:
+        return self.spec.edition_id
+
+    @property
+    def is_open(self) -> bool:
+        return self.document is not None
+
+
+class DocumentRegistry:
+    """
+    سجل الطبعات المتاحة والمفتوحة
+
+    كل طبعة تُفتح مرة واحدة عند أول استخدام وتبقى مفتوحة، والصفحات المرسومة
+    لكل الطبعات في ذاكرة واحدة
+    """
+
+    def __init__(self, specs: Sequence[EditionSpec], cache: PageCache,
+                 resolve_path: Callable[[str], str] = str, opener: Optional[Callable] = None):
+        """
+        Args:
+            specs: الطبعات المتاحة (الأولى هي الافتراضية)
+            cache: الذاكرة المشتركة للصفحات المرسومة
+            resolve_path: تحويل مسار ملف الطبعة إلى مسار فعلي
+            opener: دالة فتح ملف PDF (الافتراضي renderer.open_document)
+        """
+        self.specs: Dict[str, EditionSpec] = {}
+        for spec in specs:
+            self.specs.setdefault(spec.edition_id, spec)
+        self.cache = cache
+        self.resolve_path = resolve_path
+        self.opener = opener
+        self._editions: Dict[str, Edition] = {}
+
+    @property
+    def default_id(self) -> str:
+        return next(iter(self.specs))
+
+    def edition(self, edition_id: Optional[str] = None) -> Edition:
+        """
+        طبعة بمعرفها دون فتح ملفها (الافتراضية إذا لم توجد)
+
+        Args:
+            edition_id: معرف الطبعة
+
+        Returns:
+            الطبعة
+        """
+        if edition_id not in self.specs:
+            edition_id = self.default_id
+        edition = self._editions.get(edition_id)
+        if edition is None:
+            spec = self.specs[edition_id]
+            edition = Edition(spec, self.resolve_path(spec.pdf_file),
+                              CacheNamespace(self.cache, edition_id))
+            self._editions[edition_id] = edition
+        return edition
+
+    def open(self, edition: Edition) -> Edition:
+        """فتح ملف طبعة وحساب جداول صفحاتها (لا شيء إن كانت مفتوحة)"""
+        if edition.document is None:
+            opener = self.opener
+            if opener is None:
+                from renderer import open_document as opener
+            edition.document = opener(edition.pdf_path)
+            edition.meta = edition_metadata(edition.spec, len(edition.document))
+        return edition
+
+    def opened(self) -> List[Edition]:
+        """الطبعات المفتوحة حالياً"""
+        return [edition for edition in self._editions.values() if edition.is_open]
+
+    def translate_page(self, source: Edition, page_idx: int, target: Edition) -> int:
+        """
+        الصفحة في طبعة أخرى التي تحتوي على أول آية من صفحة
+
+        Args:
+            source: الطبعة الحالية
+            page_idx: فهرس الصفحة فيها
+            target: الطبعة المطلوبة
+
+        Returns:
+            فهرس الصفحة في الطبعة المطلوبة
+        """
+        if page_idx < source.spec.page_offset:
+            # صفحات المقدمة تقابل صفحات المقدمة
+            return min(page_idx, max(target.spec.page_offset - 1, 0), target.meta.page_count - 1)
+        surah_num, ayah = source.meta.page_ayah(page_idx)
+        return min(target.meta.ayah_page(surah_num, ayah), target.meta.page_count - 1)
+
+    def close_all(self):
+        """إغلاق ملفات كل الطبعات"""
+        for edition in self._editions.values():
+            if edition.document is not None:
+                edition.document.close()
+                edition.document = None
+            if edition.page_pack is not None:
+                edition.page_pack.close()
+                edition.page_pack = None
+
+
+def default_specs(extra: Iterable[dict] = ()) -> List[EditionSpec]:
+    """الطبعات المعرفة في الإعدادات العامة ثم الطبعات التي أضافها المستخدم"""
+    return parse_editions(EDITIONS) + parse_editions(extra) or [
+        EditionSpec("default", DEFAULT_PDF_FILE, DEFAULT_PDF_FILE)
+    ]
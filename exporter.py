@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+تصدير صفحات المصحف كصور من سطر الأوامر دون واجهة رسومية
+
+    python main.py export --pages 1-604 --dpi 300 --format png --theme dark
+
+الصفحات تُوزع على مجموعة عمليات، كل عملية تفتح نسختها الخاصة من ملف الـ PDF
+وتكتب الصور مباشرة على القرص، فلا تمر الصور بالعملية الرئيسية ويبقى استهلاك
+الذاكرة محدوداً بعدد العمليات مهما كان عدد الصفحات
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from config import PAGE_COLOR_MODES
+from utils import parse_page_ranges
+
+EXPORT_FORMATS = ("png", "webp")
+# أنماط الألوان الثابتة (auto و theme يعتمدان على حالة الواجهة)
+EXPORT_THEMES = tuple(mode for mode in PAGE_COLOR_MODES if mode not in ("auto", "theme"))
+WEBP_QUALITY = 90
+
+# مستند كل عملية (يُفتح مرة واحدة عند بدء العملية)
+_document = None
+
+
+def _init_worker(pdf_path: str):
+    global _document
+    from renderer import open_document
+    _document = open_document(pdf_path)
+
+
+def _export_page(page_idx: int, scale: float, theme: str, fmt: str, path: str) -> Tuple[int, int]:
+    """رسم صفحة وكتابتها على القرص داخل عملية العامل، ويُرجع (الصفحة، حجم الملف)"""
+    from recolor import recolor
+    from renderer import render_raster
+
+    raster = recolor(render_raster(_document, page_idx, scale), theme)
+    if fmt == "webp":
+        from PIL import Image
+        mode = "RGBA" if raster.alpha else "RGB"
+        image = Image.frombuffer(mode, (raster.width, raster.height), raster.samples,
+                                 "raw", mode, raster.stride, 1)
+        image.save(path, "WEBP", quality=WEBP_QUALITY, method=4)
+    else:
+        import fitz  # PyMuPDF
+        pix = fitz.Pixmap(fitz.csRGB, raster.width, raster.height, raster.samples, raster.alpha)
+        pix.save(path)
+    return page_idx, os.path.getsize(path)
+
+
+def page_filename(page_idx: int, fmt: str) -> str:
+    """اسم ملف الصفحة المصدرة (برقم صفحة الملف الذي يبدأ من 1)"""
+    return f"page-{page_idx + 1:04d}.{fmt}"
+
+
+def export_pages(pdf_path: str, pages: List[int], output_dir: Path, dpi: int = 150,
+                 fmt: str = "png", theme: str = "light", workers: Optional[int] = None,
+                 progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    تصدير صفحات كصور على عدة عمليات
+
+    Args:
+        pdf_path: مسار ملف الـ PDF
+        pages: فهارس الصفحات (تبدأ من 0)
+        output_dir: مجلد الحفظ
+        dpi: دقة الصور
+        fmt: الصيغة (png أو webp)
+        theme: نمط الألوان
+        workers: عدد العمليات
+        progress: دالة تُستدعى بعد كل صفحة (المنجز، الإجمالي)
+
+    Returns:
+        مجموع أحجام الملفات المكتوبة بالبايت
+
+    Raises:
+        RuntimeError: إذا فشل تصدير صفحة (تُلغى الصفحات المتبقية)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, workers or os.cpu_count() or 1)
+    scale = dpi / 72.0
+    total_bytes = 0
+    done = 0
+
+    # fork متاح على لينكس ولا توجد خيوط في وضع سطر الأوامر، ويتجنب إعادة
+    # استيراد main.py (ومعه PyQt) في كل عملية كما يحدث مع spawn
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(pdf_path,)) as executor:
+        queue = iter(pages)
+        running = {}
+        while True:
+            # عدد محدود من المهام المعلقة يكفي لإبقاء العمليات مشغولة
+            for page_idx in queue:
+                path = str(output_dir / page_filename(page_idx, fmt))
+                running[executor.submit(_export_page, page_idx, scale, theme, fmt, path)] = page_idx
+                if len(running) >= workers * 2:
+                    break
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                page_idx = running.pop(future)
+                try:
+                    _, size = future.result()
+                except Exception as e:
+                    for pending in running:
+                        pending.cancel()
+                    raise RuntimeError(f"فشل تصدير الصفحة {page_idx + 1} بعد تصدير "
+                                       f"{done} صفحة: {e}") from e
+                total_bytes += size
+                done += 1
+                if progress is not None:
+                    progress(done, len(pages))
+    return total_bytes
+
+
+def _page_count(pdf_path: str) -> int:
+    from renderer import open_document
+    document = open_document(pdf_path)
+    try:
+        return len(document)
+    finally:
+        document.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py export",
+                                     description="تصدير صفحات المصحف كصور")
+    parser.add_argument("--pdf", help="مسار ملف الـ PDF (الافتراضي ملف المصحف المرفق)")
+    parser.add_argument("--pages", default="1-", help="الصفحات، مثل 1-604 أو 1,5,10-20")
+    parser.add_argument("--dpi", type=int, default=150, help="دقة الصور")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="png", dest="fmt")
+    parser.add_argument("--theme", default="light",
+                        help=f"نمط الألوان: {', '.join(EXPORT_THEMES)} أو duotone:#ورق:#حبر")
+    parser.add_argument("--output", "-o", default="export", help="مجلد الحفظ")
+    parser.add_argument("--workers", "-j", type=int, default=None, help="عدد العمليات")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, default_pdf: Optional[str] = None) -> int:
+    """
+    نقطة دخول أمر التصدير
+
+    Args:
+        argv: معاملات سطر الأوامر بعد كلمة export
+        default_pdf: ملف الـ PDF المستخدم إذا لم يُحدد --pdf
+
+    Returns:
+        رمز الخروج
+    """
+    args = build_parser().parse_args(argv)
+    pdf_path = args.pdf or default_pdf
+    if not pdf_path or not os.path.exists(pdf_path):
+        print(f"❌ لم يتم العثور على ملف الـ PDF: {pdf_path}", file=sys.stderr)
+        return 1
+    if args.theme not in EXPORT_THEMES and not args.theme.startswith("duotone:"):
+        print(f"❌ نمط ألوان غير معروف: {args.theme}", file=sys.stderr)
+        return 2
+    if not 18 <= args.dpi <= 1200:
+        print("❌ الدقة يجب أن تكون بين 18 و 1200", file=sys.stderr)
+        return 2
+    if args.fmt == "webp":
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            print("❌ التصدير بصيغة webp يحتاج إلى Pillow: pip install Pillow", file=sys.stderr)
+            return 2
+
+    try:
+        page_count = _page_count(pdf_path)
+    except (RuntimeError, OSError) as e:
+        # ملف تالف أو ليس PDF
+        print(f"❌ تعذر فتح ملف الـ PDF: {e}", file=sys.stderr)
+        return 1
+    try:
+        pages = parse_page_ranges(args.pages, page_count)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+
+    def report(done, total):
+        rate = done / max(time.perf_counter() - started, 1e-6)
+        print(f"\r📄 {done}/{total} صفحة - {rate:.1f} صفحة/ث", end="", file=sys.stderr, flush=True)
+
+    try:
+        total_bytes = export_pages(pdf_path, pages, Path(args.output), args.dpi, args.fmt,
+                                   args.theme, args.workers, report)
+    except (RuntimeError, OSError) as e:
+        print(file=sys.stderr)
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    print(file=sys.stderr)
+    print(f"✅ تم تصدير {len(pages)} صفحة إلى {args.output} في {elapsed:.1f} ث "
+          f"({len(pages) / max(elapsed, 1e-6):.1f} صفحة/ث، {total_bytes / 2**20:.1f} MiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+بناء فهرس البحث على التوازي باستخدام مجموعة عمليات
+
+كل عملية تفتح نسختها الخاصة من ملف الـ PDF وتعالج مجموعة من الصفحات،
+وتُحفظ نتيجة كل مجموعة فور وصولها ليُستأنف البناء إذا أُغلق التطبيق
+"""
+
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from search_index import SearchIndex, extract_page_words, index_path
+
+# عدد الصفحات في كل مهمة
+CHUNK_PAGES = 16
+
+
+def default_workers() -> int:
+    """عدد العمليات الافتراضي: كل الأنوية عدا واحدة للواجهة، بحد أقصى 8"""
+    return max(1, min(8, (os.cpu_count() or 2) - 1))
+
+
+def parts_dir(fingerprint: str) -> Path:
+    """مجلد النتائج الجزئية للبناء غير المكتمل"""
+    return index_path(fingerprint).with_suffix("").with_suffix(".parts")
+
+
+def _part_path(directory: Path, start: int, stop: int) -> Path:
+    return directory / f"{start:04d}-{stop:04d}.json.gz"
+
+
+def _index_range(pdf_path: str, start: int, stop: int) -> Tuple[int, int, SearchIndex]:
+    """فهرسة الصفحات [start, stop) داخل عملية مستقلة"""
+    import fitz  # PyMuPDF
+
+    index = SearchIndex()
+    document = fitz.open(pdf_path)
+    try:
+        for page_idx in range(start, stop):
+            words, boxes = extract_page_words(document[page_idx])
+            index.add_page(page_idx, words, boxes)
+    finally:
+        document.close()
+    return start, stop, index
+
+
+def build_index_parallel(pdf_path: str, fingerprint: str, page_count: int,
+                         workers: Optional[int] = None,
+                         progress: Optional[Callable[[int, int], None]] = None,
+                         should_stop: Optional[Callable[[], bool]] = None,
+                         chunk_pages: int = CHUNK_PAGES) -> Optional[SearchIndex]:
+    """
+    بناء فهرس البحث لكل الصفحات على عدة عمليات
+
+    Args:
+        pdf_path: مسار ملف الـ PDF
+        fingerprint: بصمة الملف
+        page_count: عدد الصفحات
+        workers: عدد العمليات
+        progress: دالة تُستدعى بعد كل مجموعة (الصفحات المنجزة، الإجمالي)
+        should_stop: دالة تُرجع True لإيقاف البناء (تبقى النتائج الجزئية محفوظة)
+        chunk_pages: عدد الصفحات في كل مهمة
+
+    Returns:
+        الفهرس الكامل (محفوظاً على القرص)، أو None إذا أُوقف البناء
+
+    Raises:
+        RuntimeError: إذا بقيت نتائج جزئية تالفة بعد إعادة بنائها
+    """
+    directory = parts_dir(fingerprint)
+    directory.mkdir(parents=True, exist_ok=True)
+    ranges = [(start, min(start + chunk_pages, page_count))
+              for start in range(0, page_count, chunk_pages)]
+
+    # المحاولة الثانية تعيد بناء الأجزاء التالفة التي حُذفت عند الدمج
+    for _ in range(2):
+        # المجموعات المنجزة في تشغيل سابق
+        pending = [r for r in ranges if not _part_path(directory, *r).exists()]
+        if progress is not None:
+            progress(page_count - sum(stop - start for start, stop in pending), page_count)
+        if pending and not _build_parts(pdf_path, fingerprint, directory, pending, page_count,
+                                        workers, progress, should_stop):
+            return None
+        index, corrupt = _merge_parts(directory, ranges, fingerprint)
+        if not corrupt:
+            index.save(index_path(fingerprint))
+            shutil.rmtree(directory, ignore_errors=True)
+            return index
+    raise RuntimeError("تعذر قراءة نتائج بناء فهرس البحث")
+
+
+def _build_parts(pdf_path: str, fingerprint: str, directory: Path,
+                 pending: List[Tuple[int, int]], page_count: int, workers: Optional[int],
+                 progress: Optional[Callable[[int, int], None]],
+                 should_stop: Optional[Callable[[], bool]]) -> bool:
+    """فهرسة المجموعات الناقصة وحفظ كل منها فور وصولها، ويُرجع False إذا أُوقف البناء"""
+    done = page_count - sum(stop - start for start, stop in pending)
+    # spawn بدلاً من fork لأن التطبيق متعدد الخيوط
+    context = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(max_workers=workers or default_workers(), mp_context=context)
+    stopped = False
+    try:
+        futures = {executor.submit(_index_range, pdf_path, start, stop) for start, stop in pending}
+        while futures:
+            finished, futures = wait(futures, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in finished:
+                start, stop, part = future.result()
+                part.fingerprint = fingerprint
+                part.save(_part_path(directory, start, stop))
+                done += stop - start
+                if progress is not None:
+                    progress(done, page_count)
+            if should_stop is not None and should_stop():
+                for future in futures:
+                    future.cancel()
+                stopped = True
+                return False
+        return True
+    finally:
+        # عند الإيقاف لا ننتظر المجموعات الجارية حتى لا يتأخر إغلاق التطبيق
+        # (cancel_futures غير متاح قبل Python 3.9 فتُلغى المهام المنتظرة أعلاه)
+        executor.shutdown(wait=not stopped)
+
+
+def _merge_parts(directory: Path, ranges: List[Tuple[int, int]],
+                 fingerprint: str) -> Tuple[SearchIndex, List[Tuple[int, int]]]:
+    """
+    دمج النتائج الجزئية بترتيب الصفحات
+
+    Returns:
+        (الفهرس المدمج، المجموعات التالفة التي حُذفت لإعادة بنائها)
+    """
+    index = SearchIndex(fingerprint)
+    corrupt = []
+    for start, stop in ranges:
+        path = _part_path(directory, start, stop)
+        part = SearchIndex.load(path, fingerprint)
+        if part is None:
+            path.unlink(missing_ok=True)
+            corrupt.append((start, stop))
+            continue
+        index.merge(part)
+    return index, corrupt
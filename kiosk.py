@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+طابور الشرائح القادمة في وضع العرض التلقائي (شاشات المساجد)
+
+الشرائح التالية تُرسم مسبقاً وتُحفظ صورها في طابور محدود، فيصبح الانتقال
+إلى الشريحة التالية استبدال صورة جاهزة دون أي رسم
+"""
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+# الشريحة: الصفحات المعروضة معاً (صفحة واحدة أو صفحتان متقابلتان)
+Slide = Tuple[int, ...]
+
+
+class SlideQueue:
+    """
+    الشرائح التي تلي الشريحة المعروضة مع صورها الجاهزة، بعدد أقصى ثابت
+
+    الصور تُضاف عند وصولها من عمال الرسم بأي ترتيب، والسحب من الأمام فقط
+    عند اكتمال صور الشريحة الأولى
+    """
+
+    def __init__(self, depth: int):
+        """
+        Args:
+            depth: عدد الشرائح المرسومة مسبقاً
+        """
+        self.depth = max(1, depth)
+        # (معامل الرسم، نمط الألوان) للصور المحفوظة
+        self.params: Optional[Hashable] = None
+        self._slides: Deque[Tuple[Slide, Dict[int, Any]]] = deque()
+        # شريحة أخيرة أُسقطت: الإضافة التالية تبدأ بعدها حتى لا تُطلب من جديد
+        self._after: Optional[Slide] = None
+
+    def __len__(self) -> int:
+        return len(self._slides)
+
+    def reset(self, params: Optional[Hashable] = None):
+        """إفراغ الطابور (عند تغير الصفحة أو معامل الرسم أو الألوان)"""
+        self._slides.clear()
+        self._after = None
+        self.params = params
+
+    def extend(self, current: Slide, next_slide: Callable[[Slide], Optional[Slide]]) -> List[int]:
+        """
+        إضافة الشرائح التالية حتى امتلاء الطابور
+
+        Args:
+            current: الشريحة المعروضة (تُستخدم إذا كان الطابور فارغاً)
+            next_slide: دالة تُرجع الشريحة التي تلي شريحة (أو None في النهاية)
+
+        Returns:
+            الصفحات المضافة التي تحتاج إلى صور، بترتيب عرضها
+        """
+        if self._after is not None:
+            last = self._after
+        else:
+            last = self._slides[-1][0] if self._slides else current
+        needed = []
+        while len(self._slides) < self.depth:
+            last = next_slide(last)
+            if last is None:
+                break
+            self._after = None
+            self._slides.append((last, {}))
+            needed.extend(last)
+        return needed
+
+    def put(self, page_idx: int, image: Any) -> bool:
+        """
+        حفظ صورة صفحة في كل شريحة تنتظرها
+
+        Returns:
+            True إذا كانت الصفحة مطلوبة
+        """
+        stored = False
+        for pages, images in self._slides:
+            if page_idx in pages and page_idx not in images:
+                images[page_idx] = image
+                stored = True
+        return stored
+
+    def drop(self, page_idx: int) -> bool:
+        """
+        إسقاط الشرائح التي تعذر رسم إحدى صفحاتها، فيتخطاها العرض بدلاً من انتظارها
+
+        Returns:
+            True إذا كانت الصفحة مطلوبة
+        """
+        kept = deque(slide for slide in self._slides if page_idx not in slide[0])
+        if len(kept) == len(self._slides):
+            return False
+        if page_idx in self._slides[-1][0]:
+            self._after = self._slides[-1][0]
+        self._slides = kept
+        return True
+
+    def ready(self) -> bool:
+        """هل اكتملت صور الشريحة التالية"""
+        return bool(self._slides) and len(self._slides[0][1]) == len(self._slides[0][0])
+
+    def pop(self) -> Optional[Tuple[Slide, List[Any]]]:
+        """
+        سحب الشريحة التالية إن اكتملت صورها
+
+        Returns:
+            (الصفحات، صورها بنفس الترتيب) أو None
+        """
+        if not self.ready():
+            return None
+        pages, images = self._slides.popleft()
+        return pages, [images[page_idx] for page_idx in pages]
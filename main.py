@@ -4,29 +4,17 @@ Quran Unix - تطبيق قراءة القرآن الكريم
 تطبيق بسيط وأنيق لقراءة القرآن الكريم بخط المصحف المدني
 """
 
+import time
+
+# بداية التشغيل لقياس زمن ظهور أول صفحة
+STARTUP_TIME = time.perf_counter()
+
 import sys
 import os
-import json
+import bisect
+import logging
 from pathlib import Path
 
-from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QScrollArea, QFrame, QListWidget, QListWidgetItem,
-    QSplitter, QToolBar, QStatusBar, QLineEdit, QComboBox, QSpinBox,
-    QFileDialog, QMessageBox, QGraphicsView, QGraphicsScene, QGraphicsPixmapItem,
-    QSizePolicy, QMenu, QSystemTrayIcon
-)
-from PyQt6.QtCore import Qt, QSize, pyqtSignal, QThread, QTimer, QPoint, QEvent
-from PyQt6.QtGui import (
-    QPixmap, QImage, QIcon, QFont, QKeySequence, QShortcut, QAction,
-    QPalette, QColor, QLinearGradient, QBrush, QFontDatabase, QCursor, QPainter, QKeyEvent
-)
-import fitz  # PyMuPDF
-
-# إضافة مسار src للاستيراد
-sys.path.append(os.path.dirname(__file__))
-from config import SURAHS, LIGHT_THEME, DARK_THEME, KEYBOARD_SHORTCUTS, APP_NAME, APP_VERSION
-
 def get_resource_path(relative_path):
     """الحصول على المسار الصحيح للملفات سواء في وضع التطوير أو بعد التجميع (AppImage/PyInstaller)"""
     try:
@@ -49,6 +37,65 @@ def get_resource_path(relative_path):
             
     return os.path.join(base_path, relative_path)
 
+if __name__ == "__main__" and sys.argv[1:2] == ["export"]:
+    # التصدير من سطر الأوامر لا يحتاج إلى الواجهة فيُنفذ قبل استيراد PyQt
+    sys.path.append(os.path.dirname(__file__))
+    from config import DEFAULT_PDF_FILE
+    from exporter import main as export_main
+    sys.exit(export_main(sys.argv[2:], get_resource_path(DEFAULT_PDF_FILE)))
+
+if __name__ == "__main__" and sys.argv[1:2] == ["serve"]:
+    # خادم الصفحات لشاشات العرض يعمل دون واجهة أيضاً
+    sys.path.append(os.path.dirname(__file__))
+    from config import DEFAULT_PDF_FILE, PAGE_PACK_FILE
+    from page_server import main as serve_main
+    sys.exit(serve_main(sys.argv[2:], get_resource_path(DEFAULT_PDF_FILE),
+                        get_resource_path(PAGE_PACK_FILE)))
+
+from PyQt6.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+    QPushButton, QLabel, QScrollArea, QFrame, QListWidget, QListWidgetItem,
+    QSplitter, QToolBar, QStatusBar, QLineEdit, QComboBox, QSpinBox,
+    QFileDialog, QMessageBox, QGraphicsView, QGraphicsScene, QGraphicsPixmapItem,
+    QGraphicsRectItem, QGraphicsSimpleTextItem,
+    QSizePolicy, QMenu, QSystemTrayIcon, QDialog, QListView
+)
+from PyQt6.QtCore import (
+    Qt, QSize, QSizeF, pyqtSignal, QThread, QTimer, QPoint, QPointF, QEvent, QRectF, QAbstractListModel, QModelIndex
+)
+from PyQt6.QtGui import (
+    QPixmap, QImage, QIcon, QFont, QKeySequence, QShortcut, QAction,
+    QPalette, QColor, QLinearGradient, QBrush, QFontDatabase, QCursor, QPainter, QKeyEvent, QPen,
+    QActionGroup
+)
+
+# إضافة مسار src للاستيراد
+sys.path.append(os.path.dirname(__file__))
+from config import (
+    SURAHS, LIGHT_THEME, DARK_THEME, KEYBOARD_SHORTCUTS, APP_NAME, APP_VERSION, PAGE_COLOR_MODES,
+    RENDER_SCALE, PAGE_CACHE_BYTES, DISK_CACHE_BYTES,
+    MIN_RENDER_SCALE, MAX_RENDER_SCALE, ZOOM_SETTLE_MS,
+    MAX_TILE_SCALE, TILE_SIZE, TILE_MARGIN, NAV_SETTLE_MS, SETTINGS_SAVE_DELAY, PREFETCH_PAGES,
+    CONTINUOUS_GAP, CONTINUOUS_MARGIN_PAGES, PAGE_PACK_FILE,
+    HEARTBEAT_MS, STALL_THRESHOLD_MS, THUMB_WIDTH, THUMB_CACHE_BYTES, KIOSK_PRELOAD
+)
+from disk_cache import DiskCache, page_entry_name
+from editions import DocumentRegistry, default_specs
+from kiosk import SlideQueue
+from page_cache import PageCache
+from palette_index import PaletteIndex
+import tracing
+from raster import decode_raster
+from search_index import SearchIndex, index_path
+from settings_store import SettingsStore
+from stall_watchdog import StallWatchdog
+from thumb_atlas import ThumbnailAtlas, atlas_path
+from utils import get_cache_dir, pdf_fingerprint, quantize_scale
+
+# fitz و NumPy وعمال الرسم تُستورد عند الحاجة بعد ظهور النافذة لتسريع بدء التشغيل
+
+logger = logging.getLogger(__name__)
+
 class ArabicLineEdit(QLineEdit):
     """حقل إدخال ذكي يقوم بتحويل الحروف الإنجليزية إلى عربية تلقائياً عند الحاجة"""
     
@@ -83,6 +130,14 @@ class ArabicLineEdit(QLineEdit):
 
 class PDFPageView(QGraphicsView):
     """عارض صفحات PDF مخصص مع تحسين التكبير"""
+    # يُطلق بعد توقف التكبير مع معامل الرسم المطابق للدقة الفعلية
+    zoom_settled = pyqtSignal(float)
+    # يُطلق عند الحاجة إلى بلاطات جديدة: (معامل الرسم، [((العمود، الصف)، الأولوية)])
+    tiles_needed = pyqtSignal(float, list)
+    # التمرير المتصل: (معامل الرسم، [(فهرس الصفحة، الأولوية)]) للصفحات التي تحتاج صوراً
+    pages_needed = pyqtSignal(float, list)
+    # التمرير المتصل: الصفحة الظاهرة في أعلى العرض
+    current_page_changed = pyqtSignal(int)
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -103,22 +158,421 @@ class PDFPageView(QGraphicsView):
         self.pixmap_item = None
         self._zoom_factor = 1.0
         self.current_pixmap = None
+        self.current_scale = RENDER_SCALE
+        self.page_rect = None
+        # مستطيلات إبراز نتائج البحث بإحداثيات المشهد
+        self.highlights = []
+        self.highlight_items = []
+        self.highlight_page = None
+        # العرض المزدوج: فهرس الصفحة -> [موضعها في المشهد، صورتها، عناصر الصفحة الفارغة]
+        self.spread_slots = {}
+        # التمرير المتصل: أعلى كل صفحة وحجمها بإحداثيات المشهد، وعناصر الصور
+        # للصفحات القريبة فقط، وعناصر محررة يُعاد استخدامها بدلاً من إنشاء جديدة
+        self.page_tops = []
+        self.page_sizes = []
+        self.page_items = {}
+        self.continuous_window = range(0)
+        self.continuous_page = -1
+        self.continuous_scale = RENDER_SCALE
+        self._requested_scales = {}
+        self._item_pool = []
+        # ملاءمة التكبير للصفحة عند تغير حجم العرض (وضع العرض التلقائي)
+        self.fit_to_view = False
         
-    def set_page(self, pixmap: QPixmap):
-        """عرض صفحة جديدة"""
-        self.current_pixmap = pixmap
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(ZOOM_SETTLE_MS)
+        self._settle_timer.timeout.connect(self._on_zoom_settled)
+        
+        # البلاطات المعروضة فوق الصفحة عند التكبير العميق
+        self.tile_items = {}
+        self.tile_scale = None
+        self._tile_timer = QTimer(self)
+        self._tile_timer.setSingleShot(True)
+        self._tile_timer.setInterval(30)
+        self._tile_timer.timeout.connect(self.update_tiles)
+        self.horizontalScrollBar().valueChanged.connect(self._tile_timer.start)
+        self.verticalScrollBar().valueChanged.connect(self._tile_timer.start)
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        
+    def reset_scene(self):
+        """إفراغ العارض (عند تغيير المستند المعروض)"""
+        self._clear_scene()
+        
+    def _clear_scene(self):
+        """حذف كل عناصر المشهد وإعادة حالة أنماط العرض"""
+        # العناصر تُحذف مع المشهد
+        self.tile_items = {}
+        self.tile_scale = None
+        self.highlight_items = []
+        self.spread_slots = {}
+        self.page_tops = []
+        self.page_sizes = []
+        self.page_items = {}
+        self._item_pool = []
+        self._requested_scales = {}
+        self.continuous_window = range(0)
+        self.continuous_page = -1
         self.scene.clear()
+        self.pixmap_item = None
+        self.current_pixmap = None
+        
+    @tracing.traced("set_page")
+    def set_page(self, pixmap: QPixmap, scale: float = RENDER_SCALE, keep_position: bool = False):
+        """
+        عرض صفحة جديدة
+
+        إحداثيات المشهد ثابتة بمعامل الرسم الأساسي، والصورة المرسومة بمعامل
+        آخر تُصغّر أو تُكبّر لتشغل نفس المساحة
+        """
+        self.current_pixmap = pixmap
+        self.current_scale = scale
+        if keep_position and self.pixmap_item:
+            # استبدال الصورة بنسخة أوضح دون فقدان موضع التمرير
+            self.pixmap_item.setPixmap(pixmap)
+            self.pixmap_item.setScale(RENDER_SCALE / scale)
+            return
+        self._clear_scene()
+        self.current_pixmap = pixmap
         self.pixmap_item = QGraphicsPixmapItem(pixmap)
         self.pixmap_item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        self.pixmap_item.setScale(RENDER_SCALE / scale)
         self.scene.addItem(self.pixmap_item)
-        self.scene.setSceneRect(self.pixmap_item.boundingRect())
+        self.page_rect = self.pixmap_item.sceneBoundingRect()
+        self.scene.setSceneRect(self.page_rect)
+        self._draw_highlights()
+        self.update_view()
+
+    def set_spread(self, slots):
+        """
+        عرض صفحتين متقابلتين كعنصرين منفصلين في المشهد (دون دمجهما في صورة واحدة)
+
+        Args:
+            slots: [(فهرس الصفحة، حجمها بإحداثيات المشهد QSizeF، الصورة أو None، معامل الرسم)]
+                بترتيب القراءة، فالأولى تُوضع على اليمين
+        """
+        self._clear_scene()
+        x = 0.0
+        for page_idx, size, pixmap, scale in reversed(slots):
+            self.spread_slots[page_idx] = [QPointF(x, 0), None, []]
+            if pixmap is not None:
+                self.set_spread_page(page_idx, pixmap, scale)
+            else:
+                self._add_paper(QRectF(QPointF(x, 0), size), str(page_idx + 1),
+                                self.spread_slots[page_idx][2])
+            x += size.width()
+        self.scene.setSceneRect(self.scene.itemsBoundingRect())
+        self._draw_highlights()
+        self.update_view()
+
+    def set_spread_page(self, page_idx: int, pixmap: QPixmap, scale: float):
+        """وضع صورة صفحة من العرض المزدوج مكان صفحتها الفارغة أو نسختها الأقل دقة"""
+        slot = self.spread_slots.get(page_idx)
+        if slot is None:
+            return
+        origin, item, paper = slot
+        for placeholder in paper:
+            self.scene.removeItem(placeholder)
+        paper.clear()
+        if item is None:
+            item = QGraphicsPixmapItem(pixmap)
+            item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+            item.setPos(origin)
+            self.scene.addItem(item)
+            slot[1] = item
+        else:
+            item.setPixmap(pixmap)
+        item.setScale(RENDER_SCALE / scale)
+        self.current_scale = scale
+
+    def show_spread_placeholder(self, page_idx: int, label: str):
+        """تغيير عنوان الصفحة الفارغة في العرض المزدوج (إن لم تصل صورتها بعد)"""
+        slot = self.spread_slots.get(page_idx)
+        if slot is None or not slot[2]:
+            return
+        paper = slot[2]
+        rect = paper[0].rect()
+        for placeholder in paper:
+            self.scene.removeItem(placeholder)
+        paper.clear()
+        self._add_paper(rect, label, paper)
+
+    def spread_pages(self):
+        """الصفحات المعروضة في العرض المزدوج (فارغة في عرض الصفحة الواحدة)"""
+        return list(self.spread_slots)
+
+    def set_continuous(self, sizes, page_idx: int, scale: float):
+        """
+        عرض كل الصفحات متتالية في مشهد واحد طويل
+
+        المشهد لا يحتوي إلا على عناصر صور للصفحات القريبة من المنطقة الظاهرة،
+        والصفحات الأخرى تُرسم كخلفية فارغة عند ظهورها
+
+        Args:
+            sizes: أحجام كل الصفحات بإحداثيات المشهد (QSizeF)
+            page_idx: الصفحة المعروضة في الأعلى
+            scale: معامل الرسم المطلوب للصفحات
+        """
+        self._clear_scene()
+        self.page_sizes = list(sizes)
+        top = 0.0
+        for size in self.page_sizes:
+            self.page_tops.append(top)
+            top += size.height() + CONTINUOUS_GAP
+        width = max(size.width() for size in self.page_sizes)
+        self.continuous_scale = scale
+        self.scene.setSceneRect(QRectF(0, 0, width, top - CONTINUOUS_GAP))
         self.update_view()
+        self.scroll_to_page(page_idx)
+        self.update_visible_pages()
+        self._draw_highlights()
+
+    def is_continuous(self) -> bool:
+        return bool(self.page_tops)
+
+    def _page_origin(self, page_idx: int) -> QPointF:
+        """موضع صفحة في التمرير المتصل (الصفحات الأضيق تُوسّط)"""
+        width = self.scene.sceneRect().width()
+        return QPointF((width - self.page_sizes[page_idx].width()) / 2, self.page_tops[page_idx])
+
+    def scroll_to_page(self, page_idx: int):
+        """تمرير العرض المتصل حتى يصبح أعلى الصفحة في أعلى العرض"""
+        if not self.page_tops:
+            return
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        center = self.scene.sceneRect().center().x()
+        self.centerOn(QPointF(center, self.page_tops[page_idx] + visible.height() / 2))
+
+    def _on_scrolled(self):
+        if self.page_tops:
+            self.update_visible_pages()
+
+    def update_visible_pages(self):
+        """
+        تحديث عناصر الصفحات بعد التمرير: تحرير صور الصفحات البعيدة وطلب القريبة
+
+        عدد العناصر ثابت تقريباً مهما طال التمرير، فالذاكرة لا تنمو إلا في
+        ذاكرة الصفحات المحدودة
+        """
+        if not self.page_tops:
+            return
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        count = len(self.page_tops)
+        first = min(max(bisect.bisect_right(self.page_tops, visible.top()) - 1, 0), count - 1)
+        last = min(max(bisect.bisect_right(self.page_tops, visible.bottom()) - 1, 0), count - 1)
+        window = range(max(0, first - CONTINUOUS_MARGIN_PAGES),
+                       min(count, last + CONTINUOUS_MARGIN_PAGES + 1))
+        self.continuous_window = window
+        for page_idx in [idx for idx in self.page_items if idx not in window]:
+            item = self.page_items.pop(page_idx)
+            # تحرير الصورة فتبقى فقط في ذاكرة الصفحات المحدودة
+            item.setPixmap(QPixmap())
+            item.hide()
+            self._item_pool.append(item)
+        for page_idx in [idx for idx in self._requested_scales if idx not in window]:
+            del self._requested_scales[page_idx]
+        
+        current = min(max(bisect.bisect_right(self.page_tops, visible.top() + 1) - 1, 0), count - 1)
+        if current != self.continuous_page:
+            self.continuous_page = current
+            self.current_page_changed.emit(current)
+        
+        scale = self.continuous_scale
+        needed = [(page_idx, 0 if first <= page_idx <= last else 1) for page_idx in window
+                  if self._requested_scales.get(page_idx) != scale]
+        for page_idx, _ in needed:
+            self._requested_scales[page_idx] = scale
+        if needed:
+            self.pages_needed.emit(scale, needed)
+
+    def forget_page(self, page_idx: int):
+        """السماح بطلب صورة صفحة من جديد عند التمرير التالي (بعد تعذر رسمها)"""
+        self._requested_scales.pop(page_idx, None)
+
+    def refresh_pages(self, scale: float):
+        """طلب صور الصفحات القريبة من جديد (بعد تغير الدقة أو نمط الألوان)"""
+        self.continuous_scale = scale
+        self._requested_scales.clear()
+        self.update_visible_pages()
+
+    def set_continuous_page(self, page_idx: int, pixmap: QPixmap, scale: float):
+        """وضع صورة صفحة في التمرير المتصل إن كانت ما تزال قريبة من العرض"""
+        if page_idx not in self.continuous_window:
+            return
+        item = self.page_items.get(page_idx)
+        if item is None:
+            if self._item_pool:
+                item = self._item_pool.pop()
+                item.show()
+            else:
+                item = QGraphicsPixmapItem()
+                item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+                self.scene.addItem(item)
+            item.setPos(self._page_origin(page_idx))
+            self.page_items[page_idx] = item
+        item.setPixmap(pixmap)
+        item.setScale(RENDER_SCALE / scale)
+
+    def drawBackground(self, painter, rect):
+        """رسم الصفحات التي لم تصل صورها بعد في التمرير المتصل كصفحات فارغة"""
+        super().drawBackground(painter, rect)
+        if not self.page_tops:
+            return
+        count = len(self.page_tops)
+        first = max(bisect.bisect_right(self.page_tops, rect.top()) - 1, 0)
+        last = min(bisect.bisect_right(self.page_tops, rect.bottom()), count)
+        palette = self.palette()
+        painter.setFont(QFont("Amiri", 48))
+        for page_idx in range(first, last):
+            if page_idx in self.page_items:
+                continue
+            page = QRectF(self._page_origin(page_idx), self.page_sizes[page_idx])
+            painter.fillRect(page, palette.color(QPalette.ColorRole.Base))
+            painter.setPen(palette.color(QPalette.ColorRole.PlaceholderText))
+            painter.drawText(page, Qt.AlignmentFlag.AlignCenter, str(page_idx + 1))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.fit_to_view:
+            self.fit_page()
+        if self.page_tops:
+            self.update_visible_pages()
+
+    def fit_page(self):
+        """تكبير يجعل الصفحة (أو الصفحتين) كاملة داخل العرض"""
+        rect = self.sceneRect()
+        if rect.isEmpty():
+            return
+        viewport = self.viewport().size()
+        self.set_zoom(min(viewport.width() / rect.width(), viewport.height() / rect.height()))
+
+    def set_highlights(self, boxes, page_idx=None):
+        """إبراز مستطيلات (بإحداثيات صفحة الـ PDF) فوق الصفحة"""
+        self.highlight_page = page_idx
+        self.highlights = [
+            QRectF(x0 * RENDER_SCALE, y0 * RENDER_SCALE,
+                   (x1 - x0) * RENDER_SCALE, (y1 - y0) * RENDER_SCALE)
+            for x0, y0, x1, y1 in boxes
+        ]
+        self._draw_highlights()
+
+    def _draw_highlights(self):
+        for item in self.highlight_items:
+            self.scene.removeItem(item)
+        self.highlight_items = []
+        if self.pixmap_item:
+            offset = QPointF(0, 0)
+        elif self.highlight_page in self.spread_slots:
+            offset = self.spread_slots[self.highlight_page][0]
+        elif self.page_tops and self.highlight_page is not None:
+            offset = self._page_origin(self.highlight_page)
+        else:
+            return
+        for rect in self.highlights:
+            item = QGraphicsRectItem(rect.translated(offset))
+            item.setBrush(QColor(255, 200, 0, 90))
+            item.setPen(QPen(Qt.PenStyle.NoPen))
+            item.setZValue(2)
+            self.scene.addItem(item)
+            self.highlight_items.append(item)
+
+    def show_placeholder(self, label: str):
+        """عرض صفحة فارغة خفيفة بنفس الأبعاد أثناء التنقل السريع"""
+        if self.page_rect is None:
+            return
+        self._clear_scene()
+        self._add_paper(self.page_rect, label)
+
+    def _add_paper(self, rect: QRectF, label: str, items=None):
+        """رسم صفحة فارغة برقمها (العناصر المضافة تُلحق بالقائمة items إن وُجدت)"""
+        palette = self.palette()
+        paper = QGraphicsRectItem(rect)
+        paper.setBrush(palette.color(QPalette.ColorRole.Base))
+        paper.setPen(QPen(Qt.PenStyle.NoPen))
+        self.scene.addItem(paper)
+        text = QGraphicsSimpleTextItem(label)
+        text.setFont(QFont("Amiri", 48))
+        text.setBrush(palette.color(QPalette.ColorRole.PlaceholderText))
+        text.setPos(rect.center() - text.boundingRect().center())
+        self.scene.addItem(text)
+        if items is not None:
+            items.extend((paper, text))
         
     def update_view(self):
         """تحديث العرض بناءً على مستوى التكبير"""
-        if self.pixmap_item:
+        if self.pixmap_item or self.spread_slots or self.page_tops:
             self.resetTransform()
             self.scale(self._zoom_factor, self._zoom_factor)
+        self._settle_timer.start()
+
+    def effective_scale(self) -> float:
+        """عدد بكسلات الشاشة لكل نقطة من الصفحة"""
+        return self._zoom_factor * RENDER_SCALE * self.devicePixelRatioF()
+
+    def required_scale(self) -> float:
+        """معامل رسم الصفحة كاملة المطابق لمستوى التكبير الحالي ودقة الشاشة"""
+        return quantize_scale(self.effective_scale(), MIN_RENDER_SCALE, MAX_RENDER_SCALE)
+
+    def is_tiled(self) -> bool:
+        """هل يتجاوز التكبير حد رسم الصفحة كاملة (البلاطات لعرض الصفحة الواحدة فقط)"""
+        return (not self.spread_slots and not self.page_tops
+                and self.effective_scale() > MAX_RENDER_SCALE)
+
+    def _on_zoom_settled(self):
+        self.update_tiles()
+        self.zoom_settled.emit(self.required_scale())
+
+    def update_tiles(self):
+        """تحديد البلاطات الظاهرة (مع هامش) وطلب الناقص منها وإزالة البعيد"""
+        if not self.pixmap_item or not self.is_tiled():
+            self.clear_tiles()
+            return
+        scale = quantize_scale(self.effective_scale(), MAX_RENDER_SCALE, MAX_TILE_SCALE)
+        if scale != self.tile_scale:
+            self.clear_tiles()
+            self.tile_scale = scale
+        
+        page_rect = self.scene.sceneRect()
+        visible = self.mapToScene(self.viewport().rect()).boundingRect() & page_rect
+        # تحويل إحداثيات المشهد إلى بكسلات البلاطات
+        factor = scale / RENDER_SCALE
+        margin = TILE_SIZE * TILE_MARGIN / factor
+        around = visible.adjusted(-margin, -margin, margin, margin) & page_rect
+        wanted = {}
+        for rect, priority in ((visible, 0), (around, 1)):
+            x0, x1 = int(rect.left() * factor) // TILE_SIZE, int(rect.right() * factor) // TILE_SIZE
+            y0, y1 = int(rect.top() * factor) // TILE_SIZE, int(rect.bottom() * factor) // TILE_SIZE
+            for ty in range(y0, y1 + 1):
+                for tx in range(x0, x1 + 1):
+                    wanted.setdefault((tx, ty), priority)
+        
+        for tile in list(self.tile_items):
+            if tile not in wanted:
+                self.scene.removeItem(self.tile_items.pop(tile))
+        missing = [(tile, priority) for tile, priority in wanted.items() if tile not in self.tile_items]
+        if missing:
+            self.tiles_needed.emit(scale, missing)
+
+    def add_tile(self, tile, scale: float, pixmap: QPixmap):
+        """إضافة بلاطة مرسومة فوق الصفحة"""
+        if scale != self.tile_scale or tile in self.tile_items:
+            return
+        tx, ty = tile
+        step = TILE_SIZE * RENDER_SCALE / scale
+        item = QGraphicsPixmapItem(pixmap)
+        item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        item.setScale(RENDER_SCALE / scale)
+        item.setPos(tx * step, ty * step)
+        item.setZValue(1)
+        self.scene.addItem(item)
+        self.tile_items[tile] = item
+
+    def clear_tiles(self):
+        """إزالة جميع البلاطات"""
+        for item in self.tile_items.values():
+            self.scene.removeItem(item)
+        self.tile_items.clear()
+        self.tile_scale = None
 
     def wheelEvent(self, event):
         """التكبير/التصغير بعجلة الفأرة مع مفتاح Ctrl"""
@@ -146,6 +600,10 @@ class PDFPageView(QGraphicsView):
     def zoom_reset(self):
         self._zoom_factor = 1.0
         self.update_view()
+
+    def set_zoom(self, zoom: float):
+        self._zoom_factor = min(max(zoom, 0.1), 5.0)
+        self.update_view()
         
     def get_zoom(self) -> float:
         return self._zoom_factor
@@ -160,16 +618,28 @@ class SurahListWidget(QListWidget):
         self.setSpacing(2)
         self.setFrameShape(QFrame.Shape.NoFrame)
         self.itemClicked.connect(self.on_item_clicked)
-        self._setup_items()
+        # صفحة بداية كل سورة في الطبعة المعروضة
+        self.start_pages = [page for _, _, page in SURAHS]
+        # تعبئة القائمة بعد ظهور النافذة
+        QTimer.singleShot(0, self._setup_items)
         
     def _setup_items(self):
-        for num, name, page in SURAHS:
+        for (num, name, _), page in zip(SURAHS, self.start_pages):
             item = QListWidgetItem()
             item.setText(f"{name}  ({page})")
             item.setData(Qt.ItemDataRole.UserRole, (num, page))
             item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
             self.addItem(item)
             
+    def set_start_pages(self, pages):
+        """تحديث صفحات بدايات السور عند تغيير الطبعة"""
+        self.start_pages = list(pages)
+        for i, ((num, name, _), page) in enumerate(zip(SURAHS, self.start_pages)):
+            item = self.item(i)
+            if item is not None:
+                item.setText(f"{name}  ({page})")
+                item.setData(Qt.ItemDataRole.UserRole, (num, page))
+            
     def on_item_clicked(self, item: QListWidgetItem):
         surah_num, page_num = item.data(Qt.ItemDataRole.UserRole)
         self.surah_selected.emit(surah_num, page_num)
@@ -179,33 +649,350 @@ class SurahListWidget(QListWidget):
         for i in range(self.count()):
             item = self.item(i)
             surah_name = SURAHS[i][1].lower()
-            if text in surah_name or text in str(i+1):
-                item.setHidden(False)
-            else:
-                item.setHidden(True)
+            hidden = not (text in surah_name or text in str(i+1))
+            # تجنب إعادة تخطيط القائمة للعناصر التي لم تتغير حالتها
+            if item.isHidden() != hidden:
+                item.setHidden(hidden)
+
+class PaletteModel(QAbstractListModel):
+    """نموذج نتائج لوحة الانتقال (يُرسم الظاهر منها فقط)"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []
+        
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self.entries = entries
+        self.endResetModel()
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+        
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{entry.title}\n{entry.subtitle}" if entry.subtitle else entry.title
+        if role == Qt.ItemDataRole.UserRole:
+            return entry.page_idx
+        return None
+
+class CommandPalette(QDialog):
+    """لوحة الانتقال السريع إلى سورة أو جزء أو صفحة أو آية أو إشارة مرجعية"""
+    page_chosen = pyqtSignal(int)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index = None
+        self.setWindowTitle("انتقال سريع")
+        self.setMinimumSize(460, 420)
+        layout = QVBoxLayout(self)
+        
+        self.query_edit = QLineEdit()
+        self.query_edit.setFont(QFont("Amiri", 13))
+        self.query_edit.setPlaceholderText("سورة، جزء، صفحة، أو آية مثل 2:255")
+        self.query_edit.textChanged.connect(self.update_results)
+        self.query_edit.returnPressed.connect(self.accept_current)
+        self.query_edit.installEventFilter(self)
+        layout.addWidget(self.query_edit)
+        
+        self.model = PaletteModel(self)
+        self.results = QListView()
+        self.results.setModel(self.model)
+        self.results.setFont(QFont("Amiri", 12))
+        self.results.setUniformItemSizes(True)
+        self.results.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.results.clicked.connect(self.accept_current)
+        layout.addWidget(self.results)
+        
+    def open_with(self, index: PaletteIndex):
+        self.index = index
+        self.query_edit.clear()
+        self.update_results("")
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.query_edit.setFocus()
+        
+    def update_results(self, text):
+        if self.index is None:
+            return
+        self.model.set_entries(self.index.search(text))
+        if self.model.rowCount():
+            self.results.setCurrentIndex(self.model.index(0))
+            
+    def eventFilter(self, obj, event):
+        # الأسهم في حقل البحث تحرك التحديد في القائمة
+        if obj is self.query_edit and event.type() == QEvent.Type.KeyPress:
+            step = {Qt.Key.Key_Down: 1, Qt.Key.Key_Up: -1}.get(event.key())
+            if step and self.model.rowCount():
+                row = (self.results.currentIndex().row() + step) % self.model.rowCount()
+                self.results.setCurrentIndex(self.model.index(row))
+                return True
+        return super().eventFilter(obj, event)
+        
+    def accept_current(self, *_):
+        index = self.results.currentIndex()
+        if not index.isValid():
+            return
+        self.page_chosen.emit(index.data(Qt.ItemDataRole.UserRole))
+        self.accept()
+
+class ThumbnailModel(QAbstractListModel):
+    """
+    نموذج الصور المصغرة: الصورة تُطلب من العامل عند أول رسم لخليتها فقط،
+    أي للخلايا الظاهرة، وتُحفظ صورها المعروضة في ذاكرة محدودة
+    """
+    
+    def __init__(self, atlas: ThumbnailAtlas, request, parent=None):
+        super().__init__(parent)
+        self.atlas = atlas
+        self.request = request
+        self.variant = "light"
+        self.pixmaps = PageCache(THUMB_CACHE_BYTES)
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.atlas.page_count
+        
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        page_idx = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(page_idx + 1)
+        if role == Qt.ItemDataRole.UserRole:
+            return page_idx
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._pixmap(page_idx)
+        return None
+        
+    def _pixmap(self, page_idx):
+        key = (page_idx, self.variant)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            return pixmap
+        raster = self.atlas.get(page_idx)
+        if raster is None:
+            self.request(page_idx)
+            return None
+        if self.variant != "light":
+            from recolor import recolor
+            raster = recolor(raster, self.variant)
+        image = QImage(raster.samples, raster.width, raster.height, raster.stride,
+                       QImage.Format.Format_RGB888).copy()
+        pixmap = QPixmap.fromImage(image)
+        self.pixmaps.put(key, pixmap, image.sizeInBytes())
+        return pixmap
+        
+    def set_variant(self, variant):
+        if variant == self.variant:
+            return
+        self.variant = variant
+        self.pixmaps.clear()
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1),
+                                  [Qt.ItemDataRole.DecorationRole])
+            
+    def on_thumbnail_ready(self, page_idx):
+        index = self.index(page_idx)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+class ThumbnailDialog(QDialog):
+    """نظرة عامة على كل الصفحات بصور مصغرة، والنقر على صورة ينتقل إلى صفحتها"""
+    page_chosen = pyqtSignal(int)
+    
+    def __init__(self, model: ThumbnailModel, worker, atlas_file: Path, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.worker = worker
+        self.atlas_file = atlas_file
+        self.setWindowTitle("الصفحات")
+        self.resize(900, 680)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        atlas = model.atlas
+        self.grid = QListView()
+        self.grid.setViewMode(QListView.ViewMode.IconMode)
+        self.grid.setResizeMode(QListView.ResizeMode.Adjust)
+        self.grid.setMovement(QListView.Movement.Static)
+        self.grid.setUniformItemSizes(True)
+        self.grid.setIconSize(QSize(atlas.thumb_width, atlas.thumb_height))
+        self.grid.setGridSize(QSize(atlas.thumb_width + 16, atlas.thumb_height + 28))
+        self.grid.setModel(model)
+        self.grid.clicked.connect(lambda index: self.page_chosen.emit(index.row()))
+        layout.addWidget(self.grid)
+        
+        # عند التمرير السريع تُلغى طلبات الخلايا التي خرجت من العرض
+        self._scroll_timer = QTimer(self)
+        self._scroll_timer.setSingleShot(True)
+        self._scroll_timer.setInterval(100)
+        self._scroll_timer.timeout.connect(self._drop_hidden_requests)
+        self.grid.verticalScrollBar().valueChanged.connect(self._scroll_timer.start)
+        
+    def visible_rows(self) -> range:
+        """الصفوف الظاهرة حالياً في الشبكة"""
+        viewport = self.grid.viewport().rect()
+        grid = self.grid.gridSize()
+        # الخلايا بحجم ثابت فيكفي فحص نقطة داخل كل خلية على حافتي العرض
+        rows = [self.grid.indexAt(QPoint(x, y)).row()
+                for x in range(grid.width() // 2, viewport.width(), grid.width())
+                for y in (min(grid.height() // 2, viewport.bottom()), max(0, viewport.bottom() - grid.height() // 2))]
+        rows = [row for row in rows if row >= 0]
+        if not rows:
+            return range(0)
+        per_line = max(1, viewport.width() // grid.width())
+        # سطر إضافي من كل جهة للخلايا المقطوعة عند الحافتين
+        return range(max(0, min(rows) - per_line), min(self.model.rowCount(), max(rows) + per_line + 1))
+        
+    def _drop_hidden_requests(self):
+        self.worker.retain(self.visible_rows())
+        
+    def show_page(self, page_idx):
+        """فتح النافذة مع تحديد الصفحة الحالية"""
+        index = self.model.index(page_idx)
+        self.grid.setCurrentIndex(index)
+        self.show()
+        self.grid.scrollTo(index, QListView.ScrollHint.PositionAtCenter)
+        self.raise_()
+        self.activateWindow()
+        
+    def hideEvent(self, event):
+        self.save_atlas()
+        super().hideEvent(event)
+        
+    def save_atlas(self):
+        """حفظ الصور المصغرة الجديدة ليُقرأ الأطلس كاملاً في المرة القادمة"""
+        atlas = self.model.atlas
+        if atlas.dirty:
+            try:
+                atlas.save(self.atlas_file)
+            except OSError as e:
+                logger.warning("تعذر حفظ أطلس الصور المصغرة: %s", e)
+
+class IndexLoader(QThread):
+    """تحميل فهرس البحث في النص من التخزين أو بنائه في الخلفية على عدة عمليات"""
+    ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    progress = pyqtSignal(int, int)
+    
+    def __init__(self, pdf_path, page_count, parent=None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+        self.page_count = page_count
+        
+    def run(self):
+        try:
+            fingerprint = pdf_fingerprint(self.pdf_path)
+            index = SearchIndex.load(index_path(fingerprint), fingerprint)
+            if index is None:
+                from index_builder import build_index_parallel
+                index = build_index_parallel(
+                    self.pdf_path, fingerprint, self.page_count,
+                    progress=self.progress.emit,
+                    should_stop=self.isInterruptionRequested,
+                )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if index is not None:
+            self.ready.emit(index)
+        elif not self.isInterruptionRequested():
+            self.failed.emit("تعذر بناء فهرس البحث")
+
+def _edition_attr(name):
+    """خاصية في النافذة تقرأ من الطبعة المعروضة وتكتب فيها"""
+    return property(lambda self: getattr(self.edition, name),
+                    lambda self, value: setattr(self.edition, name, value))
+
 
 class MushafViewer(QMainWindow):
+    # المستند وجداوله وعماله تخص الطبعة المعروضة، وتبقى معها عند التبديل
+    pdf_path = _edition_attr("pdf_path")
+    pdf_document = _edition_attr("document")
+    page_meta = _edition_attr("meta")
+    page_cache = _edition_attr("page_cache")
+    page_pack = _edition_attr("page_pack")
+    render_pool = _edition_attr("render_pool")
+    index_loader = _edition_attr("index_loader")
+    search_index = _edition_attr("search_index")
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle(f"{APP_NAME} v{APP_VERSION}")
         self.setMinimumSize(1100, 750)
         
-        self.pdf_document = None
+        self.disk_cache = DiskCache(get_cache_dir() / "pages", DISK_CACHE_BYTES)
+        # زمن ظهور أول صفحة منذ بدء التشغيل (بالمللي ثانية)
+        self.first_paint_ms = None
+        # ذاكرة واحدة لصفحات كل الطبعات، لكل طبعة مفاتيحها
+        self.shared_cache = PageCache(PAGE_CACHE_BYTES)
+        self.palette_index = None
+        self.command_palette = None
+        self.bookmarks = []
+        self.thumbnail_worker = None
+        self.thumbnail_dialog = None
+        self._search_query = ""
+        self._search_hits = []
+        self._search_pos = -1
+        self._highlight_page = None
+        # (الصفحة، نمط الألوان) المعروضة حالياً بأي دقة
+        self._shown_page = None
         self.current_page_idx = 0
         self.is_dark_mode = False
-        
-        # استخدام الوظيفة الجديدة للحصول على مسار ملف الـ PDF بشكل صحيح
-        self.pdf_path = get_resource_path("MushafMadinaHafsGreen1441HQ.pdf")
+        self.page_color = "auto"
+        self.spread_mode = False
+        self.continuous_mode = False
+        self._continuous_variant = None
+        # وضع العرض التلقائي: الشرائح القادمة جاهزة في طابور محدود، والانتقال
+        # بمؤقت لمرة واحدة يُعاد تشغيله بعد كل انتقال فلا شيء يعمل بين الصفحات
+        self.kiosk_mode = False
+        self.kiosk_interval = 60
+        self.kiosk_queue = SlideQueue(KIOSK_PRELOAD)
+        self._kiosk_waiting = False
+        self._kiosk_restore = None
+        self._kiosk_on_start = False
+        self._kiosk_timer = QTimer(self)
+        self._kiosk_timer.setSingleShot(True)
+        self._kiosk_timer.timeout.connect(self.kiosk_advance)
         
         self.config_dir = Path.home() / ".config" / "quran-unix"
         self.config_file = self.config_dir / "config.json"
         self.config_dir.mkdir(parents=True, exist_ok=True)
+        self.settings = SettingsStore(self.config_file, delay=SETTINGS_SAVE_DELAY)
+        
+        # الطبعات المتاحة (من الإعدادات العامة وإعدادات المستخدم) والطبعة المعروضة
+        settings = self.settings.load()
+        self.registry = DocumentRegistry(default_specs(settings.get("editions", [])),
+                                         self.shared_cache, get_resource_path)
+        self.edition = self.registry.edition(settings.get("edition"))
+        self.page_pack = self._open_page_pack()
+        
+        # الجلب المسبق وحفظ الإعدادات يُؤجلان حتى يتوقف التنقل السريع
+        self._nav_timer = QTimer(self)
+        self._nav_timer.setSingleShot(True)
+        self._nav_timer.setInterval(NAV_SETTLE_MS)
+        self._nav_timer.timeout.connect(self._on_navigation_settled)
+        
+        # نبضة حلقة الأحداث لمراقبة توقف الواجهة (تبدأ مع حلقة الأحداث)
+        self.watchdog = StallWatchdog(STALL_THRESHOLD_MS, HEARTBEAT_MS, self._watchdog_context)
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setTimerType(Qt.TimerType.PreciseTimer)
+        self._heartbeat.setInterval(HEARTBEAT_MS)
+        self._heartbeat.timeout.connect(self.watchdog.beat)
+        QTimer.singleShot(0, self._start_watchdog)
         
         self._setup_ui()
         self._setup_shortcuts()
         self.load_settings()
         self._apply_theme()
-        self.load_pdf()
+        # فتح الملف وتشغيل العمال بعد ظهور النافذة، وحتى ذلك تُعرض آخر صفحة من التخزين الدائم
+        self._paint_cached_page()
+        QTimer.singleShot(0, self.load_pdf)
+        if self._kiosk_on_start:
+            QTimer.singleShot(0, lambda: self.set_kiosk_mode(True))
         
     def _setup_ui(self):
         central_widget = QWidget()
@@ -218,7 +1005,7 @@ class MushafViewer(QMainWindow):
         main_layout.addWidget(self.splitter)
         
         # Sidebar
-        sidebar = QFrame()
+        sidebar = self.sidebar = QFrame()
         sidebar.setObjectName("sidebar")
         sidebar.setFixedWidth(300)
         sidebar_layout = QVBoxLayout(sidebar)
@@ -233,11 +1020,13 @@ class MushafViewer(QMainWindow):
         self.search_box = ArabicLineEdit()
         self.search_box.setFont(QFont("Amiri", 12))
         self.search_box.textChanged.connect(self.on_search_changed)
+        self.search_box.returnPressed.connect(self.on_text_search)
+        self.search_box.setToolTip("اضغط Enter للبحث في نص المصحف")
         self.search_box.setFixedHeight(40)
         sidebar_layout.addWidget(self.search_box)
         
         self.surah_list = SurahListWidget()
-        self.surah_list.surah_selected.connect(self.go_to_page)
+        self.surah_list.surah_selected.connect(self.go_to_surah)
         sidebar_layout.addWidget(self.surah_list)
         
         self.page_info = QLabel("الصفحة: -")
@@ -285,6 +1074,67 @@ class MushafViewer(QMainWindow):
         self.btn_theme.setFixedWidth(40)
         self.btn_theme.clicked.connect(self.toggle_theme)
         
+        self.btn_page_color = QPushButton("🎨")
+        self.btn_page_color.setFixedWidth(40)
+        self.btn_page_color.setToolTip("ألوان الصفحة")
+        page_color_menu = QMenu(self.btn_page_color)
+        self.page_color_actions = QActionGroup(self)
+        for mode, title in PAGE_COLOR_MODES.items():
+            action = page_color_menu.addAction(title)
+            action.setCheckable(True)
+            action.setData(mode)
+            self.page_color_actions.addAction(action)
+        self.page_color_actions.triggered.connect(lambda action: self.set_page_color(action.data()))
+        self.btn_page_color.setMenu(page_color_menu)
+        
+        self.btn_print = QPushButton("🖨")
+        self.btn_print.setFixedWidth(40)
+        self.btn_print.setToolTip("طباعة أو حفظ كملف PDF")
+        print_menu = QMenu(self.btn_print)
+        for kind, title in (("page", "الصفحة الحالية"), ("surah", "السورة الحالية"), ("juz", "الجزء الحالي")):
+            print_menu.addAction(f"طباعة {title}", lambda kind=kind: self.print_selection(kind))
+        print_menu.addSeparator()
+        for kind, title in (("page", "الصفحة الحالية"), ("surah", "السورة الحالية"), ("juz", "الجزء الحالي")):
+            print_menu.addAction(f"حفظ {title} كملف PDF...",
+                                 lambda kind=kind: self.print_selection(kind, to_file=True))
+        self.btn_print.setMenu(print_menu)
+        
+        self.btn_thumbnails = QPushButton("🗂")
+        self.btn_thumbnails.setFixedWidth(40)
+        self.btn_thumbnails.setToolTip("كل الصفحات")
+        self.btn_thumbnails.clicked.connect(self.show_thumbnails)
+        
+        self.btn_spread = QPushButton("📖")
+        self.btn_spread.setFixedWidth(40)
+        self.btn_spread.setCheckable(True)
+        self.btn_spread.setToolTip("عرض صفحتين")
+        self.btn_spread.toggled.connect(self.set_spread_mode)
+        
+        self.btn_continuous = QPushButton("📜")
+        self.btn_continuous.setFixedWidth(40)
+        self.btn_continuous.setCheckable(True)
+        self.btn_continuous.setToolTip("تمرير متصل")
+        self.btn_continuous.toggled.connect(self.set_continuous_mode)
+        
+        self.btn_kiosk = QPushButton("📺")
+        self.btn_kiosk.setFixedWidth(40)
+        self.btn_kiosk.setToolTip(f"العرض التلقائي ({KEYBOARD_SHORTCUTS['kiosk']}، والخروج بـ Esc)")
+        self.btn_kiosk.clicked.connect(lambda: self.set_kiosk_mode(True))
+        
+        self.btn_edition = QPushButton("📚")
+        self.btn_edition.setFixedWidth(40)
+        self.btn_edition.setToolTip("طبعة المصحف")
+        edition_menu = QMenu(self.btn_edition)
+        self.edition_actions = QActionGroup(self)
+        for spec in self.registry.specs.values():
+            action = edition_menu.addAction(spec.title)
+            action.setCheckable(True)
+            action.setChecked(spec.edition_id == self.edition.edition_id)
+            action.setData(spec.edition_id)
+            self.edition_actions.addAction(action)
+        self.edition_actions.triggered.connect(lambda action: self.switch_edition(action.data()))
+        self.btn_edition.setMenu(edition_menu)
+        
         # Spacer
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
@@ -299,10 +1149,22 @@ class MushafViewer(QMainWindow):
         self.toolbar.addWidget(self.btn_zoom_in)
         self.toolbar.addSeparator()
         self.toolbar.addWidget(self.btn_theme)
+        self.toolbar.addWidget(self.btn_page_color)
+        self.toolbar.addWidget(self.btn_print)
+        self.toolbar.addWidget(self.btn_thumbnails)
+        self.toolbar.addWidget(self.btn_spread)
+        self.toolbar.addWidget(self.btn_continuous)
+        self.toolbar.addWidget(self.btn_kiosk)
+        if len(self.registry.specs) > 1:
+            self.toolbar.addWidget(self.btn_edition)
         
         viewer_layout.addWidget(self.toolbar)
         
         self.pdf_view = PDFPageView()
+        self.pdf_view.zoom_settled.connect(self.on_zoom_settled)
+        self.pdf_view.tiles_needed.connect(self.on_tiles_needed)
+        self.pdf_view.pages_needed.connect(self.on_pages_needed)
+        self.pdf_view.current_page_changed.connect(self.on_continuous_page_changed)
         viewer_layout.addWidget(self.pdf_view)
         
         self.splitter.addWidget(viewer_container)
@@ -314,53 +1176,569 @@ class MushafViewer(QMainWindow):
         QShortcut(QKeySequence("Ctrl++"), self, self.zoom_in)
         QShortcut(QKeySequence("Ctrl+-"), self, self.zoom_out)
         QShortcut(QKeySequence("Ctrl+0"), self, self.pdf_view.zoom_reset)
+        QShortcut(QKeySequence(KEYBOARD_SHORTCUTS["search"]), self, self.show_command_palette)
+        QShortcut(QKeySequence(KEYBOARD_SHORTCUTS["bookmark"]), self, self.toggle_bookmark)
+        QShortcut(QKeySequence(KEYBOARD_SHORTCUTS["print"]), self, self.btn_print.showMenu)
+        QShortcut(QKeySequence(KEYBOARD_SHORTCUTS["thumbnails"]), self, self.show_thumbnails)
+        QShortcut(QKeySequence(KEYBOARD_SHORTCUTS["spread"]), self, self.btn_spread.toggle)
+        QShortcut(QKeySequence(KEYBOARD_SHORTCUTS["continuous"]), self, self.btn_continuous.toggle)
+        QShortcut(QKeySequence(KEYBOARD_SHORTCUTS["fullscreen"]), self, self.toggle_fullscreen)
+        QShortcut(QKeySequence(KEYBOARD_SHORTCUTS["kiosk"]), self,
+                  lambda: self.set_kiosk_mode(not self.kiosk_mode))
+        # مفاتيح أجهزة التحكم عن بعد (تعمل في وضع العرض التلقائي فقط حتى لا تمنع
+        # التمرير بها في العارض، وRight و Left مربوطة أعلاه)
+        self._kiosk_shortcuts = []
+        remote_keys = ((KEYBOARD_SHORTCUTS["next_page"] + ["Space"], self.next_page),
+                       (KEYBOARD_SHORTCUTS["prev_page"], self.prev_page),
+                       (["Escape"], lambda: self.set_kiosk_mode(False)))
+        for keys, slot in remote_keys:
+            for key in keys:
+                if key not in ("Right", "Left"):
+                    shortcut = QShortcut(QKeySequence(key), self, slot)
+                    shortcut.setEnabled(False)
+                    self._kiosk_shortcuts.append(shortcut)
 
+    @tracing.traced("load_pdf")
     def load_pdf(self):
+        """
+        فتح ملف الطبعة المعروضة وتشغيل عمالها
+
+        الطبعة المفتوحة سابقاً تعود بمستندها وعمالها وفهرسها كما تركت
+        """
         if not os.path.exists(self.pdf_path):
             QMessageBox.critical(self, "خطأ", f"لم يتم العثور على ملف الـ PDF في المسار:\n{self.pdf_path}")
             return
         
         try:
-            self.pdf_document = fitz.open(self.pdf_path)
-            self.page_spin.setRange(1, len(self.pdf_document))
+            from render_worker import RenderPool
+            edition = self.registry.open(self.edition)
+            page_count = len(self.pdf_document)
+            self.page_spin.setRange(1, page_count)
+            self.surah_list.set_start_pages(page for _, _, page in self.page_meta.surahs)
+            self.palette_index = None
+            if len(self.registry.specs) > 1:
+                self.setWindowTitle(f"{APP_NAME} v{APP_VERSION} - {edition.spec.title}")
+            if self.page_pack is not None and self.page_pack.page_count != page_count:
+                self.page_pack.close()
+                self.page_pack = None
+            if self.render_pool is None:
+                self.render_pool = RenderPool(self.pdf_path, disk_cache=self.disk_cache,
+                                              pack=self.page_pack, parent=self)
+                self.render_pool.page_rendered.connect(
+                    lambda key, image: self.on_page_rendered(key, image, edition)
+                )
+                self.render_pool.render_failed.connect(
+                    lambda key, error: self.on_render_failed(key, error, edition)
+                )
             self.render_page()
+            if self.search_index is None and self.index_loader is None:
+                self.index_loader = IndexLoader(self.pdf_path, page_count, self)
+                self.index_loader.ready.connect(lambda index: self.on_index_ready(index, edition))
+                self.index_loader.progress.connect(self.on_index_progress)
+                self.index_loader.failed.connect(
+                    lambda error: self.statusBar().showMessage(f"تعذر تجهيز فهرس البحث: {error}", 5000)
+                )
+                self.index_loader.start()
         except Exception as e:
             QMessageBox.critical(self, "خطأ", f"فشل تحميل ملف الـ PDF:\n{str(e)}")
 
+    def switch_edition(self, edition_id):
+        """
+        عرض طبعة أخرى من المصحف عند نفس الموضع
+
+        الموضع يُنقل بالسورة والآية لأن أرقام الصفحات تختلف بين الطبعات، وصفحات
+        الطبعة السابقة تبقى في الذاكرة المشتركة حتى يحتاج غيرها إلى مكانها
+        """
+        target = self.registry.edition(edition_id)
+        if target is self.edition:
+            return
+        if not os.path.exists(target.pdf_path):
+            QMessageBox.critical(self, "خطأ", f"لم يتم العثور على ملف الـ PDF في المسار:\n{target.pdf_path}")
+            self._check_edition_action()
+            return
+        try:
+            self.registry.open(target)
+        except Exception as e:
+            QMessageBox.critical(self, "خطأ", f"فشل تحميل ملف الـ PDF:\n{str(e)}")
+            self._check_edition_action()
+            return
+        if self.render_pool is not None:
+            # طلبات الطبعة السابقة المنتظرة لم تعد مطلوبة
+            self.render_pool.cancel(lambda pending: True)
+        page_idx = self.current_page_idx
+        if self.pdf_document is not None:
+            page_idx = self.registry.translate_page(self.edition, page_idx, target)
+        if self.thumbnail_dialog is not None:
+            # الصور المصغرة تخص ملف الطبعة السابقة
+            self.thumbnail_worker.stop()
+            self.thumbnail_dialog.save_atlas()
+            self.thumbnail_dialog.close()
+            self.thumbnail_dialog = None
+            self.thumbnail_worker = None
+        self.edition = target
+        self.current_page_idx = page_idx
+        self._search_query = ""
+        self._search_hits = []
+        self._search_pos = -1
+        self._highlight_page = None
+        self._shown_page = None
+        self.pdf_view.set_highlights([])
+        self.pdf_view.reset_scene()
+        self._check_edition_action()
+        self.load_pdf()
+        self.save_settings()
+
+    def _check_edition_action(self):
+        for action in self.edition_actions.actions():
+            action.setChecked(action.data() == self.edition.edition_id)
+
+    def _open_page_pack(self):
+        """فتح حزمة الصفحات المرسومة مسبقاً إن وُجدت وطابقت ملف الـ PDF"""
+        if not os.path.exists(self.pdf_path):
+            return None
+        from page_pack import open_pack
+        pack = open_pack(get_resource_path(PAGE_PACK_FILE), source_size=os.path.getsize(self.pdf_path))
+        if pack is not None:
+            logger.info("حزمة الصفحات: %s (المعاملات %s)", pack.path, pack.scales)
+        return pack
+
+    def _paint_cached_page(self):
+        """
+        عرض آخر صفحة مقروءة من حزمة الصفحات أو التخزين الدائم قبل فتح ملف الـ PDF
+
+        الصورة تُضاف إلى ذاكرة الصفحات فلا يُعاد رسمها بعد فتح الملف
+        """
+        if not os.path.exists(self.pdf_path):
+            return
+        key = self._page_key(self.current_page_idx)
+        scales = dict.fromkeys((key[1], RENDER_SCALE))
+        raster = None
+        if self.page_pack is not None:
+            for scale in scales:
+                raster = self.page_pack.get(self.current_page_idx, scale)
+                if raster is not None:
+                    break
+        if raster is None:
+            fingerprint = pdf_fingerprint(self.pdf_path)
+            for scale in scales:
+                data = self.disk_cache.get(page_entry_name(fingerprint, self.current_page_idx, scale))
+                if data is not None:
+                    break
+            else:
+                return
+        try:
+            if raster is None:
+                raster = decode_raster(data)
+            if key[2] != "light":
+                from recolor import recolor
+                raster = recolor(raster, key[2])
+        except ValueError:
+            return
+        fmt = QImage.Format.Format_RGBA8888 if raster.alpha else QImage.Format.Format_RGB888
+        image = QImage(raster.samples, raster.width, raster.height, raster.stride, fmt).copy()
+        with tracing.span("QPixmap.fromImage"):
+            pixmap = QPixmap.fromImage(image)
+        key = (key[0], scale, key[2])
+        self.page_cache.put(key, pixmap, image.sizeInBytes())
+        self.pdf_view.set_page(pixmap, scale)
+        self._shown_page = (key[0], key[2])
+        self._mark_first_paint()
+
+    def _start_watchdog(self):
+        self._heartbeat.start()
+        self.watchdog.start()
+
+    def _watchdog_context(self):
+        """حالة القارئ المسجلة مع كل توقف (تُقرأ من خيط المراقبة فلا تستدعي Qt)"""
+        return {
+            "page": self.current_page_idx + 1,
+            "zoom": round(self.pdf_view.get_zoom(), 3),
+            "theme": "dark" if self.is_dark_mode else "light",
+            "page_color": self.page_color,
+            "edition": self.edition.edition_id,
+        }
+
+    def _mark_first_paint(self):
+        if self.first_paint_ms is None:
+            self.first_paint_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+            logger.info("أول صفحة ظهرت بعد %.0f مللي ثانية", self.first_paint_ms)
+            tracing.instant("first_paint", ms=round(self.first_paint_ms, 1))
+
+    def _page_key(self, page_idx, scale=None):
+        if scale is None:
+            scale = self.pdf_view.required_scale()
+        return (page_idx, scale, self._page_variant())
+
+    def _page_variant(self):
+        """نمط ألوان الصفحة المطلوب من عمال الرسم"""
+        if self.page_color == "auto":
+            return "dark" if self.is_dark_mode else "light"
+        if self.page_color == "theme":
+            from recolor import duotone_variant
+            theme = DARK_THEME if self.is_dark_mode else LIGHT_THEME
+            return duotone_variant(theme["page_paper"], theme["page_ink"])
+        return self.page_color
+
+    def set_page_color(self, mode):
+        """تغيير نمط ألوان الصفحة (الأنماط المرسومة سابقاً تبقى في الذاكرة)"""
+        self.page_color = mode if mode in PAGE_COLOR_MODES else "auto"
+        for action in self.page_color_actions.actions():
+            action.setChecked(action.data() == self.page_color)
+        self._sync_thumbnail_variant()
+        self.render_page()
+
+    @tracing.traced("render_page")
     def render_page(self):
+        """
+        عرض الصفحة الحالية من الذاكرة أو طلب رسمها
+
+        التنقل السريع يُدمج: الطلبات المنتظرة لصفحات سابقة تُلغى فوراً، والجلب
+        المسبق وحفظ الإعدادات يُنفذان مرة واحدة بعد توقف التنقل
+        """
         if not self.pdf_document: return
+        if self.spread_mode:
+            self._render_spread()
+            return
+        if self.continuous_mode:
+            self._render_continuous()
+            return
         
-        page = self.pdf_document[self.current_page_idx]
-        zoom = 2.0 
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat)
+        key = self._page_key(self.current_page_idx)
+        self.render_pool.cancel(lambda pending: pending[0] != key[0])
+        if self._highlight_page != self.current_page_idx:
+            self.pdf_view.set_highlights([])
+            self._highlight_page = None
+        pixmap = self.page_cache.get(key)
+        scale = key[1]
+        if pixmap is None:
+            self.render_pool.request(key)
+            if scale != RENDER_SCALE:
+                # عرض النسخة الأساسية مؤقتاً إن وجدت ريثما تُرسم النسخة المطابقة
+                pixmap = self.page_cache.get(self._page_key(self.current_page_idx, RENDER_SCALE))
+                scale = RENDER_SCALE
+        if pixmap is not None:
+            self.pdf_view.set_page(pixmap, scale)
+            self._shown_page = (self.current_page_idx, key[2])
+        else:
+            self.pdf_view.show_placeholder(str(self.current_page_idx + 1))
+            self._shown_page = None
         
-        fmt = QImage.Format.Format_RGBA8888 if pix.alpha else QImage.Format.Format_RGB888
-        qimg = QImage(pix.samples, pix.width, pix.height, pix.stride, fmt)
+        self._update_page_status()
+        self._nav_timer.start()
+
+    def _render_spread(self):
+        """
+        عرض الصفحتين المتقابلتين للصفحة الحالية
+
+        الصفحتان تُطلبان بنفس الأولوية فيرسمهما عاملان في الوقت نفسه، وتُعرض
+        كل منهما فور وصولها
+        """
+        pages = self.page_meta.spread(self.current_page_idx)
+        self.render_pool.cancel(lambda pending: pending[0] not in pages)
+        if self._highlight_page not in pages:
+            self.pdf_view.set_highlights([])
+            self._highlight_page = None
+        slots = []
+        for page_idx in pages:
+            key = self._page_key(page_idx)
+            pixmap = self.page_cache.get(key)
+            scale = key[1]
+            if pixmap is None:
+                self.render_pool.request(key)
+                if scale != RENDER_SCALE:
+                    pixmap = self.page_cache.get(self._page_key(page_idx, RENDER_SCALE))
+                    scale = RENDER_SCALE
+            rect = self.pdf_document[page_idx].rect
+            size = QSizeF(rect.width * RENDER_SCALE, rect.height * RENDER_SCALE)
+            slots.append((page_idx, size, pixmap, scale))
+        self.pdf_view.set_spread(slots)
+        self._shown_page = None
         
-        if self.is_dark_mode:
-            qimg.invertPixels()
-            
-        self.pdf_view.set_page(QPixmap.fromImage(qimg))
-        self.page_info.setText(f"الصفحة: {self.current_page_idx + 1} / {len(self.pdf_document)}")
+        self._update_page_status()
+        self._nav_timer.start()
+
+    def _render_continuous(self):
+        """
+        التمرير المتصل: بناء المشهد الطويل مرة واحدة ثم التمرير إلى الصفحة الحالية
+
+        العارض يطلب صور الصفحات القريبة عند التمرير (on_pages_needed)
+        """
+        if self._highlight_page != self.current_page_idx:
+            self.pdf_view.set_highlights([])
+            self._highlight_page = None
+        scale = self.pdf_view.required_scale()
+        variant = self._page_variant()
+        if not self.pdf_view.is_continuous():
+            self._continuous_variant = variant
+            # أبعاد الصفحات تُقرأ دون تحميلها
+            sizes = []
+            for page_idx in range(len(self.pdf_document)):
+                rect = self.pdf_document.page_cropbox(page_idx)
+                sizes.append(QSizeF(rect.width * RENDER_SCALE, rect.height * RENDER_SCALE))
+            self.pdf_view.set_continuous(sizes, self.current_page_idx, scale)
+        else:
+            if self.pdf_view.continuous_page != self.current_page_idx:
+                self.pdf_view.scroll_to_page(self.current_page_idx)
+            if variant != self._continuous_variant:
+                self._continuous_variant = variant
+                self.pdf_view.refresh_pages(scale)
+        self._shown_page = None
+        
+        self._update_page_status()
+        self._nav_timer.start()
+
+    def on_pages_needed(self, scale, pages):
+        """خدمة صفحات التمرير المتصل من الذاكرة أو طلب رسمها، وإلغاء طلبات الصفحات البعيدة"""
+        if not self.pdf_document or not self.continuous_mode:
+            return
+        window = self.pdf_view.continuous_window
+        self.render_pool.cancel(lambda pending: pending[0] not in window)
+        variant = self._page_variant()
+        for page_idx, priority in pages:
+            key = (page_idx, scale, variant)
+            pixmap = self.page_cache.get(key)
+            if pixmap is None:
+                self.render_pool.request(key, priority)
+                # عرض النسخة الأساسية مؤقتاً إن وجدت
+                key = (page_idx, RENDER_SCALE, variant)
+                pixmap = self.page_cache.get(key)
+            if pixmap is not None:
+                self.pdf_view.set_continuous_page(page_idx, pixmap, key[1])
+
+    def on_continuous_page_changed(self, page_idx):
+        """تحديث الصفحة الحالية أثناء التمرير المتصل دون إعادة بناء المشهد"""
+        if not self.continuous_mode or page_idx == self.current_page_idx:
+            return
+        self.current_page_idx = page_idx
+        self._update_page_status()
+        self._nav_timer.start()
+
+    def set_continuous_mode(self, enabled):
+        """التبديل بين عرض صفحة واحدة والتمرير المتصل لكل الصفحات"""
+        self.continuous_mode = bool(enabled)
+        if self.btn_continuous.isChecked() != self.continuous_mode:
+            self.btn_continuous.setChecked(self.continuous_mode)
+        if self.continuous_mode and self.spread_mode:
+            self.spread_mode = False
+            self.btn_spread.blockSignals(True)
+            self.btn_spread.setChecked(False)
+            self.btn_spread.blockSignals(False)
+        self._shown_page = None
+        self.render_page()
+
+    def _show_spread_page(self, key, pixmap):
+        """عرض صفحة من العرض المزدوج إن كانت ضمن الصفحتين المعروضتين"""
+        if key[0] in self.pdf_view.spread_slots and key == self._page_key(key[0]):
+            self.pdf_view.set_spread_page(key[0], pixmap, key[1])
+            self._mark_first_paint()
+            tracing.instant("page_shown", page=key[0], scale=key[1])
+
+    def set_spread_mode(self, enabled):
+        """التبديل بين عرض صفحة واحدة وعرض صفحتين متقابلتين"""
+        self.spread_mode = bool(enabled)
+        if self.btn_spread.isChecked() != self.spread_mode:
+            self.btn_spread.setChecked(self.spread_mode)
+        if self.spread_mode and self.continuous_mode:
+            self.continuous_mode = False
+            self.btn_continuous.blockSignals(True)
+            self.btn_continuous.setChecked(False)
+            self.btn_continuous.blockSignals(False)
+        # إعادة بناء المشهد بالنمط الجديد
+        self._shown_page = None
+        self.render_page()
+
+    def _update_page_status(self):
+        """تحديث رقم الصفحة والسورة والجزء وتحديد السورة في القائمة"""
+        info = self.page_meta.page(self.current_page_idx)
+        pages = self.page_meta.spread(self.current_page_idx) if self.spread_mode else (self.current_page_idx,)
+        numbers = " - ".join(str(page_idx + 1) for page_idx in pages)
+        text = f"الصفحة: {numbers} / {len(self.pdf_document)}"
+        if info.surah_index >= 0:
+            text += f"\nسورة {info.surah_name} · الجزء {info.juz} · الحزب {info.hizb}"
+        self.page_info.setText(text)
+        if info.surah_index >= 0 and self.surah_list.currentRow() != info.surah_index:
+            self.surah_list.setCurrentRow(info.surah_index)
         self.page_spin.blockSignals(True)
         self.page_spin.setValue(self.current_page_idx + 1)
         self.page_spin.blockSignals(False)
+
+    def _on_navigation_settled(self):
+        if not self.pdf_document: return
+        _, scale, variant = self._page_key(self.current_page_idx)
+        if self.spread_mode:
+            self.render_pool.prefetch_spreads(
+                self._neighbour_spreads(), scale, variant, skip=self.page_cache.__contains__
+            )
+        elif not self.continuous_mode:
+            # في التمرير المتصل تُطلب الصفحات القريبة أثناء التمرير
+            self.render_pool.prefetch(
+                self.current_page_idx, len(self.pdf_document), scale, variant,
+                skip=self.page_cache.__contains__
+            )
         self.save_settings()
 
+    def _neighbour_spreads(self):
+        """أزواج الصفحات المجاورة للعرض الحالي، الأقرب أولاً والتالي قبل السابق"""
+        spreads = []
+        after = before = self.page_meta.spread(self.current_page_idx)
+        for _ in range(max(1, PREFETCH_PAGES // 2)):
+            if after[-1] + 1 < len(self.pdf_document):
+                after = self.page_meta.spread(after[-1] + 1)
+                spreads.append(after)
+            if before[0] > 0:
+                before = self.page_meta.spread(before[0] - 1)
+                spreads.append(before)
+        return spreads
+
+    def on_page_rendered(self, key, image, edition=None):
+        """استقبال صفحة مرسومة من عمال الخلفية (لطبعة قد لا تكون المعروضة)"""
+        edition = edition or self.edition
+        with tracing.span("QPixmap.fromImage"):
+            pixmap = QPixmap.fromImage(image)
+        edition.page_cache.put(key, pixmap, image.sizeInBytes())
+        if edition is not self.edition:
+            return
+        if self.kiosk_mode and len(key) == 3 and key[1:] == self.kiosk_queue.params:
+            if (self.kiosk_queue.put(key[0], pixmap) and self._kiosk_waiting
+                    and self.kiosk_queue.ready()):
+                # الانتقال تأخر لأن الشريحة لم تكن جاهزة
+                self.kiosk_advance()
+                return
+        current_key = self._page_key(self.current_page_idx)
+        if self.continuous_mode:
+            if len(key) == 3 and key == self._page_key(key[0], self.pdf_view.continuous_scale):
+                self.pdf_view.set_continuous_page(key[0], pixmap, key[1])
+        elif self.spread_mode:
+            if len(key) == 3:
+                self._show_spread_page(key, pixmap)
+        elif len(key) > 3:
+            if (key[0], key[2]) == (current_key[0], current_key[2]):
+                self.pdf_view.add_tile(key[3], key[1], pixmap)
+        elif key == current_key:
+            self._show_rendered(key, pixmap)
+            tracing.instant("page_shown", page=key[0], scale=key[1])
+
+    def on_render_failed(self, key, error, edition=None):
+        """
+        إبلاغ المستخدم بصفحة تعذر رسمها ووضع علامة مكان صفحتها الفارغة
+
+        المفتاح لا يُحفظ في الذاكرة، فالعودة إلى الصفحة أو التمرير إليها يطلب رسمها من جديد
+        """
+        if (edition or self.edition) is not self.edition:
+            return
+        page_idx = key[0]
+        if self.kiosk_mode and len(key) == 3 and key[1:] == self.kiosk_queue.params:
+            # الشريحة تُتخطى حتى لا يتوقف العرض عندها، والطابور يُكمل عند الانتقال التالي
+            if self.kiosk_queue.drop(page_idx) and self._kiosk_waiting:
+                if self.kiosk_queue.ready():
+                    self.kiosk_advance()
+                else:
+                    self._schedule_kiosk_advance()
+        self.statusBar().showMessage(f"تعذر رسم الصفحة {page_idx + 1}: {error}", 5000)
+        label = f"تعذر رسم الصفحة {page_idx + 1}"
+        if self.continuous_mode:
+            self.pdf_view.forget_page(page_idx)
+        elif self.spread_mode:
+            if len(key) == 3 and key == self._page_key(page_idx):
+                self.pdf_view.show_spread_placeholder(page_idx, label)
+        elif len(key) == 3 and key == self._page_key(self.current_page_idx) and self._shown_page is None:
+            self.pdf_view.show_placeholder(label)
+
+    def _show_rendered(self, key, pixmap):
+        # إذا كانت الصفحة نفسها معروضة بدقة أخرى نستبدل الصورة دون إعادة بناء المشهد
+        same_page = self._shown_page == (key[0], key[2])
+        self.pdf_view.set_page(pixmap, key[1], keep_position=same_page)
+        self._shown_page = (key[0], key[2])
+        self._mark_first_paint()
+
+    def on_zoom_settled(self, scale):
+        """إعادة رسم الصفحة الحالية بدقة مطابقة لمستوى التكبير بعد توقفه"""
+        if not self.kiosk_mode:
+            # لا كتابة على القرص مع كل انتقال في العرض التلقائي
+            self.save_settings()
+        if not self.pdf_document:
+            return
+        if self.kiosk_mode:
+            # صور الطابور بمعامل الرسم السابق
+            self._fill_kiosk_queue()
+        if self.continuous_mode:
+            if scale != self.pdf_view.continuous_scale:
+                self.pdf_view.refresh_pages(scale)
+            return
+        if self.spread_mode:
+            for page_idx in self.pdf_view.spread_pages():
+                key = self._page_key(page_idx, scale)
+                pixmap = self.page_cache.get(key)
+                if pixmap is not None:
+                    self.pdf_view.set_spread_page(page_idx, pixmap, scale)
+                else:
+                    self.render_pool.request(key)
+            return
+        if scale == self.pdf_view.current_scale:
+            return
+        if self.pdf_view.is_tiled() and self._shown_page is not None:
+            # البلاطات تغطي المنطقة الظاهرة فلا حاجة لرسم الصفحة كاملة بدقة أعلى
+            return
+        key = self._page_key(self.current_page_idx, scale)
+        pixmap = self.page_cache.get(key)
+        if pixmap is not None:
+            self._show_rendered(key, pixmap)
+        else:
+            self.render_pool.request(key)
+
+    def on_tiles_needed(self, scale, tiles):
+        """خدمة البلاطات من الذاكرة أو طلب رسمها في الخلفية"""
+        if not self.pdf_document:
+            return
+        page_idx, _, variant = self._page_key(self.current_page_idx)
+        for tile, priority in tiles:
+            key = (page_idx, scale, variant, tile)
+            pixmap = self.page_cache.get(key)
+            if pixmap is not None:
+                self.pdf_view.add_tile(tile, scale, pixmap)
+            else:
+                self.render_pool.request(key, priority)
+
     def go_to_page(self, surah_num, page_num):
         self.current_page_idx = page_num - 1
         self.render_page()
 
+    def go_to_surah(self, surah_num, page_num):
+        """الانتقال إلى بداية سورة في الطبعة المعروضة"""
+        self.go_to_page(surah_num, self.page_meta.surah_range(surah_num)[0] + 1)
+
     def next_page(self):
-        if self.pdf_document and self.current_page_idx < len(self.pdf_document) - 1:
+        if not self.pdf_document:
+            return
+        if self.kiosk_mode:
+            self.kiosk_advance()
+            return
+        if self.spread_mode:
+            # الانتقال إلى الصفحة اليمنى من الزوج التالي
+            last = self.page_meta.spread(self.current_page_idx)[-1]
+            if last < len(self.pdf_document) - 1:
+                self.current_page_idx = last + 1
+                self.render_page()
+        elif self.current_page_idx < len(self.pdf_document) - 1:
             self.current_page_idx += 1
             self.render_page()
 
     def prev_page(self):
-        if self.pdf_document and self.current_page_idx > 0:
+        if not self.pdf_document:
+            return
+        if self.spread_mode:
+            first = self.page_meta.spread(self.current_page_idx)[0]
+            if first > 0:
+                self.current_page_idx = self.page_meta.spread(first - 1)[0]
+                self.render_page()
+        elif self.current_page_idx > 0:
             self.current_page_idx -= 1
             self.render_page()
+        if self.kiosk_mode:
+            # الرجوع خارج الطابور: يُعاد ملؤه من الصفحة الجديدة
+            self.kiosk_queue.reset()
+            self._fill_kiosk_queue()
+            self._schedule_kiosk_advance()
 
     def on_page_spin_changed(self, value):
         self.current_page_idx = value - 1
@@ -369,18 +1747,301 @@ class MushafViewer(QMainWindow):
     def on_search_changed(self, text):
         self.surah_list.search_surah(text)
 
+    def on_index_ready(self, index, edition=None):
+        edition = edition or self.edition
+        edition.search_index = index
+        if edition is self.edition:
+            self.statusBar().showMessage("فهرس البحث جاهز", 3000)
+
+    def on_index_progress(self, done, total):
+        if done < total:
+            self.statusBar().showMessage(f"جارٍ بناء فهرس البحث: {done} / {total}")
+
+    def on_text_search(self):
+        """البحث في نص المصحف والانتقال إلى النتيجة التالية عند كل ضغطة Enter"""
+        query = self.search_box.text().strip()
+        if not query:
+            return
+        if self.search_index is None:
+            self.statusBar().showMessage("جارٍ تجهيز فهرس البحث...", 3000)
+            return
+        if query != self._search_query:
+            self._search_query = query
+            self._search_hits = self.search_index.search(query)
+            self._search_pos = -1
+        if not self._search_hits:
+            self.statusBar().showMessage("لا توجد نتائج", 3000)
+            return
+        
+        self._search_pos = (self._search_pos + 1) % len(self._search_hits)
+        hit = self._search_hits[self._search_pos]
+        self.statusBar().showMessage(
+            f"نتيجة {self._search_pos + 1} من {len(self._search_hits)} - الصفحة {hit.page + 1}"
+        )
+        self._highlight_page = hit.page
+        self.pdf_view.set_highlights(self.search_index.hit_boxes(hit), hit.page)
+        self.current_page_idx = hit.page
+        self.render_page()
+
+    def show_command_palette(self):
+        """فتح لوحة الانتقال السريع (الفهرس يُبنى عند أول استخدام)"""
+        if not self.pdf_document:
+            return
+        if self.palette_index is None:
+            self.palette_index = PaletteIndex(self.page_meta, self._edition_bookmarks())
+        if self.command_palette is None:
+            self.command_palette = CommandPalette(self)
+            self.command_palette.page_chosen.connect(self.on_palette_page_chosen)
+        self.command_palette.open_with(self.palette_index)
+
+    def show_thumbnails(self):
+        """
+        فتح شبكة الصور المصغرة لكل الصفحات
+
+        الأطلس المحفوظ يُقرأ كاملاً بعملية واحدة، والصور الناقصة تُرسم في الخلفية
+        عند ظهور خلاياها فقط
+        """
+        if not self.pdf_document:
+            return
+        if self.thumbnail_dialog is None:
+            from render_worker import ThumbnailWorker
+            first = self.pdf_document[0].rect
+            thumb_height = round(THUMB_WIDTH * first.height / first.width)
+            page_count = len(self.pdf_document)
+            path = atlas_path(pdf_fingerprint(self.pdf_path), THUMB_WIDTH)
+            atlas = (ThumbnailAtlas.load(path, page_count, THUMB_WIDTH, thumb_height)
+                     or ThumbnailAtlas(page_count, THUMB_WIDTH, thumb_height))
+            self.thumbnail_worker = ThumbnailWorker(self.pdf_path, atlas, self)
+            model = ThumbnailModel(atlas, self.thumbnail_worker.request, self)
+            model.set_variant(self._page_variant())
+            self.thumbnail_worker.thumbnail_ready.connect(model.on_thumbnail_ready)
+            self.thumbnail_worker.start()
+            self.thumbnail_dialog = ThumbnailDialog(model, self.thumbnail_worker, path, self)
+            self.thumbnail_dialog.page_chosen.connect(self.on_thumbnail_chosen)
+        self.thumbnail_dialog.show_page(self.current_page_idx)
+
+    def on_thumbnail_chosen(self, page_idx):
+        info = self.page_meta.page(page_idx)
+        self.go_to_page(info.surah_index + 1, page_idx + 1)
+
+    def _sync_thumbnail_variant(self):
+        if self.thumbnail_dialog is not None:
+            self.thumbnail_dialog.model.set_variant(self._page_variant())
+
+    def on_palette_page_chosen(self, page_idx):
+        self.current_page_idx = page_idx
+        self.render_page()
+
+    def toggle_bookmark(self):
+        """إضافة الصفحة الحالية إلى الإشارات المرجعية أو إزالتها"""
+        if not self.pdf_document:
+            return
+        # الإشارات محفوظة بترقيم الطبعة الافتراضية
+        default = self.registry.edition()
+        page_idx = self.registry.translate_page(self.edition, self.current_page_idx, default)
+        if page_idx in self.bookmarks:
+            self.bookmarks.remove(page_idx)
+            self.statusBar().showMessage(f"أُزيلت الإشارة المرجعية للصفحة {self.current_page_idx + 1}", 3000)
+        else:
+            self.bookmarks.append(page_idx)
+            self.bookmarks.sort()
+            self.statusBar().showMessage(f"أُضيفت إشارة مرجعية للصفحة {self.current_page_idx + 1}", 3000)
+        # يُعاد بناء فهرس اللوحة عند فتحها التالي
+        self.palette_index = None
+        self.settings.update(bookmarks=list(self.bookmarks))
+
+    def _edition_bookmarks(self):
+        """الإشارات المرجعية بترقيم صفحات الطبعة المعروضة"""
+        default = self.registry.edition()
+        if self.edition is default:
+            return self.bookmarks
+        return sorted({self.registry.translate_page(default, page_idx, self.edition)
+                       for page_idx in self.bookmarks})
+
+    def _selection(self, kind):
+        """(النطاقات، الوصف) للصفحة أو السورة أو الجزء الحالي"""
+        from page_extract import selection_ranges
+        info = self.page_meta.page(self.current_page_idx)
+        if kind == "surah" and info.surah_index >= 0:
+            return selection_ranges(self.page_meta, "surah", info.surah_index + 1), f"سورة {info.surah_name}"
+        if kind == "juz" and info.juz > 0:
+            return selection_ranges(self.page_meta, "juz", info.juz), f"الجزء {info.juz}"
+        return selection_ranges(self.page_meta, "page", self.current_page_idx), f"الصفحة {self.current_page_idx + 1}"
+
+    def print_selection(self, kind, to_file=False):
+        """
+        طباعة الصفحة أو السورة أو الجزء الحالي، أو حفظه كملف PDF
+
+        الصفحات تُنسخ من ملف المصحف كما هي دون رسمها، فتبقى متجهية
+        وصغيرة الحجم وتُرسل إلى الطابعة مباشرة
+        """
+        if not self.pdf_document:
+            return
+        from page_extract import extract_pages, send_to_printer
+        ranges, title = self._selection(kind)
+        if to_file:
+            path, _ = QFileDialog.getSaveFileName(self, "حفظ كملف PDF", f"{title}.pdf", "PDF (*.pdf)")
+            if not path:
+                return
+            printer_name, copies = None, 1
+        else:
+            from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
+            printer = QPrinter(QPrinter.PrinterMode.HighResolution)
+            printer.setDocName(title)
+            dialog = QPrintDialog(printer, self)
+            dialog.setWindowTitle(f"طباعة {title}")
+            if dialog.exec() != QPrintDialog.DialogCode.Accepted:
+                return
+            if printer.outputFormat() == QPrinter.OutputFormat.PdfFormat:
+                path, printer_name = printer.outputFileName(), None
+            else:
+                path = str(get_cache_dir() / "print.pdf")
+                printer_name = printer.printerName()
+            copies = printer.copyCount()
+        
+        try:
+            count = extract_pages(self.pdf_document, ranges, path)
+            if printer_name is not None:
+                send_to_printer(path, printer_name, copies)
+        except Exception as e:
+            QMessageBox.warning(self, "خطأ", f"تعذرت الطباعة:\n{e}")
+            return
+        action = "أُرسلت إلى الطابعة" if printer_name is not None else f"حُفظت في {path}"
+        self.statusBar().showMessage(f"{title}: {count} صفحة {action}", 5000)
+
     def zoom_in(self):
         self.pdf_view.zoom_in()
 
     def zoom_out(self):
         self.pdf_view.zoom_out()
 
+    def toggle_fullscreen(self):
+        if self.isFullScreen():
+            self.showNormal()
+        else:
+            self.showFullScreen()
+
+    def set_kiosk_mode(self, enabled):
+        """
+        وضع العرض التلقائي: ملء الشاشة بالصفحة وحدها والانتقال بمؤقت أو بجهاز تحكم
+
+        بين الانتقالات لا يعمل أي مؤقت (حتى نبضة مراقبة الواجهة تتوقف) ولا يُرسم
+        شيء، فالشرائح القادمة تُرسم مسبقاً بعد كل انتقال مباشرة
+        """
+        if enabled == self.kiosk_mode or (enabled and not self.pdf_document):
+            return
+        self.kiosk_mode = enabled
+        view = self.pdf_view
+        if enabled:
+            self._kiosk_restore = (view.get_zoom(), self.isFullScreen())
+            if self.continuous_mode:
+                self.btn_continuous.setChecked(False)
+            self._heartbeat.stop()
+            self.watchdog.stop()
+            self.sidebar.hide()
+            self.toolbar.hide()
+            self.statusBar().hide()
+            view.set_highlights([])
+            self._highlight_page = None
+            view.setDragMode(QGraphicsView.DragMode.NoDrag)
+            view.viewport().setCursor(Qt.CursorShape.BlankCursor)
+            view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+            view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+            view.fit_to_view = True
+            self.showFullScreen()
+            view.fit_page()
+            self.kiosk_queue.reset()
+            self._fill_kiosk_queue()
+            self._schedule_kiosk_advance()
+        else:
+            self._kiosk_timer.stop()
+            self._kiosk_waiting = False
+            self.kiosk_queue.reset()
+            view.fit_to_view = False
+            view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+            view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+            view.viewport().unsetCursor()
+            view.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+            self.sidebar.show()
+            self.toolbar.show()
+            self.statusBar().show()
+            zoom, fullscreen = self._kiosk_restore
+            if not fullscreen:
+                self.showNormal()
+            view.set_zoom(zoom)
+            self._start_watchdog()
+            self.render_page()
+        for shortcut in self._kiosk_shortcuts:
+            shortcut.setEnabled(enabled)
+        self.save_settings()
+
+    def _kiosk_slide(self, page_idx):
+        return self.page_meta.spread(page_idx) if self.spread_mode else (page_idx,)
+
+    def _kiosk_next_slide(self, slide):
+        """الشريحة التالية، والعودة إلى سورة الفاتحة بعد آخر صفحة"""
+        page_idx = slide[-1] + 1
+        if page_idx >= len(self.pdf_document):
+            page_idx = min(self.page_meta.surah_range(1)[0], len(self.pdf_document) - 1)
+        return self._kiosk_slide(page_idx)
+
+    def _fill_kiosk_queue(self):
+        """طلب صور الشرائح القادمة حتى امتلاء الطابور (الأقرب أولاً)"""
+        scale = self.pdf_view.required_scale()
+        variant = self._page_variant()
+        if self.kiosk_queue.params != (scale, variant):
+            stale = self.kiosk_queue.params
+            self.render_pool.cancel(lambda pending: len(pending) == 3 and pending[1:] == stale)
+            self.kiosk_queue.reset((scale, variant))
+        pages = self.kiosk_queue.extend(self._kiosk_slide(self.current_page_idx),
+                                        self._kiosk_next_slide)
+        for priority, page_idx in enumerate(pages, 1):
+            key = (page_idx, scale, variant)
+            pixmap = self.page_cache.get(key)
+            if pixmap is not None:
+                self.kiosk_queue.put(page_idx, pixmap)
+            else:
+                self.render_pool.request(key, priority)
+
+    def _schedule_kiosk_advance(self):
+        if self.kiosk_interval > 0:
+            self._kiosk_timer.start(self.kiosk_interval * 1000)
+
+    def kiosk_advance(self):
+        """الانتقال إلى الشريحة التالية الجاهزة (أو عند اكتمال رسمها)"""
+        self._kiosk_timer.stop()
+        self._fill_kiosk_queue()
+        slide = self.kiosk_queue.pop()
+        if slide is None:
+            self._kiosk_waiting = True
+            return
+        self._kiosk_waiting = False
+        pages, pixmaps = slide
+        scale, variant = self.kiosk_queue.params
+        self.current_page_idx = pages[0]
+        if self.spread_mode:
+            ratio = RENDER_SCALE / scale
+            self.pdf_view.set_spread([
+                (page_idx, QSizeF(pixmap.width() * ratio, pixmap.height() * ratio), pixmap, scale)
+                for page_idx, pixmap in zip(pages, pixmaps)
+            ])
+            self._shown_page = None
+        else:
+            # نفس عنصر الصورة يعرض الصفحة الجديدة
+            self.pdf_view.set_page(pixmaps[0], scale, keep_position=self.pdf_view.pixmap_item is not None)
+            self._shown_page = (pages[0], variant)
+        self._update_page_status()
+        self._fill_kiosk_queue()
+        self._schedule_kiosk_advance()
+
     def toggle_theme(self):
         self.is_dark_mode = not self.is_dark_mode
         self.btn_theme.setText("☀️" if self.is_dark_mode else "🌙")
         self._apply_theme()
+        self._sync_thumbnail_variant()
         self.render_page()
 
+    @tracing.traced("_apply_theme")
     def _apply_theme(self):
         theme = DARK_THEME if self.is_dark_mode else LIGHT_THEME
         style = f"""
@@ -432,36 +2093,81 @@ class MushafViewer(QMainWindow):
         """
         self.setStyleSheet(style)
 
+    def closeEvent(self, event):
+        self._heartbeat.stop()
+        self.watchdog.stop()
+        try:
+            path = self.watchdog.dump(get_cache_dir() / "stalls.json")
+            latency = self.watchdog.report()["latency"]
+            logger.info("تأخر حلقة الأحداث: p99 %.0f مللي ثانية، %d توقف (%s)",
+                        latency["p99_ms"], self.watchdog.stall_count, path)
+        except OSError as e:
+            logger.warning("تعذر حفظ تقرير توقف الواجهة: %s", e)
+        for edition in self.registry.opened():
+            if edition.index_loader:
+                # البناء غير المكتمل يُستأنف في التشغيل القادم
+                edition.index_loader.requestInterruption()
+                edition.index_loader.wait()
+            if edition.render_pool:
+                edition.render_pool.shutdown()
+        if self.thumbnail_worker:
+            self.thumbnail_worker.stop()
+            self.thumbnail_dialog.save_atlas()
+        self.registry.close_all()
+        self.settings.update(window_width=self.width(), window_height=self.height())
+        self.save_settings()
+        self.settings.close()
+        super().closeEvent(event)
+
     def load_settings(self):
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    settings = json.load(f)
-                    self.current_page_idx = settings.get("last_page", 0)
-                    self.is_dark_mode = settings.get("dark_mode", False)
-                    self.btn_theme.setText("☀️" if self.is_dark_mode else "🌙")
-            except: pass
+        settings = self.settings.load()
+        self.current_page_idx = settings.get("last_page", 0)
+        self.is_dark_mode = settings.get("dark_mode", False)
+        self.bookmarks = sorted(int(page) for page in settings.get("bookmarks", []))
+        self.btn_theme.setText("☀️" if self.is_dark_mode else "🌙")
+        self.set_page_color(settings.get("page_color", "auto"))
+        self.spread_mode = bool(settings.get("spread_mode", False))
+        self.btn_spread.setChecked(self.spread_mode)
+        self.continuous_mode = bool(settings.get("continuous_mode", False)) and not self.spread_mode
+        self.btn_continuous.setChecked(self.continuous_mode)
+        self.pdf_view.set_zoom(settings.get("zoom", 1.0))
+        self.kiosk_interval = max(0, int(settings.get("kiosk_interval", 60)))
+        self._kiosk_on_start = bool(settings.get("kiosk_mode", False))
+        self.resize(settings.get("window_width", 1200), settings.get("window_height", 800))
 
+    @tracing.traced("save_settings")
     def save_settings(self):
-        settings = {
-            "last_page": self.current_page_idx,
-            "dark_mode": self.is_dark_mode
-        }
-        try:
-            with open(self.config_file, 'w') as f:
-                json.dump(settings, f)
-        except: pass
+        """تسجيل الحالة الحالية في مخزن الإعدادات (الحفظ على القرص يتم لاحقاً في الخلفية)"""
+        self.settings.update(
+            last_page=self.current_page_idx,
+            dark_mode=self.is_dark_mode,
+            page_color=self.page_color,
+            spread_mode=self.spread_mode,
+            continuous_mode=self.continuous_mode,
+            edition=self.edition.edition_id,
+            kiosk_mode=self.kiosk_mode,
+            # التكبير الملائم للشاشة في وضع العرض التلقائي لا يُحفظ
+            zoom=round(self._kiosk_restore[0] if self.kiosk_mode else self.pdf_view.get_zoom(), 4),
+        )
 
 if __name__ == "__main__":
+    import multiprocessing
+    # ضروري لمجموعة العمليات في النسخ المجمعة بـ PyInstaller
+    multiprocessing.freeze_support()
+    # --trace و --profile (أو متغيرات البيئة) تفعّل قياس الأداء
+    sys.argv = tracing.configure(sys.argv)
     app = QApplication(sys.argv)
     app.setApplicationName(APP_NAME)
     app.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
     
-    font_path = get_resource_path(os.path.join("assets", "Amiri-Regular.ttf"))
-    if os.path.exists(font_path):
-        QFontDatabase.addApplicationFont(font_path)
-        app.setFont(QFont("Amiri", 11))
+    def load_fonts():
+        font_path = get_resource_path(os.path.join("assets", "Amiri-Regular.ttf"))
+        if os.path.exists(font_path):
+            QFontDatabase.addApplicationFont(font_path)
+            app.setFont(QFont("Amiri", 11))
     
     window = MushafViewer()
     window.show()
+    # تسجيل الخط بعد ظهور النافذة (تغيير خط التطبيق يُحدّث كل العناصر)
+    QTimer.singleShot(0, load_fonts)
     sys.exit(app.exec())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+ذاكرة تخزين مؤقت للصفحات المرسومة بحد أقصى من البايتات وسياسة LRU
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import tracing
+
+
+class PageCache:
+    """
+    تخزين مؤقت للصفحات المرسومة داخل الذاكرة
+
+    المفتاح عادة (فهرس الصفحة، معامل الرسم، نمط الألوان)، ويُحسب الحجم
+    بالبايت لا بعدد العناصر، ويُطرد الأقدم استخداماً عند تجاوز الميزانية
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        جلب عنصر من الذاكرة وتحديث ترتيب استخدامه
+
+        Args:
+            key: مفتاح العنصر
+
+        Returns:
+            العنصر أو None إذا لم يوجد
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                tracing.count("page_cache.miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            tracing.count("page_cache.hit")
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int):
+        """
+        إضافة عنصر مع حجمه بالبايت
+
+        العناصر الأكبر من الميزانية كاملة لا تُخزن
+
+        Args:
+            key: مفتاح العنصر
+            value: العنصر
+            nbytes: حجم العنصر بالبايت
+        """
+        with self._lock:
+            self._remove(key)
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            self._evict()
+
+    def discard(self, key: Hashable):
+        """حذف عنصر إن وجد"""
+        with self._lock:
+            self._remove(key)
+
+    def resize(self, max_bytes: int):
+        """تغيير الميزانية وطرد ما يزيد عنها"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        """إفراغ الذاكرة مع الإبقاء على العدادات"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        إحصائيات الذاكرة
+
+        Returns:
+            قاموس بعدد الإصابات والإخفاقات وعمليات الطرد والحجم الحالي
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        # لا يؤثر على العدادات ولا على ترتيب الاستخدام
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.current_bytes -= nbytes
+            self.evictions += 1
+
+
+class CacheNamespace:
+    """
+    جزء من ذاكرة مشتركة بمفاتيح مسبوقة باسم، بنفس واجهة PageCache
+
+    عدة مستندات تتقاسم بذلك ميزانية واحدة وترتيب LRU واحداً، فالمستند
+    المعروض يطرد صفحات المستندات الأخرى الأقدم استخداماً لا صفحاته فقط
+    """
+
+    def __init__(self, cache: PageCache, name: Hashable):
+        self.cache = cache
+        self.name = name
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return self.cache.get((self.name, key))
+
+    def put(self, key: Hashable, value: Any, nbytes: int):
+        self.cache.put((self.name, key), value, nbytes)
+
+    def discard(self, key: Hashable):
+        self.cache.discard((self.name, key))
+
+    def stats(self) -> Dict[str, int]:
+        """إحصائيات الذاكرة المشتركة كاملة"""
+        return self.cache.stats()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return (self.name, key) in self.cache
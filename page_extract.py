@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+استخراج نطاقات من صفحات المصحف كملف PDF متجهي دون رسمها كصور،
+لطباعة سورة أو جزء أو حفظه كملف
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import fitz  # PyMuPDF
+
+from page_meta import PageMetadata
+from utils import parse_page_ranges
+
+# نطاق صفحات [البداية، النهاية) بفهارس الملف
+PageRange = Tuple[int, int]
+
+
+def merge_ranges(pages: Sequence[int]) -> List[PageRange]:
+    """
+    تحويل فهارس صفحات مرتبة إلى نطاقات متصلة
+
+    Args:
+        pages: فهارس الصفحات مرتبة
+
+    Returns:
+        قائمة النطاقات [البداية، النهاية)
+    """
+    ranges = []
+    for page_idx in pages:
+        if ranges and ranges[-1][1] == page_idx:
+            ranges[-1] = (ranges[-1][0], page_idx + 1)
+        else:
+            ranges.append((page_idx, page_idx + 1))
+    return ranges
+
+
+def selection_ranges(meta: PageMetadata, kind: str, value) -> List[PageRange]:
+    """
+    نطاقات الصفحات لسورة أو جزء أو نص نطاقات
+
+    Args:
+        meta: بيانات الصفحات
+        kind: نوع التحديد (surah، juz، page، pages)
+        value: رقم السورة أو الجزء، أو فهرس الصفحة، أو نص مثل "1-10,15"
+
+    Returns:
+        قائمة النطاقات [البداية، النهاية)
+
+    Raises:
+        ValueError: إذا كان التحديد غير صالح
+    """
+    if kind == "surah":
+        if not 1 <= value <= len(meta.verses):
+            raise ValueError(f"رقم سورة غير صالح: {value}")
+        return [meta.surah_range(value)]
+    if kind == "juz":
+        if not 1 <= value <= len(meta.hizb_starts) // 2:
+            raise ValueError(f"رقم جزء غير صالح: {value}")
+        return [meta.juz_range(value)]
+    if kind == "page":
+        if not 0 <= value < meta.page_count:
+            raise ValueError(f"صفحة غير صالحة: {value + 1}")
+        return [(value, value + 1)]
+    if kind == "pages":
+        return merge_ranges(parse_page_ranges(value, meta.page_count))
+    raise ValueError(f"نوع تحديد غير معروف: {kind}")
+
+
+def extract_pages(document, ranges: Sequence[PageRange], output_path) -> int:
+    """
+    نسخ نطاقات من الصفحات إلى ملف PDF جديد كما هي (نصوص ورسوم متجهية)
+
+    Args:
+        document: مستند fitz مفتوح أو مسار ملف الـ PDF
+        ranges: النطاقات [البداية، النهاية)
+        output_path: مسار الملف الناتج
+
+    Returns:
+        عدد الصفحات المنسوخة
+    """
+    source = fitz.open(document) if isinstance(document, (str, Path)) else document
+    output = fitz.open()
+    try:
+        for start, stop in ranges:
+            # الموارد المشتركة (الخطوط والصور) تُنسخ مرة واحدة لكل الصفحات
+            output.insert_pdf(source, from_page=start, to_page=stop - 1,
+                              links=False, annots=False)
+        count = len(output)
+        output.save(str(output_path), garbage=1, deflate=True)
+    finally:
+        output.close()
+        if source is not document:
+            source.close()
+    return count
+
+
+def send_to_printer(path, printer_name: str = "", copies: int = 1):
+    """
+    إرسال ملف PDF إلى طابعة عبر CUPS (الطابعة تستقبل الصفحات المتجهية مباشرة)
+
+    Args:
+        path: مسار الملف
+        printer_name: اسم الطابعة (الافتراضية إذا كان فارغاً)
+        copies: عدد النسخ
+
+    Raises:
+        OSError: إذا لم يتوفر الأمر lp أو فشلت الطباعة
+    """
+    lp = shutil.which("lp")
+    if lp is None:
+        raise OSError("الأمر lp غير متوفر (يحتاج إلى CUPS)")
+    command = [lp, "-n", str(max(1, copies))]
+    if printer_name:
+        command += ["-d", printer_name]
+    result = subprocess.run(command + [str(path)], capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        raise OSError(result.stderr.strip() or f"lp exited with {result.returncode}")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+جداول بيانات الصفحات: السورة والجزء والحزب لكل صفحة، وصفحة كل آية
+"""
+
+import bisect
+from itertools import accumulate
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from config import HIZB_STARTS, MUSHAF_PAGE_OFFSET, SURAH_VERSES, SURAHS
+
+
+class PageInfo(NamedTuple):
+    """بيانات صفحة من الملف"""
+    page_idx: int
+    # فهرس السورة في SURAHS (أو -1 لصفحات المقدمة)
+    surah_index: int
+    surah_name: str
+    juz: int
+    hizb: int
+
+
+class PageMetadata:
+    """
+    جداول محسوبة مرة واحدة من SURAHS وبدايات الأحزاب
+
+    البحث من الصفحة إلى السورة والجزء والحزب بزمن ثابت، ومن السورة
+    والآية إلى الصفحة بالبحث الثنائي
+    """
+
+    def __init__(self, page_count: Optional[int] = None, surahs: Sequence[Tuple] = SURAHS,
+                 page_offset: int = MUSHAF_PAGE_OFFSET,
+                 hizb_starts: Sequence[Tuple[int, int, int]] = HIZB_STARTS,
+                 verses: Sequence[int] = SURAH_VERSES):
+        self.surahs = list(surahs)
+        self.page_offset = page_offset
+        self.page_count = page_count or max(s[2] for s in self.surahs)
+        self.verses = list(verses)
+        self.hizb_starts = list(hizb_starts)
+        # فهارس الصفحات تبدأ من 0، وصفحات SURAHS من 1
+        self._surah_starts = [s[2] - 1 for s in self.surahs]
+        self._hizb_pages = [page - 1 + page_offset for _, _, page in self.hizb_starts]
+
+        self._surah_of_page = self._fill(self._surah_starts)
+        self._hizb_of_page = [h + 1 for h in self._fill(self._hizb_pages)]
+
+        # رقم الآية التراكمي قبل كل سورة (للتقريب بين نقاط الربط)
+        self._verse_base = [0] + list(accumulate(self.verses))
+        anchors = {(num, 1): start for (num, *_), start in zip(self.surahs, self._surah_starts)
+                   if num <= len(self.verses)}
+        anchors.update({(s, a): page for (s, a, _), page in zip(self.hizb_starts, self._hizb_pages)})
+        self._anchor_keys = sorted(anchors)
+        self._anchor_pages = [anchors[k] for k in self._anchor_keys]
+
+    def _fill(self, starts: List[int]) -> List[int]:
+        """جدول لكل صفحة: فهرس آخر بداية قبلها (أو -1)"""
+        table = []
+        current = -1
+        for page_idx in range(self.page_count):
+            while current + 1 < len(starts) and starts[current + 1] <= page_idx:
+                current += 1
+            table.append(current)
+        return table
+
+    def page(self, page_idx: int) -> PageInfo:
+        """
+        بيانات صفحة بزمن ثابت
+
+        Args:
+            page_idx: فهرس الصفحة (يبدأ من 0)
+
+        Returns:
+            بيانات الصفحة (الجزء والحزب 0 لصفحات المقدمة)
+        """
+        page_idx = min(max(page_idx, 0), self.page_count - 1)
+        surah_index = self._surah_of_page[page_idx]
+        hizb = self._hizb_of_page[page_idx]
+        name = self.surahs[surah_index][1] if surah_index >= 0 else ""
+        return PageInfo(page_idx, surah_index, name, (hizb + 1) // 2, hizb)
+
+    def spread(self, page_idx: int) -> Tuple[int, ...]:
+        """
+        صفحتا العرض المزدوج اللتان تقع فيهما صفحة، كما في المصحف الورقي
+
+        صفحات المصحف الفردية على اليمين والزوجية على اليسار، وأول صفحة في
+        الملف (الغلاف) تُعرض وحدها إن لم يكن لها مقابل
+
+        Args:
+            page_idx: فهرس الصفحة (يبدأ من 0)
+
+        Returns:
+            فهارس الصفحات بترتيب القراءة (اليمنى أولاً)
+        """
+        page_idx = min(max(page_idx, 0), self.page_count - 1)
+        mushaf_page = page_idx - self.page_offset + 1
+        right = page_idx if mushaf_page % 2 else page_idx - 1
+        return tuple(idx for idx in (right, right + 1) if 0 <= idx < self.page_count)
+
+    def surah_range(self, surah_num: int) -> Tuple[int, int]:
+        """
+        صفحات سورة [البداية، النهاية) بفهارس الملف
+
+        تشمل الصفحة التي تبدأ فيها السورة التالية لأن السور تبدأ غالباً
+        في وسط الصفحة
+        """
+        index = surah_num - 1
+        start = self._surah_starts[index]
+        if surah_num >= len(self.verses) or index + 1 >= len(self._surah_starts):
+            return start, min(start + 1, self.page_count)
+        return start, max(self._surah_starts[index + 1] + 1, start + 1)
+
+    def juz_range(self, juz: int) -> Tuple[int, int]:
+        """صفحات جزء [البداية، النهاية) بفهارس الملف"""
+        start = self._hizb_pages[(juz - 1) * 2]
+        if juz * 2 < len(self._hizb_pages):
+            stop = self._hizb_pages[juz * 2] + 1
+        else:
+            # الجزء الأخير ينتهي بصفحة آخر سورة
+            stop = self._surah_starts[len(self.verses) - 1] + 1
+        return start, min(stop, self.page_count)
+
+    def ayah_page(self, surah_num: int, ayah: int) -> int:
+        """
+        صفحة آية بالبحث الثنائي في نقاط الربط (بدايات السور والأحزاب)
+
+        الصفحة دقيقة عند نقاط الربط، وتُقدّر بين نقطتين بالتناسب مع عدد الآيات
+
+        Args:
+            surah_num: رقم السورة
+            ayah: رقم الآية
+
+        Returns:
+            فهرس الصفحة في الملف
+        """
+        if not 1 <= surah_num <= len(self.verses):
+            raise ValueError(f"رقم سورة غير صحيح: {surah_num}")
+        ayah = min(max(ayah, 1), self.verses[surah_num - 1])
+        i = bisect.bisect_right(self._anchor_keys, (surah_num, ayah)) - 1
+        page = self._anchor_pages[i]
+        if i + 1 < len(self._anchor_keys):
+            verse = self._verse_number(surah_num, ayah)
+            first = self._verse_number(*self._anchor_keys[i])
+            last = self._verse_number(*self._anchor_keys[i + 1])
+            span = self._anchor_pages[i + 1] - page
+            page += (verse - first) * span // max(last - first, 1)
+        return page
+
+    def page_ayah(self, page_idx: int) -> Tuple[int, int]:
+        """
+        أول آية في صفحة (عكس ayah_page)، للانتقال إلى نفس الموضع في مصحف آخر
+
+        Args:
+            page_idx: فهرس الصفحة في الملف
+
+        Returns:
+            (رقم السورة، رقم الآية)، والآية الأولى لصفحات المقدمة
+        """
+        j = bisect.bisect_left(self._anchor_pages, page_idx)
+        if j < len(self._anchor_pages) and self._anchor_pages[j] == page_idx:
+            return self._anchor_keys[j]
+        if j == 0:
+            return self._anchor_keys[0]
+        i = j - 1
+        verse = first = self._verse_number(*self._anchor_keys[i])
+        if j < len(self._anchor_keys):
+            # أصغر آية يقدّر ayah_page أنها في هذه الصفحة أو بعدها
+            last = self._verse_number(*self._anchor_keys[j])
+            span = self._anchor_pages[j] - self._anchor_pages[i]
+            offset = page_idx - self._anchor_pages[i]
+            verse = min(first - (-offset * (last - first) // span), last - 1)
+        surah_num = bisect.bisect_left(self._verse_base, verse)
+        return surah_num, verse - self._verse_base[surah_num - 1]
+
+    def _verse_number(self, surah_num: int, ayah: int) -> int:
+        return self._verse_base[surah_num - 1] + ayah
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+حزمة الصفحات المرسومة مسبقاً: كل صفحات المصحف بمعاملات رسم ثابتة في ملف واحد
+يُفتح بـ mmap، فتُقرأ الصفحات من الذاكرة المعينة دون تشغيل MuPDF
+
+    python page_pack.py --scales 2.0,2.8284 --output pages.qpack
+
+بنية الملف: رأس، ثم جدول المعاملات، ثم فهرس (الموضع، الحجم) لكل صفحة بكل
+معامل، ثم بيانات الصفحات مضغوطة بصيغة raster.py (بالألوان الأساسية)
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from config import DEFAULT_PDF_FILE, MAX_RENDER_SCALE, MIN_RENDER_SCALE, PAGE_PACK_FILE
+from raster import Raster, decode_raster, encode_raster
+from utils import quantize_scale
+
+# رأس الملف: التوقيع، الإصدار، عدد المعاملات، عدد الصفحات، حجم ملف الـ PDF المصدر
+_HEADER = struct.Struct("<4sBHIQ")
+_MAGIC = b"QPAK"
+_VERSION = 1
+# المعامل مخزن كعدد صحيح (×10000) لأن المعاملات مقربة إلى 4 منازل عشرية
+_SCALE = struct.Struct("<I")
+# مدخل الفهرس: موضع البيانات في الملف وحجمها
+_ENTRY = struct.Struct("<QI")
+
+# مستند كل عملية أثناء البناء
+_document = None
+
+
+def _scale_id(scale: float) -> int:
+    return int(round(scale * 10000))
+
+
+class PagePack:
+    """
+    قارئ حزمة صفحات معينة في الذاكرة
+
+    القراءة آمنة بين الخيوط: البيانات للقراءة فقط وكل قراءة تفك ضغط صورة مستقلة
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except (ValueError, struct.error):
+            self._map.close()
+            raise
+
+    def _parse(self):
+        data = self._map
+        if len(data) < _HEADER.size:
+            raise ValueError("حزمة الصفحات ناقصة")
+        magic, version, scale_count, page_count, source_size = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("صيغة حزمة الصفحات غير معروفة")
+        self.page_count = page_count
+        self.source_size = source_size
+        offset = _HEADER.size
+        scale_ids = []
+        for _ in range(scale_count):
+            scale_ids.append(_SCALE.unpack_from(data, offset)[0])
+            offset += _SCALE.size
+        self.scales = [scale_id / 10000 for scale_id in scale_ids]
+        # الفهرس يبقى في الذاكرة المعينة ويُقرأ منه مدخل واحد عند كل طلب
+        self._index_offset = offset
+        self._slots = {scale_id: slot for slot, scale_id in enumerate(scale_ids)}
+        end = offset + scale_count * page_count * _ENTRY.size
+        if end > len(data):
+            raise ValueError("فهرس حزمة الصفحات ناقص")
+
+    def has(self, page_idx: int, scale: float) -> bool:
+        """هل الصفحة موجودة في الحزمة بهذا المعامل"""
+        return 0 <= page_idx < self.page_count and _scale_id(scale) in self._slots
+
+    def get(self, page_idx: int, scale: float) -> Optional[Raster]:
+        """
+        فك ضغط صفحة مباشرة من الذاكرة المعينة
+
+        Args:
+            page_idx: فهرس الصفحة
+            scale: معامل الرسم
+
+        Returns:
+            الصورة أو None إذا لم تكن في الحزمة (أو كانت بياناتها تالفة)
+        """
+        if not self.has(page_idx, scale):
+            return None
+        slot = self._slots[_scale_id(scale)]
+        position = self._index_offset + (slot * self.page_count + page_idx) * _ENTRY.size
+        offset, size = _ENTRY.unpack_from(self._map, position)
+        if size == 0 or offset + size > len(self._map):
+            return None
+        view = memoryview(self._map)[offset:offset + size]
+        try:
+            return decode_raster(view)
+        except ValueError:
+            return None
+        finally:
+            view.release()
+
+    def close(self):
+        self._map.close()
+
+
+def open_pack(path, page_count: Optional[int] = None,
+              source_size: Optional[int] = None) -> Optional[PagePack]:
+    """
+    فتح حزمة صفحات إن وُجدت وطابقت ملف الـ PDF
+
+    بصمة الملف لا تُستخدم لأن وقت تعديله يتغير عند استخراجه من الحزم المجمعة
+
+    Args:
+        path: مسار الحزمة
+        page_count: عدد صفحات ملف الـ PDF (للتحقق)
+        source_size: حجم ملف الـ PDF بالبايت (للتحقق)
+
+    Returns:
+        الحزمة أو None إذا لم توجد أو لم تطابق
+    """
+    try:
+        pack = PagePack(path)
+    except (OSError, ValueError):
+        return None
+    if ((page_count is not None and pack.page_count != page_count)
+            or (source_size is not None and pack.source_size != source_size)):
+        pack.close()
+        return None
+    return pack
+
+
+def _init_worker(pdf_path: str):
+    global _document
+    from renderer import open_document
+    _document = open_document(pdf_path)
+
+
+def _render_blob(job) -> bytes:
+    from renderer import render_raster
+    page_idx, scale = job
+    return encode_raster(render_raster(_document, page_idx, scale), level=9)
+
+
+def build_pack(pdf_path: str, output_path, scales: Sequence[float],
+               workers: Optional[int] = None,
+               progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    رسم كل الصفحات بالمعاملات المحددة وكتابتها في حزمة واحدة
+
+    Args:
+        pdf_path: مسار ملف الـ PDF
+        output_path: مسار الحزمة
+        scales: معاملات الرسم (تُقرب إلى سلم معاملات العارض)
+        workers: عدد العمليات
+        progress: دالة تُستدعى بعد كل صفحة (المنجز، الإجمالي)
+
+    Returns:
+        حجم الحزمة بالبايت
+    """
+    import multiprocessing
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    from renderer import open_document
+    scales = sorted({quantize_scale(scale, MIN_RENDER_SCALE, MAX_RENDER_SCALE) for scale in scales})
+    document = open_document(pdf_path)
+    try:
+        page_count = len(document)
+    finally:
+        document.close()
+    jobs = [(page_idx, scale) for scale in scales for page_idx in range(page_count)]
+    header = _HEADER.pack(_MAGIC, _VERSION, len(scales), page_count, os.path.getsize(pdf_path))
+    header += b"".join(_SCALE.pack(_scale_id(scale)) for scale in scales)
+    data_offset = len(header) + len(jobs) * _ENTRY.size
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    workers = max(1, workers or os.cpu_count() or 1)
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    index = []
+    try:
+        with open(tmp_path, "wb") as f, ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(method),
+                initializer=_init_worker, initargs=(pdf_path,)) as executor:
+            f.seek(data_offset)
+            offset = data_offset
+            queue = iter(jobs)
+            running = deque()
+            done = 0
+            while True:
+                # نافذة محدودة من المهام المعلقة (كما في التصدير) فلا تتراكم في
+                # الذاكرة إلا نتائج هذه المهام، وتُكتب بترتيب الصفحات
+                for job in queue:
+                    running.append(executor.submit(_render_blob, job))
+                    if len(running) >= workers * 2:
+                        break
+                if not running:
+                    break
+                blob = running.popleft().result()
+                f.write(blob)
+                index.append(_ENTRY.pack(offset, len(blob)))
+                offset += len(blob)
+                done += 1
+                if progress is not None:
+                    progress(done, len(jobs))
+            f.seek(0)
+            f.write(header + b"".join(index))
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return output_path.stat().st_size
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="page_pack.py",
+                                     description="بناء حزمة صفحات مرسومة مسبقاً")
+    parser.add_argument("--pdf", default=DEFAULT_PDF_FILE, help="مسار ملف الـ PDF")
+    parser.add_argument("--scales", default="2.0",
+                        help="معاملات الرسم مفصولة بفواصل، مثل 2.0,2.8284")
+    parser.add_argument("--output", "-o", default=PAGE_PACK_FILE, help="مسار الحزمة")
+    parser.add_argument("--workers", "-j", type=int, default=None, help="عدد العمليات")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not os.path.exists(args.pdf):
+        print(f"❌ لم يتم العثور على ملف الـ PDF: {args.pdf}", file=sys.stderr)
+        return 1
+    try:
+        scales = [float(value) for value in args.scales.split(",") if value.strip()]
+    except ValueError:
+        print(f"❌ معاملات غير صالحة: {args.scales}", file=sys.stderr)
+        return 2
+    if not scales:
+        print("❌ يجب تحديد معامل رسم واحد على الأقل", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+
+    def report(done, total):
+        print(f"\r📦 {done}/{total} صفحة", end="", file=sys.stderr, flush=True)
+
+    size = build_pack(args.pdf, args.output, scales, args.workers, report)
+    print(file=sys.stderr)
+    print(f"✅ تم بناء {args.output} ({size / 2**20:.1f} MiB) في "
+          f"{time.perf_counter() - started:.1f} ث")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
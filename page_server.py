@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+خادم صور الصفحات لشاشات العرض على الشبكة المحلية، دون واجهة رسومية
+
+    python main.py serve --host 0.0.0.0 --port 8604
+
+    GET /page/{n}?scale=2.0&theme=dark   صورة الصفحة n (برقم صفحة الملف) بصيغة PNG
+    GET /page/{n}/meta                   السورة والجزء والحزب وأول آية في الصفحة (JSON)
+    GET /surahs                          السور وصفحات بداياتها (JSON)
+
+الصفحات تُقرأ من حزمة الصفحات أو التخزين الدائم المشترك مع الواجهة قبل رسمها،
+والصور المرمزة تُحفظ في ذاكرة واحدة لكل الشاشات. طلبات الصفحة نفسها المتزامنة
+تنتظر رسماً واحداً، وعدد عمليات الرسم بـ MuPDF في الوقت نفسه محدود. وسم ETag
+يُحسب من بصمة الملف ومعاملات الطلب فتُجاب If-None-Match دون رسم
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import tracing
+from config import (
+    APP_NAME, APP_VERSION, DEFAULT_PDF_FILE, MAX_RENDER_SCALE, MIN_RENDER_SCALE,
+    PAGE_PACK_FILE, RENDER_SCALE, SERVER_CACHE_BYTES, SERVER_HOST, SERVER_IDLE_TIMEOUT,
+    SERVER_MAX_RENDERS, SERVER_PORT, SURAH_VERSES, SURAHS
+)
+from page_cache import PageCache
+from page_meta import PageMetadata
+from utils import pdf_fingerprint, quantize_scale
+
+# أنماط الألوان الثابتة (auto و theme يعتمدان على حالة الواجهة)
+SERVER_THEMES = ("light", "dark", "sepia", "night")
+_DUOTONE = re.compile(r"duotone:#[0-9a-fA-F]{6}:#[0-9a-fA-F]{6}")
+# الحد الأقصى لطول سطر الطلب مع الترويسات
+_MAX_HEAD = 16 * 1024
+
+_REASONS = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 500: "Internal Server Error",
+}
+
+# الاستجابة: (الحالة، الترويسات، المحتوى)
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def valid_theme(theme: str) -> bool:
+    """هل نمط الألوان مدعوم في الخادم"""
+    return theme in SERVER_THEMES or bool(_DUOTONE.fullmatch(theme))
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    مقارنة ترويسة If-None-Match بوسم الاستجابة (المقارنة الضعيفة كما في HTTP)
+
+    Args:
+        header: قيمة الترويسة
+        etag: وسم الاستجابة
+
+    Returns:
+        True إذا كانت نسخة العميل مطابقة
+    """
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+class PageServer:
+    """
+    خادم HTTP مبني على asyncio يرسم صفحات ملف PDF واحد
+
+    الرسم يتم في خيوط منفصلة (لكل خيط نسخته من الملف) فتبقى حلقة الأحداث حرة
+    لخدمة الطلبات الأخرى
+    """
+
+    def __init__(self, pdf_path: str, render: Optional[Callable[[int, float, str], bytes]] = None,
+                 page_count: Optional[int] = None, meta: Optional[PageMetadata] = None,
+                 max_renders: int = SERVER_MAX_RENDERS, cache_bytes: int = SERVER_CACHE_BYTES,
+                 pack=None, disk_cache=None):
+        """
+        Args:
+            pdf_path: مسار ملف الـ PDF
+            render: دالة (الصفحة، المعامل، النمط) -> بيانات PNG (الافتراضي الرسم بـ MuPDF)
+            page_count: عدد الصفحات (يُقرأ من الملف إذا لم يُحدد)
+            meta: جداول الصفحات (الافتراضي ترقيم مصحف المدينة)
+            max_renders: الحد الأقصى لعمليات الرسم المتزامنة
+            cache_bytes: الحد الأقصى لذاكرة الصور المرمزة
+            pack: حزمة الصفحات المرسومة مسبقاً (اختيارية)
+            disk_cache: التخزين الدائم للصفحات (اختياري)
+        """
+        self.pdf_path = pdf_path
+        self.fingerprint = pdf_fingerprint(pdf_path)
+        self.render = render or self._render_png
+        self.pack = pack
+        self.disk_cache = disk_cache
+        if page_count is None:
+            from renderer import open_document
+            document = open_document(pdf_path)
+            try:
+                page_count = len(document)
+            finally:
+                document.close()
+        self.page_count = page_count
+        self.meta = meta or PageMetadata(page_count)
+        self.cache = PageCache(cache_bytes)
+        self.max_renders = max(1, max_renders)
+        self._renders = None
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._executor = ThreadPoolExecutor(self.max_renders, thread_name_prefix="PageServer")
+        self._local = threading.local()
+        self._documents = []
+        self._documents_lock = threading.Lock()
+        self._server = None
+
+    async def start(self, host: str = SERVER_HOST, port: int = SERVER_PORT):
+        """
+        بدء الاستماع (المنفذ 0 يختار منفذاً متاحاً)
+
+        Returns:
+            (العنوان، المنفذ) الفعليان
+        """
+        self._renders = asyncio.Semaphore(self.max_renders)
+        self._server = await asyncio.start_server(self._handle, host, port, limit=_MAX_HEAD)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """إيقاف الاستماع وإغلاق نسخ الملف"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._executor.shutdown(wait=True)
+        with self._documents_lock:
+            for document in self._documents:
+                document.close()
+            self._documents.clear()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """خدمة اتصال واحد (مع إبقاء الاتصال مفتوحاً بين الطلبات)"""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), SERVER_IDLE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(self._encode(self._error(400, "الطلب طويل جداً"), "HTTP/1.1", False))
+                    await writer.drain()
+                    break
+                try:
+                    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                    method, target, version = request_line.split(" ")
+                    headers = {}
+                    for line in header_lines:
+                        if line:
+                            name, value = line.split(":", 1)
+                            headers[name.strip().lower()] = value.strip()
+                except ValueError:
+                    writer.write(self._encode(self._error(400, "طلب غير صالح"), "HTTP/1.1", False))
+                    await writer.drain()
+                    break
+                keep_alive = (version == "HTTP/1.1"
+                              and headers.get("connection", "").lower() != "close")
+                response = await self.respond(method, target, headers)
+                writer.write(self._encode(response, version, keep_alive, method == "HEAD"))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    def _encode(response: Response, version: str, keep_alive: bool, head_only: bool = False) -> bytes:
+        status, headers, body = response
+        lines = [f"{version} {status} {_REASONS.get(status, '')}"]
+        headers = dict(headers, **{
+            "Content-Length": str(len(body)),
+            "Connection": "keep-alive" if keep_alive else "close",
+            "Server": f"{APP_NAME.replace(' ', '-')}/{APP_VERSION}",
+        })
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        data = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return data if head_only or status == 304 else data + body
+
+    @staticmethod
+    def _error(status: int, message: str) -> Response:
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        return status, {"Content-Type": "application/json; charset=utf-8"}, body
+
+    def _etag(self, *parts) -> str:
+        return '"' + "-".join([self.fingerprint[:16]] + [str(part) for part in parts]) + '"'
+
+    async def respond(self, method: str, target: str, headers: Dict[str, str]) -> Response:
+        """
+        الاستجابة لطلب واحد
+
+        Args:
+            method: طريقة الطلب
+            target: المسار مع معاملات الاستعلام
+            headers: الترويسات (بأسماء بأحرف صغيرة)
+
+        Returns:
+            (الحالة، الترويسات، المحتوى)
+        """
+        if method not in ("GET", "HEAD"):
+            status, response_headers, body = self._error(405, "الطريقة غير مدعومة")
+            return status, dict(response_headers, Allow="GET, HEAD"), body
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        if parts == ["surahs"]:
+            return self._json(headers, self._etag("surahs"), self.surahs())
+        if parts == []:
+            return self._json(headers, self._etag("index"), {
+                "name": APP_NAME, "version": APP_VERSION, "page_count": self.page_count,
+                "themes": list(SERVER_THEMES),
+            })
+        if len(parts) in (2, 3) and parts[0] == "page" and parts[2:] in ([], ["meta"]):
+            try:
+                page_idx = int(parts[1]) - 1
+            except ValueError:
+                return self._error(404, "صفحة غير موجودة")
+            if not 0 <= page_idx < self.page_count:
+                return self._error(404, "صفحة غير موجودة")
+            if len(parts) == 3:
+                return self._json(headers, self._etag("meta", page_idx), self.page_info(page_idx))
+            return await self._page(page_idx, query, headers)
+        return self._error(404, "المسار غير موجود")
+
+    def _json(self, request_headers, etag: str, payload) -> Response:
+        response_headers = {"ETag": etag, "Content-Type": "application/json; charset=utf-8"}
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            return 304, response_headers, b""
+        return 200, response_headers, json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    async def _page(self, page_idx: int, query: Dict[str, str], request_headers) -> Response:
+        try:
+            scale = quantize_scale(float(query.get("scale", RENDER_SCALE)),
+                                   MIN_RENDER_SCALE, MAX_RENDER_SCALE)
+        except ValueError:
+            return self._error(400, "معامل الرسم غير صالح")
+        theme = query.get("theme", "light")
+        if not valid_theme(theme):
+            return self._error(400, f"نمط ألوان غير معروف: {theme}")
+        etag = self._etag(page_idx, f"{scale:g}", theme)
+        response_headers = {"ETag": etag, "Content-Type": "image/png",
+                            "Cache-Control": "public, max-age=3600"}
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            # الوسم لا يعتمد على الصورة فلا حاجة إلى رسمها
+            tracing.count("server.not_modified")
+            return 304, response_headers, b""
+        try:
+            body = await self.page_image(page_idx, scale, theme)
+        except Exception as e:
+            return self._error(500, str(e))
+        return 200, response_headers, body
+
+    async def page_image(self, page_idx: int, scale: float, theme: str) -> bytes:
+        """
+        صورة صفحة بصيغة PNG من الذاكرة أو برسمها (طلب واحد لكل صفحة مهما تعدد المنتظرون)
+
+        Args:
+            page_idx: فهرس الصفحة
+            scale: معامل الرسم (بعد التقريب)
+            theme: نمط الألوان
+
+        Returns:
+            بيانات PNG
+        """
+        key = (page_idx, scale, theme)
+        body = self.cache.get(key)
+        if body is not None:
+            tracing.count("server.hit")
+            return body
+        pending = self._inflight.get(key)
+        if pending is not None:
+            # shield حتى لا يُلغي انقطاع أحد العملاء الرسم على الآخرين
+            return await asyncio.shield(pending)
+        tracing.count("server.miss")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            async with self._renders:
+                with tracing.span("server_render", page=page_idx, scale=scale):
+                    body = await loop.run_in_executor(self._executor, self.render,
+                                                      page_idx, scale, theme)
+            self.cache.put(key, body, len(body))
+            future.set_result(body)
+            return body
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # الخطأ يُرفع هنا أيضاً فلا داعي لتحذير "لم تُقرأ" إن لم يوجد منتظرون
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def _document(self):
+        """نسخة الملف الخاصة بخيط الرسم الحالي"""
+        document = getattr(self._local, "document", None)
+        if document is None:
+            from renderer import open_document
+            document = self._local.document = open_document(self.pdf_path)
+            with self._documents_lock:
+                self._documents.append(document)
+        return document
+
+    def _render_png(self, page_idx: int, scale: float, theme: str) -> bytes:
+        from raster import encode_png
+        from recolor import recolor
+        from renderer import load_raster
+        raster = load_raster(self._document, page_idx, scale, self.pack,
+                             self.disk_cache, self.fingerprint)
+        with tracing.span("recolor", variant=theme):
+            raster = recolor(raster, theme)
+        with tracing.span("encode_png", page=page_idx):
+            return encode_png(raster)
+
+    def surahs(self) -> List[dict]:
+        """السور بصفحات بداياتها (برقم صفحة الملف الذي يبدأ من 1)"""
+        return [{"number": num, "name": name, "page": page, "verses": verses}
+                for (num, name, page), verses in zip(self.meta.surahs, SURAH_VERSES)]
+
+    def page_info(self, page_idx: int) -> dict:
+        """بيانات صفحة بصيغة JSON"""
+        info = self.meta.page(page_idx)
+        mushaf_page = page_idx - self.meta.page_offset + 1
+        first_ayah = None
+        if info.surah_index >= 0:
+            surah_num, ayah = self.meta.page_ayah(page_idx)
+            first_ayah = {"surah": surah_num, "ayah": ayah}
+        return {
+            "page": page_idx + 1,
+            "page_count": self.page_count,
+            "mushaf_page": mushaf_page if mushaf_page >= 1 else None,
+            "surah": ({"number": self.meta.surahs[info.surah_index][0], "name": info.surah_name}
+                      if info.surah_index >= 0 else None),
+            "juz": info.juz,
+            "hizb": info.hizb,
+            "first_ayah": first_ayah,
+        }
+
+
+async def serve(server: PageServer, host: str, port: int):
+    """تشغيل الخادم حتى الإيقاف"""
+    address = await server.start(host, port)
+    print(f"🌐 خادم الصفحات يعمل على http://{address[0]}:{address[1]}/ "
+          f"({server.page_count} صفحة، {server.max_renders} عمليات رسم)", file=sys.stderr)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.stop()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py serve",
+                                     description="خادم صور صفحات المصحف لشاشات العرض")
+    parser.add_argument("--pdf", help="مسار ملف الـ PDF (الافتراضي ملف المصحف المرفق)")
+    parser.add_argument("--host", default=SERVER_HOST,
+                        help="عنوان الاستماع (0.0.0.0 لكل أجهزة الشبكة)")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="المنفذ")
+    parser.add_argument("--max-renders", type=int, default=SERVER_MAX_RENDERS,
+                        help="الحد الأقصى لعمليات الرسم المتزامنة")
+    parser.add_argument("--cache-mb", type=int, default=SERVER_CACHE_BYTES // 2**20,
+                        help="حجم ذاكرة الصور بالميغابايت")
+    parser.add_argument("--no-disk-cache", action="store_true",
+                        help="عدم استخدام التخزين الدائم المشترك مع الواجهة")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, default_pdf: Optional[str] = None,
+         default_pack: Optional[str] = None) -> int:
+    """
+    نقطة دخول أمر الخادم
+
+    Args:
+        argv: معاملات سطر الأوامر بعد كلمة serve
+        default_pdf: ملف الـ PDF المستخدم إذا لم يُحدد --pdf
+        default_pack: مسار حزمة الصفحات المرسومة مسبقاً
+
+    Returns:
+        رمز الخروج
+    """
+    args = build_parser().parse_args(argv)
+    pdf_path = args.pdf or default_pdf or DEFAULT_PDF_FILE
+    if not os.path.exists(pdf_path):
+        print(f"❌ لم يتم العثور على ملف الـ PDF: {pdf_path}", file=sys.stderr)
+        return 1
+
+    from page_pack import open_pack
+    pack = open_pack(default_pack or PAGE_PACK_FILE, source_size=os.path.getsize(pdf_path))
+    disk_cache = None
+    if not args.no_disk_cache:
+        from config import DISK_CACHE_BYTES
+        from disk_cache import DiskCache
+        from utils import get_cache_dir
+        disk_cache = DiskCache(get_cache_dir() / "pages", DISK_CACHE_BYTES)
+    server = PageServer(pdf_path, max_renders=args.max_renders,
+                        cache_bytes=args.cache_mb * 2**20, pack=pack, disk_cache=disk_cache)
+    if pack is not None and pack.page_count != server.page_count:
+        pack.close()
+        server.pack = None
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 تم إيقاف الخادم", file=sys.stderr)
+    except OSError as e:
+        print(f"❌ تعذر تشغيل الخادم: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if server.pack is not None:
+            server.pack.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+فهرس لوحة الانتقال السريع: البحث التقريبي في أسماء السور (عربي ولاتيني)
+والأجزاء وأرقام الصفحات ومراجع الآيات والإشارات المرجعية
+"""
+
+import re
+from collections import Counter, defaultdict
+from typing import Iterable, List, NamedTuple, Set
+
+from config import SURAH_NAMES_LATIN
+from page_meta import PageMetadata
+from utils import arabic_to_english_numbers, normalize_arabic_text
+
+# ترتيب الأنواع عند تساوي الدرجات
+KIND_ORDER = {"ayah": 0, "surah": 1, "bookmark": 2, "juz": 3, "page": 4}
+
+_SEPARATORS_RE = re.compile(r"[\s'`\-_]+")
+_AYAH_REF_RE = re.compile(r"(\d+)\s*[:.،,/ ]\s*(\d+)")
+
+
+class PaletteEntry(NamedTuple):
+    """نتيجة في لوحة الانتقال"""
+    title: str
+    subtitle: str
+    page_idx: int
+    kind: str
+
+
+def normalize_query(text: str) -> str:
+    """توحيد نص البحث: الأرقام والتشكيل والألف والفواصل"""
+    text = normalize_arabic_text(arabic_to_english_numbers(text))
+    return _SEPARATORS_RE.sub(" ", text).strip()
+
+
+def _grams(text: str) -> Set[str]:
+    """الثنائيات الحرفية للنص مع حدود الكلمة"""
+    padded = f" {text} "
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class PaletteIndex:
+    """
+    فهرس ثنائيات حرفية مبني مسبقاً للعناصر الثابتة
+
+    أرقام الصفحات ومراجع الآيات (مثل 2:255) تُحلل مباشرة من نص البحث
+    دون فهرسة
+    """
+
+    def __init__(self, meta: PageMetadata, bookmarks: Iterable[int] = ()):
+        self.meta = meta
+        self.entries = []
+        self._keys = []
+        self._postings = defaultdict(set)
+
+        for index, (num, name, page) in enumerate(meta.surahs):
+            latin = SURAH_NAMES_LATIN[index] if index < len(SURAH_NAMES_LATIN) else ""
+            subtitle = f"{latin} · الصفحة {page}" if latin else f"الصفحة {page}"
+            title = f"سورة {name}" if num <= len(meta.verses) else name
+            self._add(PaletteEntry(title, subtitle, page - 1, "surah"), [name, latin, str(num)])
+        for juz in range(1, len(meta.hizb_starts) // 2 + 1):
+            start, _ = meta.juz_range(juz)
+            surah, ayah, _ = meta.hizb_starts[(juz - 1) * 2]
+            self._add(PaletteEntry(f"الجزء {juz}", f"يبدأ من {surah}:{ayah} · الصفحة {start + 1}",
+                                   start, "juz"),
+                      [f"الجزء {juz}", f"جزء {juz}", f"juz {juz}"])
+        for page_idx in bookmarks:
+            if not 0 <= page_idx < meta.page_count:
+                continue
+            info = meta.page(page_idx)
+            subtitle = f"سورة {info.surah_name}" if info.surah_index >= 0 else ""
+            self._add(PaletteEntry(f"إشارة مرجعية: الصفحة {page_idx + 1}", subtitle,
+                                   page_idx, "bookmark"),
+                      ["اشاره", "bookmark", info.surah_name])
+
+    def _add(self, entry: PaletteEntry, keys: List[str]):
+        entry_id = len(self.entries)
+        keys = [normalize_query(k) for k in keys if k]
+        self.entries.append(entry)
+        self._keys.append(keys)
+        for key in keys:
+            for gram in _grams(key):
+                self._postings[gram].add(entry_id)
+
+    def search(self, query: str, limit: int = 20) -> List[PaletteEntry]:
+        """
+        البحث وترتيب النتائج حسب جودة المطابقة
+
+        Args:
+            query: نص البحث
+            limit: أقصى عدد للنتائج
+
+        Returns:
+            النتائج مرتبة
+        """
+        q = normalize_query(query)
+        if not q:
+            return self.entries[:limit]
+
+        scored = []
+        ref = _AYAH_REF_RE.fullmatch(q)
+        if ref:
+            surah, ayah = int(ref.group(1)), int(ref.group(2))
+            if 1 <= surah <= len(self.meta.verses):
+                ayah = min(max(ayah, 1), self.meta.verses[surah - 1])
+                name = self.meta.surahs[surah - 1][1]
+                page_idx = self.meta.ayah_page(surah, ayah)
+                scored.append((200, PaletteEntry(f"سورة {name} - الآية {ayah}",
+                                                 f"الصفحة {page_idx + 1}", page_idx, "ayah")))
+        elif q.isdigit() and 1 <= int(q) <= self.meta.page_count:
+            page_idx = int(q) - 1
+            info = self.meta.page(page_idx)
+            subtitle = f"سورة {info.surah_name}" if info.surah_index >= 0 else ""
+            scored.append((90, PaletteEntry(f"الصفحة {q}", subtitle, page_idx, "page")))
+
+        query_grams = _grams(q)
+        counts = Counter()
+        for gram in query_grams:
+            counts.update(self._postings.get(gram, ()))
+        for entry_id, shared in counts.items():
+            score = self._score(q, self._keys[entry_id], shared / len(query_grams))
+            if score:
+                scored.append((score, self.entries[entry_id]))
+
+        scored.sort(key=lambda item: (-item[0], KIND_ORDER[item[1].kind], item[1].page_idx))
+        return [entry for _, entry in scored[:limit]]
+
+    @staticmethod
+    def _score(q: str, keys: List[str], overlap: float) -> float:
+        best = 0.0
+        for key in keys:
+            if key == q:
+                return 100.0
+            if key.startswith(q):
+                best = max(best, 80.0)
+            elif any(word.startswith(q) for word in key.split()):
+                best = max(best, 60.0)
+            elif q in key:
+                best = max(best, 40.0)
+        if best:
+            return best + overlap
+        # مطابقة تقريبية (أخطاء إملائية) إذا اشتركت معظم الثنائيات، ولا معنى لها مع الأرقام
+        if q.isdigit() or overlap < 0.6:
+            return 0.0
+        return overlap * 30.0
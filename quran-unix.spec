@@ -1,11 +1,15 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+
+# حزمة الصفحات المرسومة مسبقاً تُضاف إن بُنيت (make pack)
+pack_datas = [('pages.qpack', '.')] if os.path.exists('pages.qpack') else []
 
 
 a = Analysis(
     ['src/main.py'],
     pathex=[],
     binaries=[],
-    datas=[('MushafMadinaHafsGreen1441HQ.pdf', '.')],
+    datas=[('MushafMadinaHafsGreen1441HQ.pdf', '.')] + pack_datas,
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
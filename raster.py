@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+الصورة النقطية الخام وصيغة ضغطها للتخزين الدائم
+"""
+
+import struct
+import zlib
+from typing import NamedTuple
+
+# رأس الصيغة: التوقيع، الإصدار، العرض، الارتفاع، طول السطر، قناة الشفافية
+_HEADER = struct.Struct("<4sBIIIB")
+_MAGIC = b"QURR"
+_VERSION = 1
+
+
+class Raster(NamedTuple):
+    """صورة نقطية خام (RGB أو RGBA) ناتجة عن MuPDF"""
+    width: int
+    height: int
+    stride: int
+    alpha: bool
+    samples: bytes
+
+
+def encode_raster(raster: Raster, level: int = 6) -> bytes:
+    """
+    ضغط صورة نقطية إلى صيغة مدمجة
+
+    Args:
+        raster: الصورة النقطية
+        level: مستوى ضغط zlib
+
+    Returns:
+        البيانات المضغوطة
+    """
+    header = _HEADER.pack(_MAGIC, _VERSION, raster.width, raster.height,
+                          raster.stride, int(raster.alpha))
+    return header + zlib.compress(raster.samples, level)
+
+
+def decode_raster(data) -> Raster:
+    """
+    فك ضغط صورة نقطية
+
+    Args:
+        data: البيانات المضغوطة (bytes أو memoryview)
+
+    Returns:
+        الصورة النقطية
+
+    Raises:
+        ValueError: إذا كانت البيانات تالفة أو بصيغة غير معروفة
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("بيانات الصورة ناقصة")
+    magic, version, width, height, stride, alpha = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("صيغة الصورة غير معروفة")
+    try:
+        samples = zlib.decompress(data[_HEADER.size:])
+    except zlib.error as e:
+        raise ValueError(f"بيانات الصورة تالفة: {e}")
+    if len(samples) != stride * height:
+        raise ValueError("حجم بيانات الصورة غير متطابق")
+    return Raster(width, height, stride, bool(alpha), samples)
+
+
+def encode_png(raster: Raster, level: int = 6) -> bytes:
+    """
+    ترميز صورة نقطية بصيغة PNG دون مكتبات إضافية
+
+    Args:
+        raster: الصورة النقطية
+        level: مستوى ضغط zlib
+
+    Returns:
+        بيانات ملف PNG
+    """
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    row_bytes = raster.width * (4 if raster.alpha else 3)
+    # كل سطر يبدأ ببايت المرشح 0 (دون ترشيح)
+    rows = b"".join(b"\x00" + raster.samples[start:start + row_bytes]
+                    for start in range(0, raster.height * raster.stride, raster.stride))
+    header = struct.pack(">IIBBBBB", raster.width, raster.height, 8,
+                         6 if raster.alpha else 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(rows, level)) + chunk(b"IEND", b""))
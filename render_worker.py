@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+عمال الرسم في الخلفية: رسم صفحات المصحف خارج خيط الواجهة
+وجلب الصفحات المجاورة مسبقاً
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Optional, Tuple
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from PyQt6.QtGui import QImage
+
+import tracing
+from config import PREFETCH_PAGES, RENDER_WORKERS, TILE_SIZE
+from recolor import recolor
+from renderer import load_raster, open_document, render_raster, tile_clip
+from utils import pdf_fingerprint
+
+# مفتاح الرسم: (فهرس الصفحة، معامل الرسم، نمط الألوان)
+# ومفتاح البلاطة يضيف إليه (العمود، الصف)
+RenderKey = Tuple
+
+
+class RenderQueue:
+    """طابور مهام رسم مشترك بين العمال، مرتب حسب الأولوية ومن دون تكرار"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []
+        self._pending = {}
+        self._counter = itertools.count()
+        self._closed = False
+
+    def push(self, key: RenderKey, priority: int = 0):
+        """إضافة مهمة (أو رفع أولويتها إن كانت موجودة)"""
+        with self._cond:
+            if self._closed:
+                return
+            current = self._pending.get(key)
+            if current is not None and current <= priority:
+                return
+            self._pending[key] = priority
+            heapq.heappush(self._heap, (priority, next(self._counter), key))
+            self._cond.notify()
+
+    def take(self) -> Optional[RenderKey]:
+        """سحب المهمة الأعلى أولوية، أو None عند الإغلاق"""
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                while self._heap:
+                    priority, _, key = heapq.heappop(self._heap)
+                    # تجاهل النسخ القديمة من مهمة رُفعت أولويتها لاحقاً
+                    if self._pending.get(key) == priority:
+                        del self._pending[key]
+                        return key
+                self._cond.wait()
+
+    def cancel(self, predicate) -> int:
+        """
+        إلغاء المهام المنتظرة التي تحقق الشرط
+
+        المهام قيد التنفيذ لا يمكن مقاطعتها وتُتجاهل نتائجها عند الوصول
+
+        Args:
+            predicate: دالة تُرجع True للمفاتيح المراد إلغاؤها
+
+        Returns:
+            عدد المهام الملغاة
+        """
+        with self._cond:
+            stale = [key for key in self._pending if predicate(key)]
+            for key in stale:
+                del self._pending[key]
+            if stale:
+                self._heap = [entry for entry in self._heap if entry[2] in self._pending]
+                heapq.heapify(self._heap)
+            return len(stale)
+
+    def close(self):
+        """إغلاق الطابور وإيقاظ جميع العمال"""
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            self._pending.clear()
+            self._cond.notify_all()
+
+
+class RenderWorker(QThread):
+    """عامل رسم يعمل في خيط مستقل بنسخته الخاصة من ملف الـ PDF"""
+    rendered = pyqtSignal(object, QImage)
+    failed = pyqtSignal(object, str)
+
+    def __init__(self, pdf_path: str, jobs: RenderQueue, disk_cache=None,
+                 fingerprint: str = "", pack=None, parent=None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+        self.jobs = jobs
+        self.disk_cache = disk_cache
+        self.fingerprint = fingerprint
+        self.pack = pack
+        self._document = None
+
+    def run(self):
+        # اسم الخيط كما يظهر في ملفات القياس
+        threading.current_thread().name = "RenderWorker"
+        try:
+            while True:
+                key = self.jobs.take()
+                if key is None:
+                    break
+                try:
+                    image = self._render(key)
+                except Exception as e:
+                    self.failed.emit(key, str(e))
+                    continue
+                self.rendered.emit(key, image)
+        finally:
+            if self._document is not None:
+                self._document.close()
+
+    def document(self):
+        """مستند العامل، يُفتح عند أول صفحة غير موجودة في حزمة الصفحات"""
+        if self._document is None:
+            self._document = open_document(self.pdf_path)
+        return self._document
+
+    def _render(self, key: RenderKey) -> QImage:
+        page_idx, scale, variant = key[:3]
+        if len(key) > 3:
+            # البلاطات تُخزن في الذاكرة فقط
+            raster = render_raster(self.document(), page_idx, scale,
+                                   tile_clip(key[3], scale, TILE_SIZE))
+        else:
+            if self.disk_cache is not None and not self.fingerprint:
+                # البصمة تقرأ من الملف فتُحسب في خيط العامل لا في خيط الواجهة
+                self.fingerprint = pdf_fingerprint(self.pdf_path)
+            raster = load_raster(self.document, page_idx, scale, self.pack,
+                                 self.disk_cache, self.fingerprint)
+        with tracing.span("recolor", variant=variant):
+            raster = recolor(raster, variant)
+        fmt = QImage.Format.Format_RGBA8888 if raster.alpha else QImage.Format.Format_RGB888
+        with tracing.span("QImage"):
+            # النسخ ضروري لأن ذاكرة العينات لا تعود إلى QImage
+            return QImage(raster.samples, raster.width, raster.height, raster.stride, fmt).copy()
+
+
+class ThumbnailWorker(QThread):
+    """عامل رسم الصور المصغرة في الأطلس، صفحة لكل مهمة والأقرب للظهور أولاً"""
+    thumbnail_ready = pyqtSignal(int)
+
+    def __init__(self, pdf_path: str, atlas, parent=None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+        self.atlas = atlas
+        self.jobs = RenderQueue()
+
+    def request(self, page_idx: int, priority: int = 0):
+        """طلب صورة مصغرة إن لم تكن في الأطلس"""
+        if page_idx not in self.atlas:
+            self.jobs.push(page_idx, priority)
+
+    def retain(self, pages) -> int:
+        """إلغاء الطلبات المنتظرة لغير الصفحات المحددة (الخلايا التي خرجت من العرض)"""
+        pages = set(pages)
+        return self.jobs.cancel(lambda page_idx: page_idx not in pages)
+
+    def run(self):
+        threading.current_thread().name = "ThumbnailWorker"
+        document = open_document(self.pdf_path)
+        try:
+            while True:
+                page_idx = self.jobs.take()
+                if page_idx is None:
+                    break
+                if page_idx in self.atlas:
+                    continue
+                try:
+                    scale = self.atlas.thumb_width / document[page_idx].rect.width
+                    with tracing.span("thumbnail", page=page_idx):
+                        self.atlas.put(page_idx, render_raster(document, page_idx, scale))
+                except Exception:
+                    # صفحة تالفة: تبقى خليتها فارغة
+                    continue
+                self.thumbnail_ready.emit(page_idx)
+        finally:
+            document.close()
+
+    def stop(self):
+        """إيقاف العامل وانتظار انتهائه"""
+        self.jobs.close()
+        self.wait()
+
+
+class RenderPool(QObject):
+    """مجموعة عمال الرسم مع طابور مهام مشترك"""
+    page_rendered = pyqtSignal(object, QImage)
+    render_failed = pyqtSignal(object, str)
+
+    def __init__(self, pdf_path: str, workers: int = RENDER_WORKERS, disk_cache=None,
+                 pack=None, parent=None):
+        super().__init__(parent)
+        self.jobs = RenderQueue()
+        self.workers = []
+        self.pack = pack
+        for _ in range(max(1, workers)):
+            worker = RenderWorker(pdf_path, self.jobs, disk_cache, pack=pack)
+            worker.rendered.connect(self.page_rendered)
+            worker.failed.connect(self.render_failed)
+            worker.start()
+            self.workers.append(worker)
+
+    def request(self, key: RenderKey, priority: int = 0):
+        """طلب رسم صفحة (الأولوية 0 للصفحة المعروضة حالياً)"""
+        self.jobs.push(key, priority)
+
+    def cancel(self, predicate) -> int:
+        """إلغاء طلبات الرسم المنتظرة التي تحقق الشرط"""
+        return self.jobs.cancel(predicate)
+
+    def prefetch(self, page_idx: int, page_count: int, scale: float, variant: str,
+                 radius: int = PREFETCH_PAGES, skip=None):
+        """
+        جلب الصفحات المجاورة مسبقاً في الاتجاهين
+
+        Args:
+            page_idx: الصفحة الحالية
+            page_count: عدد صفحات المستند
+            scale: معامل الرسم
+            variant: نمط الألوان
+            radius: عدد الصفحات في كل اتجاه
+            skip: دالة تُرجع True للمفاتيح الجاهزة مسبقاً
+        """
+        for distance in range(1, radius + 1):
+            for idx in (page_idx + distance, page_idx - distance):
+                if 0 <= idx < page_count:
+                    key = (idx, scale, variant)
+                    if skip is None or not skip(key):
+                        self.request(key, priority=distance)
+
+    def prefetch_spreads(self, spreads, scale: float, variant: str, skip=None):
+        """
+        جلب أزواج صفحات العرض المزدوج مسبقاً، كل زوج بأولوية واحدة فيُرسم معاً
+
+        Args:
+            spreads: أزواج الصفحات مرتبة من الأقرب إلى الأبعد
+            scale: معامل الرسم
+            variant: نمط الألوان
+            skip: دالة تُرجع True للمفاتيح الجاهزة مسبقاً
+        """
+        for distance, pages in enumerate(spreads, 1):
+            for idx in pages:
+                key = (idx, scale, variant)
+                if skip is None or not skip(key):
+                    self.request(key, priority=distance)
+
+    def shutdown(self):
+        """إيقاف جميع العمال وانتظار انتهائهم"""
+        self.jobs.close()
+        for worker in self.workers:
+            worker.wait()
+        self.workers.clear()
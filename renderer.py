@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+دوال رسم صفحات المصحف إلى صور نقطية خام دون الاعتماد على Qt
+"""
+
+from typing import Callable, Optional
+
+import fitz  # PyMuPDF
+
+import tracing
+from config import RENDER_SCALE
+from disk_cache import page_entry_name
+from raster import Raster, decode_raster, encode_raster
+
+
+def open_document(pdf_path: str):
+    """
+    فتح ملف PDF في نسخة مستقلة
+
+    كل عامل رسم يفتح نسخته الخاصة لأن كائنات fitz لا تُشارك بين الخيوط
+
+    Args:
+        pdf_path: مسار ملف الـ PDF
+
+    Returns:
+        كائن المستند
+    """
+    return fitz.open(pdf_path)
+
+
+def render_raster(document, page_idx: int, scale: float = RENDER_SCALE,
+                  clip: Optional[fitz.Rect] = None) -> Raster:
+    """
+    رسم صفحة (أو جزء منها) إلى صورة نقطية
+
+    Args:
+        document: مستند fitz مفتوح
+        page_idx: فهرس الصفحة (يبدأ من 0)
+        scale: معامل الرسم
+        clip: مستطيل القص بإحداثيات الصفحة (اختياري)
+
+    Returns:
+        الصورة النقطية الخام
+    """
+    with tracing.span("get_pixmap", page=page_idx, scale=scale, tile=clip is not None):
+        page = document[page_idx]
+        pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), clip=clip, alpha=False)
+    return Raster(pix.width, pix.height, pix.stride, bool(pix.alpha), pix.samples)
+
+
+def load_raster(document: Callable, page_idx: int, scale: float, pack=None,
+                disk_cache=None, fingerprint: str = "") -> Raster:
+    """
+    الصفحة كاملة بالألوان الأصلية من أسرع مصدر متاح: حزمة الصفحات، ثم التخزين
+    الدائم، ثم الرسم بـ MuPDF (مع حفظ النتيجة في التخزين الدائم)
+
+    Args:
+        document: دالة تُرجع المستند (يُفتح عند أول صفحة تحتاج إلى الرسم فقط)
+        page_idx: فهرس الصفحة
+        scale: معامل الرسم
+        pack: حزمة الصفحات المرسومة مسبقاً (اختيارية)
+        disk_cache: التخزين الدائم (اختياري)
+        fingerprint: بصمة ملف الـ PDF (لأسماء ملفات التخزين الدائم)
+
+    Returns:
+        الصورة النقطية
+    """
+    if pack is not None:
+        with tracing.span("pack_read", page=page_idx):
+            raster = pack.get(page_idx, scale)
+        tracing.count("pack.hit" if raster is not None else "pack.miss")
+        if raster is not None:
+            return raster
+    if disk_cache is None:
+        return render_raster(document(), page_idx, scale)
+
+    name = page_entry_name(fingerprint, page_idx, scale)
+    data = disk_cache.get(name)
+    if data is not None:
+        try:
+            with tracing.span("decode_raster", page=page_idx):
+                raster = decode_raster(data)
+            tracing.count("disk_cache.hit")
+            return raster
+        except ValueError:
+            pass
+    tracing.count("disk_cache.miss")
+    raster = render_raster(document(), page_idx, scale)
+    with tracing.span("encode_raster", page=page_idx):
+        disk_cache.put(name, encode_raster(raster))
+    return raster
+
+
+def tile_clip(tile, scale: float, tile_size: int) -> fitz.Rect:
+    """
+    مستطيل البلاطة بإحداثيات الصفحة
+
+    Args:
+        tile: (العمود، الصف) للبلاطة
+        scale: معامل الرسم
+        tile_size: طول ضلع البلاطة بالبكسل
+
+    Returns:
+        مستطيل القص
+    """
+    tx, ty = tile
+    size = tile_size / scale
+    return fitz.Rect(tx * size, ty * size, (tx + 1) * size, (ty + 1) * size)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+فهرس البحث في نص المصحف: فهرس مقلوب للكلمات الموحدة ومواضعها في الصفحات
+"""
+
+import bisect
+import gzip
+import json
+import re
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from utils import atomic_write, get_cache_dir, normalize_arabic_text
+
+# إصدار صيغة الملف المحفوظ (يُرفع عند تغيير طريقة التوحيد أو البنية)
+INDEX_VERSION = 1
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class SearchHit(NamedTuple):
+    """نتيجة بحث: الصفحة وموضع أول كلمة وعدد الكلمات"""
+    page: int
+    position: int
+    length: int
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    تقسيم النص إلى كلمات موحدة
+
+    Args:
+        text: النص
+
+    Returns:
+        قائمة الكلمات بعد التوحيد
+    """
+    return _WORD_RE.findall(normalize_arabic_text(text))
+
+
+def index_path(fingerprint: str) -> Path:
+    """مسار ملف الفهرس المحفوظ بجوار تخزين الصفحات المرسومة"""
+    return get_cache_dir() / "search" / f"{fingerprint}.json.gz"
+
+
+class SearchIndex:
+    """
+    فهرس مقلوب: لكل كلمة موحدة قائمة (الصفحة، الموضع) مرتبة
+
+    الموضع هو ترتيب الكلمة داخل الصفحة، ويُحفظ معه مستطيل كل كلمة
+    لإبراز النتائج على الصفحة
+    """
+
+    def __init__(self, fingerprint: str = ""):
+        self.fingerprint = fingerprint
+        self.postings = {}
+        self.boxes = {}
+        self._vocabulary = None
+
+    def add_page(self, page_idx: int, words: Iterable[str],
+                 boxes: Optional[Sequence[Tuple[float, float, float, float]]] = None):
+        """
+        إضافة كلمات صفحة إلى الفهرس (يجب إضافة الصفحات بالترتيب)
+
+        Args:
+            page_idx: فهرس الصفحة
+            words: كلمات الصفحة بترتيبها
+            boxes: مستطيل كل كلمة بإحداثيات الصفحة (اختياري)
+        """
+        position = 0
+        page_boxes = []
+        for i, word in enumerate(words):
+            for token in tokenize(word):
+                self.postings.setdefault(token, []).append((page_idx, position))
+                if boxes is not None:
+                    page_boxes.append(tuple(round(v, 1) for v in boxes[i]))
+                position += 1
+        if page_boxes:
+            self.boxes[page_idx] = page_boxes
+        self._vocabulary = None
+
+    def merge(self, other: "SearchIndex"):
+        """دمج فهرس جزئي لصفحات لاحقة (يُستخدم عند بناء الفهرس على أجزاء)"""
+        for token, hits in other.postings.items():
+            self.postings.setdefault(token, []).extend(hits)
+        self.boxes.update(other.boxes)
+        self._vocabulary = None
+
+    def lookup(self, token: str, prefix: bool = False) -> List[Tuple[int, int]]:
+        """
+        مواضع كلمة موحدة
+
+        Args:
+            token: الكلمة بعد التوحيد
+            prefix: مطابقة كل الكلمات التي تبدأ بها
+
+        Returns:
+            قائمة (الصفحة، الموضع) مرتبة
+        """
+        if not prefix:
+            return self.postings.get(token, [])
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, token)
+        hits = []
+        for word in self._vocabulary[start:]:
+            if not word.startswith(token):
+                break
+            hits.extend(self.postings[word])
+        hits.sort()
+        return hits
+
+    def search(self, query: str, prefix: bool = True, limit: Optional[int] = None) -> List[SearchHit]:
+        """
+        البحث عن كلمة أو عبارة
+
+        الكلمات تُطابق كاملة، والكلمة الأخيرة من الاستعلام تُطابق كبادئة
+        ما لم يُطلب غير ذلك
+
+        Args:
+            query: نص البحث
+            prefix: مطابقة آخر كلمة كبادئة
+            limit: أقصى عدد للنتائج
+
+        Returns:
+            النتائج مرتبة حسب الصفحة والموضع
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        last = len(tokens) - 1
+        candidates = set(self.lookup(tokens[0], prefix and last == 0))
+        for offset, token in enumerate(tokens[1:], start=1):
+            if not candidates:
+                break
+            following = self.lookup(token, prefix and offset == last)
+            candidates &= {(page, pos - offset) for page, pos in following}
+        hits = [SearchHit(page, pos, len(tokens)) for page, pos in sorted(candidates)]
+        return hits[:limit] if limit is not None else hits
+
+    def hit_boxes(self, hit: SearchHit) -> List[Tuple[float, float, float, float]]:
+        """مستطيلات كلمات نتيجة بحث بإحداثيات الصفحة"""
+        page_boxes = self.boxes.get(hit.page, [])
+        return page_boxes[hit.position:hit.position + hit.length]
+
+    def save(self, path: Path):
+        """حفظ الفهرس مضغوطاً"""
+        data = {
+            "version": INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            # المواضع تُحفظ مسطحة [صفحة، موضع، صفحة، موضع...] لتصغير الملف
+            "postings": {
+                token: [value for hit in hits for value in hit]
+                for token, hits in self.postings.items()
+            },
+            "boxes": {str(page): boxes for page, boxes in self.boxes.items()},
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, gzip.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"), 6),
+                     sync=False)
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> Optional["SearchIndex"]:
+        """
+        تحميل فهرس محفوظ
+
+        Args:
+            path: مسار الملف
+            fingerprint: بصمة ملف الـ PDF الحالي
+
+        Returns:
+            الفهرس أو None إذا لم يوجد أو كان قديماً أو لملف آخر
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError, EOFError):
+            return None
+        if data.get("version") != INDEX_VERSION or data.get("fingerprint") != fingerprint:
+            return None
+        index = cls(fingerprint)
+        index.postings = {
+            token: list(zip(flat[0::2], flat[1::2]))
+            for token, flat in data["postings"].items()
+        }
+        index.boxes = {int(page): [tuple(box) for box in boxes]
+                       for page, boxes in data["boxes"].items()}
+        return index
+
+
+def extract_page_words(page) -> Tuple[List[str], List[Tuple[float, float, float, float]]]:
+    """
+    استخراج كلمات صفحة fitz ومستطيلاتها بترتيب القراءة
+
+    الأسطر بترتيبها في الصفحة، والكلمات داخل السطر من اليمين إلى اليسار
+
+    Args:
+        page: صفحة fitz
+
+    Returns:
+        (الكلمات، المستطيلات)
+    """
+    words = page.get_text("words")
+    words.sort(key=lambda w: (w[5], w[6], -w[0]))
+    return [w[4] for w in words], [tuple(w[:4]) for w in words]
+
+
+def build_index(document, fingerprint: str, progress=None) -> SearchIndex:
+    """
+    بناء الفهرس من جميع صفحات المستند
+
+    Args:
+        document: مستند fitz مفتوح
+        fingerprint: بصمة ملف الـ PDF
+        progress: دالة تُستدعى بعد كل صفحة (المنجز، الإجمالي)
+
+    Returns:
+        الفهرس
+    """
+    index = SearchIndex(fingerprint)
+    total = len(document)
+    for page_idx in range(total):
+        words, boxes = extract_page_words(document[page_idx])
+        index.add_page(page_idx, words, boxes)
+        if progress is not None:
+            progress(page_idx + 1, total)
+    return index
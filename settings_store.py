@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+مخزن الإعدادات: تجميع التغييرات وحفظها بشكل ذري في الخلفية
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import DEFAULT_SETTINGS
+from utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class SettingsStore:
+    """
+    إعدادات التطبيق في الذاكرة مع حفظ مؤجل إلى ملف JSON
+
+    التحديث لا يلمس القرص؛ الحفظ يتم في خيط مؤقت بعد فترة هدوء
+    وعند الإغلاق، بالكتابة في ملف مؤقت ثم إعادة تسميته
+    """
+
+    def __init__(self, path: Path, defaults: Optional[Dict[str, Any]] = None,
+                 delay: float = 1.0):
+        self.path = Path(path)
+        self.delay = delay
+        self._values = dict(DEFAULT_SETTINGS if defaults is None else defaults)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer = None
+        self._dirty = False
+
+    def load(self) -> Dict[str, Any]:
+        """
+        قراءة الإعدادات من الملف ودمجها مع القيم الافتراضية
+
+        Returns:
+            نسخة من الإعدادات الحالية
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            stored = {}
+        except (OSError, ValueError) as e:
+            logger.warning("تعذرت قراءة الإعدادات من %s: %s", self.path, e)
+            stored = {}
+        with self._lock:
+            if isinstance(stored, dict):
+                self._values.update(stored)
+            return dict(self._values)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """قراءة قيمة إعداد"""
+        with self._lock:
+            return self._values.get(key, default)
+
+    def update(self, **changes):
+        """
+        تعديل إعداد أو أكثر وجدولة الحفظ
+
+        لا يُجدول الحفظ إذا لم تتغير أي قيمة
+        """
+        with self._lock:
+            changed = {k: v for k, v in changes.items() if self._values.get(k) != v}
+            if not changed:
+                return
+            self._values.update(changed)
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> bool:
+        """
+        حفظ الإعدادات فوراً إذا تغيرت
+
+        Returns:
+            False إذا فشل الحفظ
+        """
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return True
+                snapshot = dict(self._values)
+                self._dirty = False
+            data = json.dumps(snapshot, ensure_ascii=False, indent=2).encode("utf-8")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write(self.path, data)
+            except OSError as e:
+                logger.warning("تعذر حفظ الإعدادات في %s: %s", self.path, e)
+                with self._lock:
+                    self._dirty = True
+                return False
+            return True
+
+    def close(self) -> bool:
+        """إلغاء الحفظ المجدول والحفظ فوراً (عند إغلاق التطبيق)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return self.flush()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+مراقبة توقف خيط الواجهة: نبضة دورية من حلقة أحداث Qt وخيط مراقب يلتقط
+مكدس الخيط الرئيسي إذا تأخرت النبضة، مع مدرج تكراري لتأخر حلقة الأحداث
+"""
+
+import bisect
+import json
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import tracing
+from utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# حدود فئات المدرج بالمللي ثانية (الفئة الأخيرة لكل ما يتجاوزها)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+# عدد حالات التوقف المحفوظة بتفاصيلها
+MAX_STALL_RECORDS = 20
+
+
+class LatencyHistogram:
+    """مدرج تكراري لأزمنة التأخر بفئات ثابتة"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.max_ms = 0.0
+        self.sum_ms = 0.0
+
+    def add(self, ms: float):
+        """تسجيل قيمة"""
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        الحد الأعلى للفئة التي يقع فيها المئين المطلوب
+
+        Args:
+            fraction: النسبة (مثل 0.99)
+
+        Returns:
+            القيمة بالمللي ثانية (أو أكبر قيمة سُجلت للفئة الأخيرة)
+        """
+        if not self.total:
+            return 0.0
+        rank = fraction * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(float(self.bounds[index]), self.max_ms) if index < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "buckets_ms": dict(zip(labels, self.counts)),
+            "count": self.total,
+            "mean_ms": round(self.sum_ms / self.total, 3) if self.total else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class StallWatchdog:
+    """
+    خيط مراقب لتوقف حلقة الأحداث
+
+    الخيط الرئيسي يستدعي beat() من مؤقت كل interval_ms، وإذا تأخرت النبضة
+    أكثر من threshold_ms يُسجل مكدس الخيط الرئيسي مع حالة التطبيق
+    """
+
+    def __init__(self, threshold_ms: float = 250, interval_ms: float = 100,
+                 context: Optional[Callable[[], Dict]] = None):
+        """
+        Args:
+            threshold_ms: مدة التوقف التي تُعتبر تعليقاً
+            interval_ms: الفترة بين النبضات
+            context: دالة تُرجع حالة التطبيق (الصفحة والتكبير...) تُسجل مع كل توقف،
+                وتُستدعى من خيط المراقبة فيجب ألا تستدعي دوال Qt
+        """
+        self.threshold = threshold_ms / 1000.0
+        self.interval = interval_ms / 1000.0
+        self.context = context
+        self.histogram = LatencyHistogram()
+        self.stalls = deque(maxlen=MAX_STALL_RECORDS)
+        self.stall_count = 0
+        self._last_beat = None
+        self._reported = None
+        self._main_ident = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """بدء المراقبة (يُستدعى من الخيط المراد مراقبته)"""
+        self._main_ident = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="StallWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """إيقاف خيط المراقبة"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def beat(self):
+        """نبضة من الخيط الرئيسي، وتأخرها عن موعدها هو تأخر حلقة الأحداث"""
+        now = time.perf_counter()
+        last = self._last_beat
+        self._last_beat = now
+        if last is None:
+            return
+        with self._lock:
+            self.histogram.add(max(0.0, (now - last - self.interval) * 1000))
+            if self._reported is not None:
+                # انتهاء توقف سبق تسجيله: تحديث مدته الفعلية
+                record = self._reported
+                record["duration_ms"] = round((now - record["_started"]) * 1000, 1)
+                self._reported = None
+                logger.warning("انتهى توقف الواجهة بعد %.0f مللي ثانية", record["duration_ms"])
+                tracing.instant("stall_end", ms=record["duration_ms"])
+
+    def _run(self):
+        poll = min(self.threshold, self.interval) / 2
+        while not self._stop.wait(poll):
+            last = self._last_beat
+            overdue = time.perf_counter() - last - self.interval
+            if overdue < self.threshold or self._reported is not None:
+                continue
+            self._report(last + self.interval, overdue)
+
+    def _report(self, started: float, overdue: float):
+        frame = sys._current_frames().get(self._main_ident)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        try:
+            context = self.context() if self.context is not None else {}
+        except Exception as e:
+            context = {"error": str(e)}
+        record = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "duration_ms": round(overdue * 1000, 1),
+            "context": context,
+            "stack": stack,
+            "_started": started,
+        }
+        with self._lock:
+            if self._last_beat + self.interval > started:
+                # وصلت النبضة أثناء التقاط المكدس
+                return
+            self.stalls.append(record)
+            self.stall_count += 1
+            self._reported = record
+        logger.warning("توقفت الواجهة أكثر من %.0f مللي ثانية %s\n%s",
+                       overdue * 1000, context, stack)
+        tracing.instant("stall", ms=record["duration_ms"], **context)
+
+    def report(self) -> dict:
+        """ملخص المدرج وآخر حالات التوقف"""
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold * 1000,
+                "interval_ms": self.interval * 1000,
+                "latency": self.histogram.to_dict(),
+                "stall_count": self.stall_count,
+                "stalls": [{k: v for k, v in record.items() if not k.startswith("_")}
+                           for record in self.stalls],
+            }
+
+    def dump(self, path) -> Path:
+        """حفظ الملخص في ملف JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(self.report(), ensure_ascii=False, indent=2).encode("utf-8")
+        atomic_write(path, data, sync=False)
+        return path
@@ -48,6 +48,695 @@ def test_pdf_exists():
     print("⚠ ملف PDF غير موجود - ستحتاج إلى وضعه يدوياً")
     return True  # لا نعتبر هذا خطأً
 
+def test_page_cache():
+    """اختبار ذاكرة الصفحات المرسومة"""
+    from page_cache import PageCache
+    cache = PageCache(max_bytes=100)
+    cache.put((0, 2.0, "light"), "a", 40)
+    cache.put((1, 2.0, "light"), "b", 40)
+    assert cache.get((0, 2.0, "light")) == "a"
+    cache.put((2, 2.0, "light"), "c", 40)
+    assert (1, 2.0, "light") not in cache, "يجب طرد الأقدم استخداماً"
+    assert cache.get((1, 2.0, "light")) is None
+    cache.put((3, 2.0, "dark"), "d", 500)
+    assert (3, 2.0, "dark") not in cache, "لا تُخزن العناصر الأكبر من الميزانية"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+    assert stats["bytes"] == 80
+    print("✓ ذاكرة الصفحات تعمل بشكل صحيح")
+    return True
+
+def test_disk_cache():
+    """اختبار التخزين الدائم وصيغة ضغط الصور"""
+    import tempfile
+    from disk_cache import DiskCache, page_entry_name
+    from raster import Raster, encode_raster, decode_raster
+    from utils import pdf_fingerprint
+
+    raster = Raster(4, 2, 12, False, bytes(range(24)))
+    assert decode_raster(encode_raster(raster)) == raster
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, "test.pdf")
+        with open(pdf, "wb") as f:
+            f.write(b"%PDF-1.4" + b"x" * 200000)
+        fingerprint = pdf_fingerprint(pdf)
+        assert fingerprint == pdf_fingerprint(pdf)
+
+        cache = DiskCache(os.path.join(tmp, "pages"), max_bytes=250)
+        first = page_entry_name(fingerprint, 0, 2.0)
+        second = page_entry_name(fingerprint, 1, 2.0)
+        cache.put(first, b"a" * 100)
+        cache.put(second, b"b" * 100)
+        os.utime(cache.path_for(first), ns=(1, 1))
+        assert cache.get(second) == b"b" * 100
+        cache.put(page_entry_name(fingerprint, 2, 2.0), b"c" * 100)
+        assert cache.get(first) is None, "يجب حذف الأقدم استخداماً"
+        assert cache.total_bytes() <= 250
+
+        # أول كتابة في مخزن جديد تُحسب مرة واحدة
+        fresh = DiskCache(os.path.join(tmp, "fresh"), max_bytes=1000)
+        fresh.put("a", b"a" * 400)
+        assert fresh.total_bytes() == 400
+        fresh.put("a", b"a" * 300)
+        assert fresh.total_bytes() == 300
+    print("✓ التخزين الدائم يعمل بشكل صحيح")
+    return True
+
+def test_quantize_scale():
+    """اختبار تقريب معامل الرسم"""
+    from utils import quantize_scale
+    assert quantize_scale(2.0) == 2.0
+    assert quantize_scale(2.05) == quantize_scale(1.97) == 2.0
+    assert quantize_scale(100.0) <= 5.66
+    assert quantize_scale(0.01) == 0.5
+    print("✓ تقريب معامل الرسم صحيح")
+    return True
+
+def test_settings_store():
+    """اختبار حفظ الإعدادات المؤجل والذري"""
+    import json
+    import tempfile
+    from settings_store import SettingsStore
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "config.json")
+        store = SettingsStore(path, delay=60)
+        assert store.load()["zoom"] == 1.0, "يجب دمج القيم الافتراضية"
+        store.update(last_page=10)
+        store.update(last_page=11, zoom=1.5)
+        assert not os.path.exists(path), "التحديث لا يكتب على القرص فوراً"
+        assert store.close()
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+        assert saved["last_page"] == 11 and saved["zoom"] == 1.5
+        assert "window_width" in saved
+        assert os.listdir(tmp) == ["config.json"], "لا يجب ترك ملفات مؤقتة"
+        assert SettingsStore(path).load()["last_page"] == 11
+    print("✓ مخزن الإعدادات يعمل بشكل صحيح")
+    return True
+
+def test_recolor():
+    """اختبار أنماط تلوين الصفحات"""
+    from raster import Raster
+    from recolor import recolor, duotone_variant
+
+    # بكسل أسود وآخر أبيض مع حشو في نهاية السطر
+    raster = Raster(2, 1, 8, False, bytes([0, 0, 0, 255, 255, 255, 7, 7]))
+    assert recolor(raster, "light") is raster
+    assert list(recolor(raster, "dark").samples) == [255, 255, 255, 0, 0, 0]
+    duotone = recolor(raster, duotone_variant("#102030", "#f0e0d0"))
+    assert list(duotone.samples) == [0xf0, 0xe0, 0xd0, 0x10, 0x20, 0x30]
+    night = recolor(raster, "night").samples
+    assert night[3] == 255 and night[5] < night[4], "يجب خفض القناة الزرقاء"
+    print("✓ أنماط تلوين الصفحات صحيحة")
+    return True
+
+def test_search_index():
+    """اختبار فهرس البحث في النص"""
+    import tempfile
+    from search_index import SearchIndex
+
+    index = SearchIndex("abc")
+    index.add_page(0, ["بِسْمِ", "ٱللَّهِ", "ٱلرَّحْمَٰنِ", "ٱلرَّحِيمِ"], [(i, 0, i + 1, 1) for i in range(4)])
+    index.add_page(5, ["ٱلْحَمْدُ", "لِلَّهِ", "رَبِّ", "ٱلْعَٰلَمِينَ", "ٱلرَّحْمَٰنِ", "ٱلرَّحِيمِ"])
+    assert [h.page for h in index.search("الرحمن الرحيم")] == [0, 5]
+    assert [(h.page, h.position) for h in index.search("بسم الله")] == [(0, 0)]
+    assert index.search("الله بسم") == [], "العبارة يجب أن تطابق الترتيب"
+    assert [h.page for h in index.search("الرح")] == [0, 0, 5, 5], "آخر كلمة تطابق كبادئة"
+    assert index.hit_boxes(index.search("الله")[0]) == [(1, 0, 2, 1)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.json.gz")
+        index.save(path)
+        loaded = SearchIndex.load(path, "abc")
+        assert loaded.search("رب العالمين") == index.search("رب العالمين")
+        assert SearchIndex.load(path, "other") is None, "الفهرس مرتبط ببصمة الملف"
+    print("✓ فهرس البحث يعمل بشكل صحيح")
+    return True
+
+def test_parallel_index_build():
+    """اختبار بناء فهرس البحث على التوازي واستئنافه"""
+    import tempfile
+    from pathlib import Path
+    from unittest import mock
+    try:
+        import fitz
+    except ImportError:
+        print("⚠ PyMuPDF غير مثبتة - تم تخطي الاختبار")
+        return True
+    import index_builder
+    import search_index
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, "mushaf.pdf")
+        document = fitz.open()
+        for i in range(10):
+            document.new_page().insert_text((72, 72), f"page{i} common")
+        document.save(pdf)
+        with mock.patch.object(search_index, "get_cache_dir", return_value=Path(tmp)):
+            # محاكاة بناء سابق توقف بعد أول مجموعة
+            _, _, first = index_builder._index_range(pdf, 0, 4)
+            first.fingerprint = "fp"
+            parts = index_builder.parts_dir("fp")
+            parts.mkdir(parents=True)
+            first.save(index_builder._part_path(parts, 0, 4))
+
+            reports = []
+            index = index_builder.build_index_parallel(
+                pdf, "fp", 10, workers=2, chunk_pages=4,
+                progress=lambda done, total: reports.append(done))
+            assert reports[0] == 4, "يجب تخطي المجموعات المنجزة سابقاً"
+            assert reports[-1] == 10
+            assert [h.page for h in index.search("common")] == list(range(10))
+            assert not parts.exists()
+            assert search_index.SearchIndex.load(search_index.index_path("fp"), "fp") is not None
+
+            # جزء تالف من بناء سابق يُعاد بناؤه في التشغيل نفسه
+            search_index.index_path("fp").unlink()
+            parts.mkdir(parents=True)
+            index_builder._part_path(parts, 0, 4).write_bytes(b"not gzip")
+            index = index_builder.build_index_parallel(pdf, "fp", 10, workers=2, chunk_pages=4)
+            assert index is not None and [h.page for h in index.search("common")] == list(range(10))
+    print("✓ بناء الفهرس على التوازي يعمل بشكل صحيح")
+    return True
+
+def test_page_metadata():
+    """اختبار جداول السور والأجزاء والأحزاب"""
+    from config import SURAHS
+    from page_meta import PageMetadata
+    from utils import get_surah_by_page, get_surah_index_by_page
+
+    meta = PageMetadata(640)
+    assert meta.page(0).surah_index == -1, "صفحات المقدمة بلا سورة"
+    info = meta.page(4)
+    assert (info.surah_name, info.juz, info.hizb) == ("البقرة", 1, 1)
+    assert meta.page(24).juz == 2
+    assert meta.page(606).surah_name == "الناس" and meta.page(606).juz == 30
+    # آية الكرسي في الصفحة 42 من المصحف، والكهف في الصفحة 293
+    assert meta.ayah_page(2, 255) - 3 + 1 == 42
+    assert meta.ayah_page(18, 1) == SURAHS[17][2] - 1
+    assert meta.juz_range(30) == (584, 607)
+    # العرض المزدوج: صفحة المصحف 1 (الفاتحة) على اليمين و2 على اليسار
+    assert meta.spread(3) == meta.spread(4) == (3, 4)
+    assert meta.spread(0) == (0,) and meta.spread(639) == (639,)
+
+    assert get_surah_by_page(5, SURAHS) == "سورة البقرة"
+    assert get_surah_by_page(1, SURAHS) == ""
+    assert get_surah_index_by_page(54, SURAHS) == 2
+    print("✓ جداول بيانات الصفحات صحيحة")
+    return True
+
+def test_palette_index():
+    """اختبار فهرس لوحة الانتقال السريع"""
+    from page_meta import PageMetadata
+    from palette_index import PaletteIndex
+
+    meta = PageMetadata(640)
+    palette = PaletteIndex(meta, bookmarks=[100, 9999])
+    assert palette.search("بقره")[0].title == "سورة البقرة"
+    assert palette.search("kahaf")[0].title == "سورة الكهف", "مطابقة تقريبية للاسم اللاتيني"
+    top = palette.search("٢:٢٥٥")[0]
+    assert top.kind == "ayah" and top.page_idx == meta.ayah_page(2, 255)
+    page = palette.search("300")[0]
+    assert (page.kind, page.page_idx) == ("page", 299)
+    assert palette.search("الجزء 30")[0].page_idx == meta.juz_range(30)[0]
+    assert [e.page_idx for e in palette.entries if e.kind == "bookmark"] == [100]
+    print("✓ فهرس لوحة الانتقال يعمل")
+    return True
+
+def test_export_pages():
+    """اختبار تحليل نطاقات الصفحات وتصديرها كصور"""
+    import tempfile
+    from pathlib import Path
+    from utils import parse_page_ranges
+    assert parse_page_ranges("1-3, 2, ٥", 10) == [0, 1, 2, 4]
+    assert parse_page_ranges("8-", 10) == [7, 8, 9]
+    for bad in ("0-3", "5-2", "abc", "11", ""):
+        try:
+            parse_page_ranges(bad, 10)
+        except ValueError:
+            continue
+        raise AssertionError(f"نطاق غير صالح مقبول: {bad}")
+    try:
+        import fitz
+    except ImportError:
+        print("⚠ PyMuPDF غير مثبتة - تم تخطي اختبار التصدير")
+        return True
+    from exporter import export_pages, main as export_main, page_filename
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, "mushaf.pdf")
+        document = fitz.open()
+        for i in range(3):
+            document.new_page(width=100, height=100).insert_text((20, 50), f"p{i}")
+        document.save(pdf)
+        out = Path(tmp) / "out"
+        size = export_pages(pdf, [0, 2], out, dpi=72, theme="dark", workers=2)
+        assert sorted(p.name for p in out.iterdir()) == [page_filename(0, "png"), page_filename(2, "png")]
+        assert size == sum(p.stat().st_size for p in out.iterdir())
+        pix = fitz.Pixmap(str(out / page_filename(0, "png")))
+        assert (pix.width, pix.height) == (100, 100) and pix.pixel(0, 0) == (0, 0, 0)
+        # خطأ في أحد العمال يُبلغ عنه برقم الصفحة بدلاً من تتبع خام
+        try:
+            export_pages(pdf, [0, 1, 2], Path(tmp) / "bad", dpi=72, theme="bogus", workers=2)
+        except RuntimeError as e:
+            assert "فشل تصدير الصفحة" in str(e)
+        else:
+            raise AssertionError("يجب رفع خطأ عند فشل تصدير صفحة")
+        # ملف ليس PDF يُرفض برمز خروج بدلاً من تتبع خام
+        not_pdf = os.path.join(tmp, "notes.pdf")
+        with open(not_pdf, "w") as f:
+            f.write("ليس ملف PDF")
+        assert export_main(["--pdf", not_pdf, "-o", str(Path(tmp) / "none")]) == 1
+        assert not (Path(tmp) / "none").exists()
+    print("✓ تصدير الصفحات كصور يعمل")
+    return True
+
+def test_page_extract():
+    """اختبار استخراج نطاقات الصفحات كملف PDF متجهي"""
+    import tempfile
+    try:
+        import fitz
+    except ImportError:
+        print("⚠ PyMuPDF غير مثبتة - تم تخطي الاختبار")
+        return True
+    from page_extract import extract_pages, merge_ranges, selection_ranges
+    from page_meta import PageMetadata
+
+    meta = PageMetadata(640)
+    assert selection_ranges(meta, "juz", 30) == [meta.juz_range(30)]
+    assert selection_ranges(meta, "surah", 1) == [(3, 5)]
+    assert selection_ranges(meta, "pages", "1-3,5,6") == [(0, 3), (4, 6)]
+    assert merge_ranges([]) == []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, "mushaf.pdf")
+        document = fitz.open()
+        for i in range(10):
+            document.new_page().insert_text((72, 72), f"page{i}")
+        document.save(pdf)
+        out = os.path.join(tmp, "out.pdf")
+        assert extract_pages(pdf, [(2, 4), (7, 8)], out) == 3
+        with fitz.open(out) as result:
+            assert [page.get_text().strip() for page in result] == ["page2", "page3", "page7"]
+            # الصفحات تبقى نصاً متجهياً دون صور
+            assert not any(page.get_images() for page in result)
+    print("✓ استخراج نطاقات الصفحات يعمل")
+    return True
+
+def test_tracing():
+    """اختبار تسجيل الفترات والعدادات وتصديرها بصيغة Chrome Trace"""
+    import json
+    import tempfile
+    import tracing
+
+    tracing.reset()
+    with tracing.span("disabled"):
+        pass
+    tracing.count("disabled")
+    assert tracing.counters() == {}, "القياس معطل افتراضياً"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.json")
+        argv = tracing.configure(["main.py", f"--trace={path}", "-style", "fusion"], environ={})
+        assert argv == ["main.py", "-style", "fusion"] and tracing.is_enabled()
+
+        @tracing.traced()
+        def work():
+            with tracing.span("inner", page=3):
+                tracing.count("page_cache.hit")
+        work()
+        work()
+        tracing.finish()
+        assert not tracing.is_enabled()
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    spans = [e for e in data["traceEvents"] if e["ph"] == "X"]
+    assert [e["name"] for e in spans].count("inner") == 2
+    assert spans[0]["args"] == {"page": 3} and all(e["dur"] >= 0 for e in spans)
+    assert data["otherData"]["counters"] == {"page_cache.hit": 2}
+    tracing.reset()
+    print("✓ قياس الأداء يعمل")
+    return True
+
+def test_benchmark_helpers():
+    """اختبار توليد الملف الاصطناعي وملخص الأزمنة في مجموعة القياسات"""
+    import tempfile
+    try:
+        import fitz
+    except ImportError:
+        print("⚠ PyMuPDF غير مثبتة - تم تخطي الاختبار")
+        return True
+    from benchmark import make_synthetic_pdf, summarize
+
+    summary = summarize([5.0, 1.0, 3.0, 2.0, 4.0])
+    assert (summary["median_ms"], summary["min_ms"], summary["p95_ms"]) == (3.0, 1.0, 5.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_synthetic_pdf(os.path.join(tmp, "synthetic.pdf"), pages=30)
+        with fitz.open(path) as document:
+            assert len(document) == 30
+            assert len(document[0].get_text("words")) > 50, "الصفحات تحتوي على نص قابل للفهرسة"
+            assert document[29].get_text() != document[5].get_text()
+    print("✓ أدوات قياس الأداء تعمل")
+    return True
+
+def test_stall_watchdog():
+    """اختبار التقاط مكدس الخيط الرئيسي عند توقفه ومدرج التأخر"""
+    import time
+    from stall_watchdog import LatencyHistogram, StallWatchdog
+
+    histogram = LatencyHistogram()
+    for ms in (0.5, 0.5, 3, 40, 700):
+        histogram.add(ms)
+    assert histogram.percentile(0.4) == 1 and histogram.percentile(0.5) == 5
+    assert histogram.percentile(1.0) == 700
+    assert histogram.to_dict()["buckets_ms"]["<=5"] == 1
+
+    watchdog = StallWatchdog(threshold_ms=50, interval_ms=10, context=lambda: {"page": 42})
+    watchdog.start()
+    try:
+        for _ in range(5):
+            time.sleep(0.01)
+            watchdog.beat()
+        def blocking_handler():
+            time.sleep(0.25)
+        blocking_handler()
+        watchdog.beat()
+    finally:
+        watchdog.stop()
+    report = watchdog.report()
+    assert report["stall_count"] == 1
+    stall = report["stalls"][0]
+    assert "blocking_handler" in stall["stack"] and stall["context"] == {"page": 42}
+    assert stall["duration_ms"] >= 200
+    assert report["latency"]["max_ms"] >= 200
+    print("✓ مراقبة توقف الواجهة تعمل")
+    return True
+
+def test_thumbnail_atlas():
+    """اختبار أطلس الصور المصغرة وحفظه وقراءته"""
+    import tempfile
+    from pathlib import Path
+    from raster import Raster
+    from thumb_atlas import ThumbnailAtlas
+
+    atlas = ThumbnailAtlas(page_count=5, thumb_width=4, thumb_height=3, columns=2)
+    assert atlas.get(3) is None and atlas.missing() == 5
+    # صورة أقصر من الخلية تُكمل بالأبيض
+    atlas.put(3, Raster(4, 2, 12, False, bytes(range(24))))
+    assert 3 in atlas and atlas.missing() == 4 and atlas.dirty
+    thumb = atlas.get(3)
+    assert thumb.samples[:24] == bytes(range(24)) and thumb.samples[24:] == b"\xff" * 12
+    assert atlas.cell_origin(3) == (4, 3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "thumbs.atlas"
+        atlas.save(path)
+        assert not atlas.dirty
+        loaded = ThumbnailAtlas.load(path, 5, 4, 3)
+        assert loaded is not None and loaded.get(3).samples == thumb.samples
+        assert 2 not in loaded
+        # أبعاد مختلفة أو مستند مختلف يعني إعادة الرسم
+        assert ThumbnailAtlas.load(path, 6, 4, 3) is None
+        assert ThumbnailAtlas.load(path, 5, 8, 6) is None
+        assert ThumbnailAtlas.load(Path(tmp) / "missing.atlas", 5, 4, 3) is None
+    print("✓ أطلس الصور المصغرة يعمل")
+    return True
+
+def test_page_pack():
+    """اختبار بناء حزمة الصفحات المرسومة مسبقاً وقراءتها بـ mmap"""
+    import tempfile
+    from pathlib import Path
+    try:
+        import fitz
+    except ImportError:
+        print("⚠ PyMuPDF غير مثبتة - تم تخطي الاختبار")
+        return True
+    from page_pack import build_pack, open_pack
+    from renderer import open_document, render_raster
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, "mushaf.pdf")
+        document = fitz.open()
+        for i in range(3):
+            document.new_page(width=100, height=150).insert_text((20, 50), f"p{i}")
+        document.save(pdf)
+        path = Path(tmp) / "pages.qpack"
+        # 2.9 تُقرب إلى درجة السلم 2.8284 كما في العارض
+        build_pack(pdf, path, [2.0, 2.9], workers=2)
+
+        pack = open_pack(path, page_count=3, source_size=os.path.getsize(pdf))
+        assert pack is not None and pack.scales == [2.0, 2.8284]
+        try:
+            raster = pack.get(1, 2.0)
+            document = open_document(pdf)
+            assert raster == render_raster(document, 1, 2.0)
+            document.close()
+            assert pack.get(2, 2.8284).width == round(100 * 2.8284)
+            assert pack.get(1, 4.0) is None and pack.get(3, 2.0) is None
+        finally:
+            pack.close()
+        # حزمة لملف آخر لا تُستخدم
+        assert open_pack(path, page_count=4) is None
+        assert open_pack(path, source_size=1) is None
+        assert open_pack(pdf) is None
+    print("✓ حزمة الصفحات المرسومة مسبقاً تعمل")
+    return True
+
+def test_editions():
+    """اختبار سجل الطبعات والذاكرة المشتركة بينها"""
+    from editions import DocumentRegistry, parse_editions
+    from page_cache import CacheNamespace, PageCache
+    from page_meta import PageMetadata
+
+    # طبعتان تتقاسمان ميزانية واحدة وترتيب LRU واحداً
+    shared = PageCache(300)
+    first, second = CacheNamespace(shared, "a"), CacheNamespace(shared, "b")
+    first.put(0, "a0", 100)
+    second.put(0, "b0", 100)
+    assert first.get(0) == "a0" and second.get(0) == "b0"
+    first.put(1, "a1", 100)
+    second.put(1, "b1", 100)
+    # الطبعة الثانية تطرد أقدم صفحة ولو كانت من الطبعة الأولى
+    assert 0 not in first and 0 in second and 1 in first
+    assert shared.stats()["bytes"] <= 300
+
+    specs = parse_editions([
+        {"id": "a", "pdf": "a.pdf"},
+        {"id": "b", "title": "ب", "pdf": "b.pdf", "page_offset": 1},
+        {"id": "bad", "pdf": "c.pdf", "surah_pages": [1, 2]},
+        {"title": "بدون معرف", "pdf": "d.pdf"},
+    ])
+    assert [spec.edition_id for spec in specs] == ["a", "b"]
+    assert specs[0].title == "a" and specs[1].page_offset == 1
+
+    class FakeDocument:
+        def __init__(self, pages):
+            self.pages = pages
+        def __len__(self):
+            return self.pages
+        def close(self):
+            pass
+
+    counts = {"a.pdf": 607, "b.pdf": 605}
+    registry = DocumentRegistry(specs, shared, opener=lambda path: FakeDocument(counts[path]))
+    assert registry.edition("غير موجود").edition_id == "a" and not registry.opened()
+    a, b = registry.open(registry.edition("a")), registry.open(registry.edition("b"))
+    assert b.meta.page_count == 605 and b.page_cache.name == "b"
+    # نفس الآية تقع في صفحة مزاحة بفرق المقدمة بين الملفين
+    fatiha = a.meta.ayah_page(1, 1)
+    assert registry.translate_page(a, fatiha, b) == fatiha - 2
+    assert registry.translate_page(b, b.meta.ayah_page(2, 255), a) == a.meta.ayah_page(2, 255)
+    assert registry.translate_page(a, 0, b) == 0 and registry.translate_page(a, 606, b) == 604
+    registry.close_all()
+    assert not registry.opened()
+
+    # الصفحة إلى أول آية فيها ثم العودة إلى نفس الصفحة
+    meta = PageMetadata(607)
+    assert all(meta.ayah_page(*meta.page_ayah(page)) == page for page in range(3, 607))
+    print("✓ سجل الطبعات يعمل")
+    return True
+
+def test_page_server():
+    """اختبار خادم صور الصفحات بعميل HTTP محلي ورسام وهمي"""
+    import asyncio
+    import http.client
+    import json
+    import tempfile
+    import threading
+    import time
+    from page_server import PageServer
+    from raster import Raster, encode_png
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, "mushaf.pdf")
+        with open(pdf, "wb") as f:
+            f.write(b"%PDF-1.4 test")
+
+        lock = threading.Lock()
+        calls = []
+        active = [0, 0]
+
+        def fake_render(page_idx, scale, theme):
+            with lock:
+                calls.append((page_idx, scale, theme))
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return encode_png(Raster(2, 2, 6, False, bytes([page_idx]) * 12))
+
+        server = PageServer(pdf, render=fake_render, page_count=607, max_renders=2)
+
+        def fetch(port, path, headers=None):
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            try:
+                connection.request("GET", path, headers=headers or {})
+                response = connection.getresponse()
+                return response.status, dict(response.getheaders()), response.read()
+            finally:
+                connection.close()
+
+        async def scenario():
+            _, port = await server.start("127.0.0.1", 0)
+            loop = asyncio.get_running_loop()
+
+            def get(path, headers=None):
+                return loop.run_in_executor(None, fetch, port, path, headers)
+
+            try:
+                # ستة عملاء يطلبون الصفحة نفسها: رسم واحد فقط
+                results = await asyncio.gather(*(get("/page/10?theme=dark") for _ in range(6)))
+                assert all(status == 200 for status, _, _ in results)
+                assert len({body for _, _, body in results}) == 1
+                assert calls == [(9, 2.0, "dark")]
+                status, headers, body = results[0]
+                assert headers["Content-Type"] == "image/png" and body.startswith(b"\x89PNG")
+
+                # صفحات مختلفة متزامنة لا تتجاوز حد عمليات الرسم
+                await asyncio.gather(*(get(f"/page/{n}") for n in range(20, 28)))
+                assert len(calls) == 9 and active[1] <= 2
+
+                # الوسم يُجاب بـ 304 دون رسم، والمعامل يُقرب إلى سلم العارض
+                etag = headers["ETag"]
+                status, _, body = await get("/page/10?theme=dark", {"If-None-Match": etag})
+                assert status == 304 and body == b""
+                status, _, _ = await get("/page/10?theme=dark&scale=2.01")
+                assert status == 200 and len(calls) == 9
+
+                status, _, body = await get("/page/5/meta")
+                info = json.loads(body)
+                assert status == 200 and info["surah"]["number"] == 2 and info["mushaf_page"] == 2
+                assert info["first_ayah"] == {"surah": 2, "ayah": 1}
+                status, _, body = await get("/surahs")
+                assert status == 200 and len(json.loads(body)) == 114
+                assert (await get("/page/0"))[0] == 404 and (await get("/page/608"))[0] == 404
+                assert (await get("/page/3?theme=blue"))[0] == 400
+                assert (await get("/page/3?scale=nan"))[0] == 400
+            finally:
+                await server.stop()
+
+        asyncio.run(scenario())
+    print("✓ خادم صور الصفحات يعمل")
+    return True
+
+def test_slide_queue():
+    """اختبار طابور الشرائح المرسومة مسبقاً في وضع العرض التلقائي"""
+    from kiosk import SlideQueue
+
+    def next_slide(slide):
+        # صفحات 0-5 ثم العودة إلى الصفحة 1
+        page_idx = slide[-1] + 1
+        return (page_idx if page_idx < 6 else 1,)
+
+    queue = SlideQueue(3)
+    queue.reset(("2.0", "light"))
+    assert queue.extend((3,), next_slide) == [4, 5, 1] and len(queue) == 3
+    # الطابور محدود ولا يضيف شيئاً وهو ممتلئ
+    assert queue.extend((3,), next_slide) == []
+    assert queue.pop() is None and not queue.ready()
+    # الصور تصل بأي ترتيب، والسحب من الأمام عند اكتماله فقط
+    assert queue.put(5, "p5") and not queue.put(9, "p9")
+    assert queue.pop() is None
+    queue.put(4, "p4")
+    assert queue.pop() == ((4,), ["p4"]) and queue.pop() == ((5,), ["p5"])
+    assert queue.extend((3,), next_slide) == [2, 3]
+
+    # الصفحتان المتقابلتان تُسحبان معاً
+    spreads = SlideQueue(2)
+    assert spreads.extend((1, 2), lambda slide: (slide[-1] + 1, slide[-1] + 2)) == [3, 4, 5, 6]
+    spreads.put(4, "p4")
+    assert not spreads.ready()
+    spreads.put(3, "p3")
+    assert spreads.pop() == ((3, 4), ["p3", "p4"])
+    spreads.reset()
+    assert len(spreads) == 0 and spreads.params is None
+
+    # الشريحة التي تعذر رسمها تُتخطى ولا تُطلب من جديد
+    queue.reset(("2.0", "light"))
+    assert queue.extend((0,), next_slide) == [1, 2, 3]
+    queue.put(1, "p1")
+    assert queue.drop(3) and not queue.drop(9)
+    assert queue.extend((0,), next_slide) == [4]
+    assert queue.drop(2) and queue.pop() == ((1,), ["p1"])
+    assert queue.extend((1,), next_slide) == [5, 1]
+    queue.put(4, "p4")
+    assert queue.pop() == ((4,), ["p4"])
+    print("✓ طابور العرض التلقائي يعمل")
+    return True
+
+def test_render_failure():
+    """اختبار وصول تعذر رسم صفحة من عمال الخلفية إلى العارض"""
+    import tempfile
+    try:
+        import fitz
+    except ImportError:
+        print("⚠ PyMuPDF غير مثبتة - تم تخطي الاختبار")
+        return True
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QEventLoop, QSizeF, QTimer
+    from PyQt6.QtWidgets import QApplication, QGraphicsSimpleTextItem
+    from config import RENDER_SCALE
+    from main import PDFPageView
+    from render_worker import RenderPool
+
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "small.pdf")
+        document = fitz.open()
+        document.new_page(width=100, height=150)
+        document.save(pdf_path)
+        document.close()
+
+        pool = RenderPool(pdf_path, workers=1)
+        events = []
+        loop = QEventLoop()
+        pool.render_failed.connect(lambda key, error: (events.append(("failed", key, error)), loop.quit()))
+        pool.page_rendered.connect(lambda key, image: (events.append(("rendered", key)), loop.quit()))
+        # صفحة غير موجودة في الملف
+        bad = (5, RENDER_SCALE, "light")
+        pool.request(bad)
+        QTimer.singleShot(5000, loop.quit)
+        loop.exec()
+        assert events and events[0][:2] == ("failed", bad) and events[0][2]
+        # العامل يبقى يعمل بعد الخطأ
+        pool.request((0, RENDER_SCALE, "light"))
+        QTimer.singleShot(5000, loop.quit)
+        loop.exec()
+        assert events[-1] == ("rendered", (0, RENDER_SCALE, "light"))
+        pool.shutdown()
+
+    # الصفحة الفارغة في العرض المزدوج تحمل علامة التعذر
+    view = PDFPageView()
+    view.set_spread([(0, QSizeF(100, 150), None, RENDER_SCALE), (1, QSizeF(100, 150), None, RENDER_SCALE)])
+    view.show_spread_placeholder(1, "تعذر رسم الصفحة 2")
+    labels = [item.text() for item in view.scene.items() if isinstance(item, QGraphicsSimpleTextItem)]
+    assert sorted(labels) == ["1", "تعذر رسم الصفحة 2"]
+    print("✓ تعذر رسم الصفحات يصل إلى العارض")
+    return True
+
 def main():
     """الدالة الرئيسية للاختبارات"""
     print("🧪 تشغيل اختبارات تطبيق مصحف المدينة...")
@@ -57,6 +746,26 @@ def main():
         test_imports,
         test_surah_data,
         test_pdf_exists,
+        test_page_cache,
+        test_disk_cache,
+        test_quantize_scale,
+        test_settings_store,
+        test_recolor,
+        test_search_index,
+        test_parallel_index_build,
+        test_page_metadata,
+        test_palette_index,
+        test_export_pages,
+        test_page_extract,
+        test_tracing,
+        test_benchmark_helpers,
+        test_stall_watchdog,
+        test_thumbnail_atlas,
+        test_page_pack,
+        test_editions,
+        test_page_server,
+        test_slide_queue,
+        test_render_failure,
     ]
     
     results = []
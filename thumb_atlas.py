@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+أطلس الصور المصغرة: كل الصور المصغرة للصفحات في صورة واحدة مقسمة إلى خلايا،
+تُحفظ في ملف واحد في مجلد التخزين المؤقت وتُقرأ كاملة بعملية قراءة واحدة
+"""
+
+import struct
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from raster import Raster, decode_raster, encode_raster
+from utils import atomic_write, get_cache_dir
+
+# رأس الملف: التوقيع، الإصدار، عرض الخلية، ارتفاعها، عدد الأعمدة، عدد الصفحات
+_HEADER = struct.Struct("<4sBIIII")
+_MAGIC = b"QTAT"
+_VERSION = 1
+
+# عدد الخلايا في كل سطر من الأطلس
+ATLAS_COLUMNS = 32
+# لون خلفية الخلايا الفارغة
+_BLANK = 0xFF
+
+
+def atlas_path(fingerprint: str, thumb_width: int) -> Path:
+    """مسار ملف الأطلس لملف PDF وعرض صورة مصغرة محددين"""
+    return get_cache_dir() / "thumbs" / f"{fingerprint}-w{thumb_width}.atlas"
+
+
+class ThumbnailAtlas:
+    """
+    صور مصغرة بحجم ثابت مرصوصة في صورة RGB واحدة
+
+    الإضافة والقراءة آمنتان بين الخيوط (عامل الرسم يضيف والواجهة تقرأ)
+    """
+
+    def __init__(self, page_count: int, thumb_width: int, thumb_height: int,
+                 columns: int = ATLAS_COLUMNS):
+        self.page_count = page_count
+        self.thumb_width = thumb_width
+        self.thumb_height = thumb_height
+        self.columns = columns
+        self.rows = max(1, -(-page_count // columns))
+        self.stride = columns * thumb_width * 3
+        self.pixels = bytearray([_BLANK]) * (self.stride * self.rows * thumb_height)
+        self.present = bytearray(page_count)
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def __contains__(self, page_idx: int) -> bool:
+        return 0 <= page_idx < self.page_count and bool(self.present[page_idx])
+
+    def missing(self) -> int:
+        """عدد الصفحات التي لم تُرسم صورتها المصغرة بعد"""
+        return self.page_count - sum(self.present)
+
+    def cell_origin(self, page_idx: int) -> Tuple[int, int]:
+        """موضع خلية الصفحة (x، y) بالبكسل داخل الأطلس"""
+        row, column = divmod(page_idx, self.columns)
+        return column * self.thumb_width, row * self.thumb_height
+
+    def put(self, page_idx: int, raster: Raster):
+        """
+        نسخ صورة مصغرة إلى خليتها (تُقص أو تُكمل بالأبيض إذا اختلف حجمها قليلاً)
+
+        Args:
+            page_idx: فهرس الصفحة
+            raster: الصورة المصغرة بصيغة RGB
+        """
+        if raster.alpha:
+            raise ValueError("الأطلس لا يدعم قناة الشفافية")
+        x, y = self.cell_origin(page_idx)
+        width = min(raster.width, self.thumb_width) * 3
+        cell_row = bytes([_BLANK]) * (self.thumb_width * 3)
+        with self._lock:
+            for row in range(self.thumb_height):
+                start = (y + row) * self.stride + x * 3
+                self.pixels[start:start + self.thumb_width * 3] = cell_row
+                if row < raster.height:
+                    source = row * raster.stride
+                    self.pixels[start:start + width] = raster.samples[source:source + width]
+            self.present[page_idx] = 1
+            self.dirty = True
+
+    def get(self, page_idx: int) -> Optional[Raster]:
+        """
+        الصورة المصغرة لصفحة
+
+        Args:
+            page_idx: فهرس الصفحة
+
+        Returns:
+            الصورة أو None إذا لم تُرسم بعد
+        """
+        if page_idx not in self:
+            return None
+        x, y = self.cell_origin(page_idx)
+        row_bytes = self.thumb_width * 3
+        with self._lock:
+            samples = b"".join(
+                self.pixels[start:start + row_bytes]
+                for start in range(y * self.stride + x * 3,
+                                   (y + self.thumb_height) * self.stride, self.stride)
+            )
+        return Raster(self.thumb_width, self.thumb_height, row_bytes, False, samples)
+
+    def save(self, path):
+        """حفظ الأطلس في ملف واحد"""
+        with self._lock:
+            header = _HEADER.pack(_MAGIC, _VERSION, self.thumb_width, self.thumb_height,
+                                  self.columns, self.page_count)
+            image = Raster(self.columns * self.thumb_width, self.rows * self.thumb_height,
+                           self.stride, False, bytes(self.pixels))
+            present = bytes(self.present)
+            self.dirty = False
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, header + present + encode_raster(image), sync=False)
+
+    @classmethod
+    def load(cls, path, page_count: int, thumb_width: int,
+             thumb_height: int) -> Optional["ThumbnailAtlas"]:
+        """
+        قراءة أطلس محفوظ بعملية قراءة واحدة
+
+        Args:
+            path: مسار الملف
+            page_count: عدد صفحات المستند الحالي
+            thumb_width: عرض الصورة المصغرة المطلوب
+            thumb_height: ارتفاعها
+
+        Returns:
+            الأطلس أو None إذا لم يوجد أو اختلفت أبعاده أو كان تالفاً
+        """
+        try:
+            data = Path(path).read_bytes()
+        except OSError:
+            return None
+        if len(data) < _HEADER.size:
+            return None
+        magic, version, width, height, columns, count = _HEADER.unpack_from(data)
+        if (magic, version, width, height, count) != (_MAGIC, _VERSION, thumb_width,
+                                                       thumb_height, page_count):
+            return None
+        atlas = cls(page_count, width, height, columns)
+        offset = _HEADER.size + page_count
+        try:
+            image = decode_raster(memoryview(data)[offset:])
+        except ValueError:
+            return None
+        if image.stride != atlas.stride or len(image.samples) != len(atlas.pixels):
+            return None
+        atlas.pixels[:] = image.samples
+        atlas.present[:] = data[_HEADER.size:offset]
+        return atlas
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+قياس الأداء الاختياري: فترات زمنية وعدادات تُصدَّر بصيغة Chrome Trace
+(تُفتح في chrome://tracing أو Perfetto) مع ملف cProfile اختياري
+
+يُفعَّل بالمعامل --trace[=المسار] (و --profile لـ cProfile) أو بمتغيري البيئة
+QURAN_UNIX_TRACE و QURAN_UNIX_PROFILE، وعند تعطيله لا تكلف الفترات شيئاً تقريباً
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from utils import atomic_write, get_cache_dir
+
+TRACE_ENV = "QURAN_UNIX_TRACE"
+PROFILE_ENV = "QURAN_UNIX_PROFILE"
+# حد أقصى لعدد الأحداث المسجلة حتى لا تنمو الذاكرة في الجلسات الطويلة
+MAX_EVENTS = 500_000
+
+_enabled = False
+_trace_path = None
+_profiler = None
+_events = []
+_counters = {}
+_thread_names = {}
+_dropped = 0
+_lock = threading.Lock()
+_origin = time.perf_counter()
+_null_span = contextlib.nullcontext()
+
+
+def is_enabled() -> bool:
+    """هل القياس مفعل"""
+    return _enabled
+
+
+def default_trace_path() -> Path:
+    """مسار ملف القياس الافتراضي في مجلد التخزين المؤقت"""
+    return get_cache_dir() / "traces" / time.strftime("trace-%Y%m%d-%H%M%S.json")
+
+
+def enable(path=None, profile: bool = False):
+    """
+    تفعيل القياس وحفظ النتائج تلقائياً عند الخروج
+
+    Args:
+        path: مسار ملف القياس (الافتراضي في مجلد التخزين المؤقت)
+        profile: تشغيل cProfile على الخيط الرئيسي أيضاً
+    """
+    global _enabled, _trace_path, _profiler
+    if _enabled:
+        return
+    _trace_path = Path(path) if path else default_trace_path()
+    _enabled = True
+    if profile:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    atexit.register(finish)
+
+
+def configure(argv: List[str], environ=os.environ) -> List[str]:
+    """
+    تفعيل القياس من معاملات سطر الأوامر أو متغيرات البيئة
+
+    Args:
+        argv: معاملات سطر الأوامر
+        environ: متغيرات البيئة
+
+    Returns:
+        المعاملات بعد حذف معاملات القياس
+    """
+    trace = environ.get(TRACE_ENV) or None
+    profile = environ.get(PROFILE_ENV, "") not in ("", "0")
+    remaining = []
+    for arg in argv:
+        if arg == "--trace":
+            trace = trace or "1"
+        elif arg.startswith("--trace="):
+            trace = arg.split("=", 1)[1]
+        elif arg == "--profile":
+            profile = True
+        else:
+            remaining.append(arg)
+    if trace or profile:
+        enable(None if trace in (None, "1") else trace, profile)
+    return remaining
+
+
+def _now_us() -> float:
+    return (time.perf_counter() - _origin) * 1e6
+
+
+def _record(event: dict):
+    global _dropped
+    tid = threading.get_ident()
+    event["pid"] = os.getpid()
+    event["tid"] = tid
+    with _lock:
+        if tid not in _thread_names:
+            _thread_names[tid] = threading.current_thread().name
+        if len(_events) >= MAX_EVENTS:
+            _dropped += 1
+            return
+        _events.append(event)
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, *exc):
+        end = _now_us()
+        event = {"name": self.name, "ph": "X", "ts": self.start, "dur": end - self.start}
+        if self.args:
+            event["args"] = self.args
+        _record(event)
+        return False
+
+
+def span(name: str, **args):
+    """
+    قياس مدة كتلة من الكود
+
+        with tracing.span("get_pixmap", page=12):
+            ...
+
+    Args:
+        name: اسم الفترة
+        **args: بيانات إضافية تظهر مع الفترة
+    """
+    if not _enabled:
+        return _null_span
+    return _Span(name, args)
+
+
+def traced(name: Optional[str] = None):
+    """مُزخرف لقياس كل استدعاء لدالة"""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instant(name: str, **args):
+    """تسجيل حدث لحظي (مثل ضغطة مفتاح أو ظهور أول صفحة)"""
+    if _enabled:
+        _record({"name": name, "ph": "i", "s": "t", "ts": _now_us(), "args": args})
+
+
+def count(name: str, delta: int = 1):
+    """زيادة عداد (مثل إصابات الذاكرة وإخفاقاتها) مع تسجيل قيمته على الخط الزمني"""
+    if not _enabled:
+        return
+    with _lock:
+        value = _counters.get(name, 0) + delta
+        _counters[name] = value
+    _record({"name": name, "ph": "C", "ts": _now_us(), "args": {"value": value}})
+
+
+def counters() -> dict:
+    """القيم الحالية للعدادات"""
+    with _lock:
+        return dict(_counters)
+
+
+def export(path) -> Path:
+    """
+    حفظ الأحداث المسجلة بصيغة Chrome Trace
+
+    Args:
+        path: مسار الملف
+
+    Returns:
+        مسار الملف
+    """
+    with _lock:
+        events = list(_events)
+        names = dict(_thread_names)
+        data = {"counters": dict(_counters), "dropped_events": _dropped}
+    pid = os.getpid()
+    metadata = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                for tid, name in names.items()]
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"traceEvents": metadata + events, "displayTimeUnit": "ms", "otherData": data}
+    atomic_write(path, json.dumps(payload, ensure_ascii=False).encode("utf-8"), sync=False)
+    return path
+
+
+def finish():
+    """إيقاف القياس وحفظ ملف القياس وملف cProfile (يُستدعى تلقائياً عند الخروج)"""
+    global _enabled, _profiler
+    if not _enabled:
+        return
+    _enabled = False
+    path = export(_trace_path)
+    print(f"📊 تم حفظ ملف القياس: {path}", file=sys.stderr)
+    if _profiler is not None:
+        _profiler.disable()
+        profile_path = path.with_suffix(".prof")
+        _profiler.dump_stats(str(profile_path))
+        _profiler = None
+        print(f"📊 تم حفظ ملف cProfile: {profile_path}", file=sys.stderr)
+
+
+def reset():
+    """مسح الأحداث والعدادات وتعطيل القياس (للاختبارات)"""
+    global _enabled, _trace_path, _profiler, _dropped
+    with _lock:
+        _events.clear()
+        _counters.clear()
+        _thread_names.clear()
+        _dropped = 0
+    if _profiler is not None:
+        _profiler.disable()
+    _enabled, _trace_path, _profiler = False, None, None
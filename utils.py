@@ -3,8 +3,12 @@
 دوال مساعدة لتطبيق مصحف المدينة
 """
 
+import bisect
+import hashlib
+import math
 import os
 import sys
+import tempfile
 from pathlib import Path
 from typing import Optional, Tuple, List
 
@@ -60,6 +64,60 @@ def get_cache_dir() -> Path:
     return cache_dir
 
 
+def pdf_fingerprint(pdf_path: str, chunk_size: int = 64 * 1024) -> str:
+    """
+    بصمة سريعة لملف PDF لتمييز نسخ الملف في التخزين المؤقت
+
+    تعتمد على الحجم ووقت التعديل وتجزئة أول الملف وآخره بدلاً من قراءته كاملاً
+    
+    Args:
+        pdf_path: مسار الملف
+        chunk_size: حجم الجزء المقروء من كل طرف
+        
+    Returns:
+        البصمة كنص سداسي عشري
+    """
+    stat = os.stat(pdf_path)
+    digest = hashlib.sha1(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(pdf_path, "rb") as f:
+        digest.update(f.read(chunk_size))
+        if stat.st_size > chunk_size:
+            f.seek(max(chunk_size, stat.st_size - chunk_size))
+            digest.update(f.read(chunk_size))
+    return digest.hexdigest()[:20]
+
+
+def atomic_write(path, data: bytes, sync: bool = True):
+    """
+    كتابة ملف بشكل ذري: الكتابة في ملف مؤقت بنفس المجلد ثم إعادة تسميته
+
+    لا يتلف الملف القديم إذا توقف البرنامج أثناء الكتابة
+    
+    Args:
+        path: مسار الملف
+        data: المحتوى
+        sync: مزامنة المحتوى مع القرص قبل إعادة التسمية
+        
+    Raises:
+        OSError: عند فشل الكتابة (يُحذف الملف المؤقت)
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def format_page_number(page: int, total: int) -> str:
     """
     تنسيق رقم الصفحة للعرض
@@ -87,39 +145,91 @@ def format_zoom_percent(zoom: float) -> str:
     return f"{int(zoom * 100)}%"
 
 
+def quantize_scale(scale: float, min_scale: float = 0.5, max_scale: float = 5.66,
+                   steps_per_octave: int = 4) -> float:
+    """
+    تقريب معامل الرسم إلى أقرب درجة في سلم ثابت (قوى الرقم 2)
+
+    يضمن أن مستويات التكبير المتقاربة تشترك في نفس الصورة المخزنة
+    
+    Args:
+        scale: معامل الرسم المطلوب
+        min_scale: أدنى معامل
+        max_scale: أعلى معامل
+        steps_per_octave: عدد الدرجات بين كل معامل وضعفه
+        
+    Returns:
+        المعامل بعد التقريب
+    """
+    scale = min(max(scale, min_scale), max_scale)
+    step = round(math.log2(scale) * steps_per_octave) / steps_per_octave
+    return round(min(max(2 ** step, min_scale), max_scale), 4)
+
+
+def parse_page_ranges(spec: str, page_count: int) -> List[int]:
+    """
+    تحليل نطاقات الصفحات مثل "1-10,15,20-" إلى فهارس مرتبة
+
+    Args:
+        spec: النطاقات بأرقام صفحات تبدأ من 1 (الطرف المحذوف يعني بداية أو نهاية الملف)
+        page_count: عدد صفحات المستند
+
+    Returns:
+        فهارس الصفحات (تبدأ من 0) دون تكرار
+
+    Raises:
+        ValueError: إذا كان النطاق غير صالح أو خارج المستند
+    """
+    pages = set()
+    for part in arabic_to_english_numbers(spec).replace("،", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        try:
+            start = int(first) if first.strip() else 1
+            stop = (int(last) if last.strip() else page_count) if sep else start
+        except ValueError:
+            raise ValueError(f"نطاق صفحات غير صالح: {part}") from None
+        if not 1 <= start <= stop <= page_count:
+            raise ValueError(f"النطاق {part} خارج صفحات المستند (1-{page_count})")
+        pages.update(range(start - 1, stop))
+    if not pages:
+        raise ValueError("لم تُحدد أي صفحة")
+    return sorted(pages)
+
+
 def get_surah_by_page(page_num: int, surahs: List[Tuple]) -> str:
     """
     الحصول على اسم السورة من رقم الصفحة
     
     Args:
         page_num: رقم الصفحة
-        surahs: قائمة السور
+        surahs: قائمة السور (الرقم، الاسم، صفحة البداية)
         
     Returns:
         اسم السورة
     """
-    for num, name, page, verses in reversed(surahs):
-        if page_num >= page:
-            return f"سورة {name}"
-    return ""
+    index = bisect.bisect_right([s[2] for s in surahs], page_num) - 1
+    if index < 0:
+        return ""
+    return f"سورة {surahs[index][1]}"
 
 
 def get_surah_index_by_page(page_num: int, surahs: List[Tuple]) -> int:
     """
     الحصول على فهرس السورة من رقم الصفحة
     
+    للبحث المتكرر استخدم page_meta.PageMetadata (جداول بزمن ثابت)
+    
     Args:
         page_num: رقم الصفحة
-        surahs: قائمة السور
+        surahs: قائمة السور (الرقم، الاسم، صفحة البداية)
         
     Returns:
         فهرس السورة
     """
-    for i, (num, name, page, verses) in enumerate(surahs):
-        if page_num >= page:
-            if i == len(surahs) - 1 or page_num < surahs[i + 1][2]:
-                return i
-    return 0
+    return max(bisect.bisect_right([s[2] for s in surahs], page_num) - 1, 0)
 
 
 def arabic_to_english_numbers(text: str) -> str:
@@ -141,6 +251,20 @@ def arabic_to_english_numbers(text: str) -> str:
     return text
 
 
+# الحركات وعلامات الضبط القرآنية والتطويل تُحذف، وأشكال الألف والتاء المربوطة تُوحد
+_ARABIC_NORMALIZATION = str.maketrans(
+    {
+        **{chr(c): None for c in range(0x064B, 0x0660)},
+        **{chr(c): None for c in range(0x0610, 0x061B)},
+        **{chr(c): None for c in range(0x06D6, 0x06EE)},
+        "\u0670": None,
+        "\u0640": None,
+        "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+        "ة": "ه",
+    }
+)
+
+
 def normalize_arabic_text(text: str) -> str:
     """
     توحيد النص العربي للبحث
@@ -151,18 +275,8 @@ def normalize_arabic_text(text: str) -> str:
     Returns:
         النص الموحد
     """
-    # إزالة التشكيل
-    tashkeel = "ًٌٍَُِّْ"
-    for char in tashkeel:
-        text = text.replace(char, "")
-    
-    # توحيد أشكال الألف
-    text = text.replace("أ", "ا").replace("إ", "ا").replace("آ", "ا")
-    
-    # توحيد أشكال الهاء
-    text = text.replace("ة", "ه")
-    
-    return text.lower().strip()
+    # إزالة التشكيل وعلامات الضبط وتوحيد أشكال الألف والهاء
+    return text.translate(_ARABIC_NORMALIZATION).lower().strip()
 
 
 def is_dark_mode_preferred() -> bool: